@@ -1,95 +1,57 @@
-from flask import Flask, render_template, request, jsonify
-import pickle
+import time
+
+# Measured from the first line so /healthz can report the cold-start cost
+_startup_begin = time.perf_counter()
+
+from flask import Flask, Request, g, render_template, request, jsonify, Response, stream_with_context
 import os
-import re
+import logging
+import json
+import base64
+import tempfile
+import csv
+import io
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from werkzeug.utils import secure_filename
 
-# Import PDF and document processing libraries with better error handling
-PDF_SUPPORT = False
-PDFPLUMBER_SUPPORT = False
-DOC_SUPPORT = False
+from preprocessing.archive_reader import ArchiveLimitError, iter_zip_entries, open_zip
+from preprocessing.document_extractor import extract_text_from_file, library_status
+from preprocessing.text_cleaner import clean_resume
+from utils.logging_setup import setup_logging
+from utils.metrics import REQUEST_SECONDS, REQUESTS, file_type_of, file_type_scope, render_metrics, timed_stage
+from utils.model_manifest import categories_payload, load_manifest
+from utils.model_utils import load_model, model_stamp, model_version, predict_categories
+from utils.result_cache import ResultCache, content_key
+from utils.screening import ALLOWED_EXTENSIONS, ExtractionError, analyse_resume, analysis_response
+from utils.training_jobs import get_job, start_job
 
-# Try importing PyPDF2
-try:
-    import PyPDF2
-    PDF_SUPPORT = True
-    print("✅ PyPDF2 imported successfully")
-    print(f"   PyPDF2 version: {PyPDF2.__version__}")
-except ImportError as e:
-    print(f"❌ PyPDF2 import failed: {e}")
-    print("   Attempting to install PyPDF2...")
-    try:
-        import subprocess
-        import sys
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "PyPDF2==3.0.1"])
-        import PyPDF2
-        PDF_SUPPORT = True
-        print("✅ PyPDF2 installed and imported successfully")
-    except Exception as install_error:
-        print(f"❌ Failed to install PyPDF2: {install_error}")
-
-# Try importing pdfplumber
-try:
-    import pdfplumber
-    PDFPLUMBER_SUPPORT = True  
-    print("✅ pdfplumber imported successfully")
-    print(f"   pdfplumber version: {pdfplumber.__version__}")
-except ImportError as e:
-    print(f"❌ pdfplumber import failed: {e}")
-    print("   Attempting to install pdfplumber...")
-    try:
-        import subprocess
-        import sys
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "pdfplumber==0.9.0"])
-        import pdfplumber
-        PDFPLUMBER_SUPPORT = True
-        print("✅ pdfplumber installed and imported successfully")
-    except Exception as install_error:
-        print(f"❌ Failed to install pdfplumber: {install_error}")
-
-# Try importing python-docx
-try:
-    from docx import Document
-    DOC_SUPPORT = True
-    print("✅ python-docx imported successfully")
-except ImportError as e:
-    print(f"❌ python-docx import failed: {e}")
-    print("   Attempting to install python-docx...")
-    try:
-        import subprocess
-        import sys
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "python-docx==0.8.11"])
-        from docx import Document
-        DOC_SUPPORT = True
-        print("✅ python-docx installed and imported successfully")
-    except Exception as install_error:
-        print(f"❌ Failed to install python-docx: {install_error}")
-
-# Check PDF support status
-if PDF_SUPPORT or PDFPLUMBER_SUPPORT:
-    print("✅ PDF processing libraries available")
-    if PDF_SUPPORT:
-        print("   - PyPDF2 ready")
-    if PDFPLUMBER_SUPPORT:
-        print("   - pdfplumber ready")
-else:
-    print("⚠️  WARNING: No PDF processing support available!")
-
-# Download NLTK data if not already present
-try:
-    import nltk
-    nltk.data.find('tokenizers/punkt')
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    print("Downloading NLTK data...")
-    nltk.download('punkt')
-    nltk.download('stopwords')
+setup_logging()
+logger = logging.getLogger(__name__)
+
+class UploadRequest(Request):
+    """Keep uploads in memory, spooling only large ones to an anonymous temp file"""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return tempfile.SpooledTemporaryFile(max_size=app.config['UPLOAD_SPOOL_THRESHOLD'],
+                                             dir=app.config['UPLOAD_FOLDER'])
 
 app = Flask(__name__)
+app.request_class = UploadRequest
 
 # Production configuration
 app.config['UPLOAD_FOLDER'] = os.getenv('UPLOAD_FOLDER', 'uploads')
 app.config['MAX_CONTENT_LENGTH'] = int(os.getenv('MAX_CONTENT_LENGTH', '16777216'))  # 16MB default
+app.config['UPLOAD_SPOOL_THRESHOLD'] = int(os.getenv('UPLOAD_SPOOL_THRESHOLD', '2097152'))  # 2MB default
+app.config['RESULT_CACHE_SIZE'] = int(os.getenv('RESULT_CACHE_SIZE', '1024'))
+app.config['RESULT_CACHE_PATH'] = os.getenv('RESULT_CACHE_PATH', 'cache/results.sqlite3')
+app.config['RESULT_CACHE_DISK_ENTRIES'] = int(os.getenv('RESULT_CACHE_DISK_ENTRIES', '100000'))
+app.config['RESULT_CACHE_MAX_AGE'] = int(os.getenv('RESULT_CACHE_MAX_AGE', '604800'))  # 7 days
+app.config['MAX_BATCH_SIZE'] = int(os.getenv('MAX_BATCH_SIZE', '1000'))
+app.config['BATCH_CHUNK_SIZE'] = max(1, int(os.getenv('BATCH_CHUNK_SIZE', '64')))
+app.config['ZIP_MAX_ENTRIES'] = int(os.getenv('ZIP_MAX_ENTRIES', '500'))
+app.config['ZIP_MAX_UNCOMPRESSED_SIZE'] = int(os.getenv('ZIP_MAX_UNCOMPRESSED_SIZE', '104857600'))  # 100MB default
+app.config['ZIP_WORKERS'] = int(os.getenv('ZIP_WORKERS', '4'))
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
 
 # Security settings for production
@@ -98,172 +60,72 @@ if os.getenv('FLASK_ENV') == 'production':
     app.config['SESSION_COOKIE_HTTPONLY'] = True
     app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
 
-# Ensure upload directory exists
+# Ensure upload directory exists (holds spooled uploads above the threshold)
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
-def extract_text_from_file(file_path, file_extension):
-    """
-    Extract text from different file types
-    
-    Args:
-        file_path (str): Path to the file
-        file_extension (str): File extension (e.g., '.pdf', '.txt', '.docx')
-    
-    Returns:
-        str: Extracted text content
-    """
-    text = ""
-    
-    try:
-        if file_extension.lower() == '.pdf':
-            if not PDF_SUPPORT and not PDFPLUMBER_SUPPORT:
-                raise Exception("PDF support not available. Please install PyPDF2 or pdfplumber.")
-            
-            # Try PyPDF2 first, then pdfplumber as fallback
-            pdf_extracted = False
-            
-            if PDF_SUPPORT:
-                try:
-                    print("🔄 Attempting PDF extraction with PyPDF2...")
-                    with open(file_path, 'rb') as file:
-                        pdf_reader = PyPDF2.PdfReader(file)
-                        for page_num in range(len(pdf_reader.pages)):
-                            page = pdf_reader.pages[page_num]
-                            page_text = page.extract_text()
-                            if page_text.strip():  # Only add non-empty text
-                                text += page_text + "\n"
-                    
-                    if text.strip():  # If we got some text
-                        pdf_extracted = True
-                        print("✅ PyPDF2 extraction successful")
-                    else:
-                        print("⚠️  PyPDF2 extracted empty text, trying pdfplumber...")
-                        
-                except Exception as pypdf_error:
-                    print(f"⚠️  PyPDF2 failed: {pypdf_error}")
-            
-            # Try pdfplumber if PyPDF2 failed or wasn't available
-            if not pdf_extracted and PDFPLUMBER_SUPPORT:
-                try:
-                    print("🔄 Attempting PDF extraction with pdfplumber...")
-                    import pdfplumber
-                    with pdfplumber.open(file_path) as pdf:
-                        for page in pdf.pages:
-                            page_text = page.extract_text()
-                            if page_text:
-                                text += page_text + "\n"
-                    print("✅ pdfplumber extraction successful")
-                    pdf_extracted = True
-                except Exception as plumber_error:
-                    print(f"⚠️  pdfplumber failed: {plumber_error}")
-            
-            if not pdf_extracted:
-                raise Exception("Failed to extract text from PDF with both PyPDF2 and pdfplumber")
-                        
-        elif file_extension.lower() in ['.docx', '.doc']:
-            if not DOC_SUPPORT:
-                raise Exception("Word document support not available. Please install python-docx.")
-            
-            # Use python-docx to extract text from Word documents
-            try:
-                doc = Document(file_path)
-                for paragraph in doc.paragraphs:
-                    text += paragraph.text + "\n"
-            except Exception as e:
-                raise Exception(f"Error reading Word document: {str(e)}")
-                        
-        elif file_extension.lower() in ['.txt', '.text']:
-            # Handle plain text files
-            encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-            for encoding in encodings:
-                try:
-                    with open(file_path, 'r', encoding=encoding) as f:
-                        text = f.read()
-                    break
-                except UnicodeDecodeError:
-                    continue
-            
-        elif file_extension.lower() == '.docx':
-            # For future implementation - would need python-docx
-            raise Exception("DOCX files not yet supported. Please convert to PDF or text format.")
-            
-        else:
-            # Default: try to read as text file
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    text = f.read()
-            except UnicodeDecodeError:
-                with open(file_path, 'r', encoding='latin-1') as f:
-                    text = f.read()
-    
-    except Exception as e:
-        raise Exception(f"Error extracting text from {file_extension} file: {str(e)}")
-    
-    if not text.strip():
-        raise Exception(f"No text could be extracted from the {file_extension} file")
-    
-    return text.strip()
-
-def clean_resume(resume_text):
-    """Clean resume text by removing URLs, mentions, hashtags, punctuation, and extra whitespace."""
-    resume_text = re.sub(r'http\S+\s*', ' ', resume_text)
-    resume_text = re.sub('RT|cc', ' ', resume_text)
-    resume_text = re.sub(r'#\S+', '', resume_text)
-    resume_text = re.sub(r'@\S+', '  ', resume_text)
-    # Remove punctuation
-    punctuation = '!"#$%&\'()*+,-./:;<=>?@[\\]^_`{|}~'
-    for p in punctuation:
-        resume_text = resume_text.replace(p, ' ')
-    resume_text = re.sub(r'[^\x00-\x7f]', r' ', resume_text) 
-    resume_text = re.sub(r'\s+', ' ', resume_text)
-    return resume_text.strip()
-
-def load_model():
-    """Load the trained model, vectorizer, and label encoder"""
-    model_path = 'models/resume_classifier.pkl'
-    vectorizer_path = 'models/tfidf_vectorizer.pkl'
-    encoder_path = 'models/label_encoder.pkl'
-    
-    if not all(os.path.exists(path) for path in [model_path, vectorizer_path, encoder_path]):
-        raise FileNotFoundError("Model files not found. Please train the model first.")
-    
-    with open(model_path, 'rb') as f:
-        model = pickle.load(f)
-    
-    with open(vectorizer_path, 'rb') as f:
-        vectorizer = pickle.load(f)
-        
-    with open(encoder_path, 'rb') as f:
-        label_encoder = pickle.load(f)
-    
-    return model, vectorizer, label_encoder
-
-def predict_category(resume_text, model, vectorizer, label_encoder):
-    """Predict the category of a resume"""
-    import numpy as np
-    
-    # Transform text to TF-IDF features
-    text_features = vectorizer.transform([resume_text])
-    
-    # Make prediction
-    prediction = model.predict(text_features)[0]
-    prediction_proba = model.predict_proba(text_features)[0]
-    
-    # Get category name
-    category = label_encoder.inverse_transform([prediction])[0]
-    
-    # Get confidence (max probability)
-    confidence = np.max(prediction_proba)
-    
-    return category, confidence
-
 # Load the trained model and vectorizer on startup
+_model_load_begin = time.perf_counter()
+loaded_model_stamp = model_stamp()
+loaded_model_version = model_version(loaded_model_stamp)
 try:
     model, vectorizer, label_encoder = load_model()
-    print("Model loaded successfully!")
+    logger.info("model loaded version=%s", loaded_model_version)
 except Exception as e:
-    print(f"Error loading model: {e}")
+    logger.error("model load failed error=%s", e)
     model, vectorizer, label_encoder = None, None, None
+categories_body, categories_etag = categories_payload(load_manifest(), label_encoder)
+
+# Extracted text and predictions by upload content; an empty path keeps it in memory only
+result_cache = ResultCache(app.config['RESULT_CACHE_SIZE'], app.config['RESULT_CACHE_PATH'] or None,
+                           max_disk_entries=app.config['RESULT_CACHE_DISK_ENTRIES'],
+                           max_age=app.config['RESULT_CACHE_MAX_AGE'] or None)
+# Rows of earlier models are never hit again and age out here; they are not
+# dropped on reload, as workers still serving the previous model use them
+result_cache.prune()
+
+STARTUP_REPORT = {
+    'import_seconds': round(_model_load_begin - _startup_begin, 4),
+    'model_load_seconds': round(time.perf_counter() - _model_load_begin, 4),
+    'total_seconds': round(time.perf_counter() - _startup_begin, 4),
+}
+
+@app.before_request
+def reload_published_model():
+    """Pick up a model published by a training job, once per worker"""
+    global model, vectorizer, label_encoder, loaded_model_stamp, loaded_model_version
+    global categories_body, categories_etag
+    stamp = model_stamp()
+    if stamp == loaded_model_stamp:
+        return
+    try:
+        model, vectorizer, label_encoder = load_model()
+        loaded_model_stamp = stamp
+        loaded_model_version = model_version(stamp)
+        categories_body, categories_etag = categories_payload(load_manifest(), label_encoder)
+        logger.info("model reloaded version=%s", loaded_model_version)
+    except Exception as e:
+        logger.error("model reload failed error=%s", e)
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    g.file_type = None
+
+@app.after_request
+def record_request_metrics(response):
+    """Count every request and time it per endpoint and file type"""
+    endpoint = request.endpoint or 'unknown'
+    if endpoint in ('static', 'metrics'):
+        return response
+    elapsed = time.perf_counter() - g.request_start
+    REQUESTS.inc(endpoint=endpoint, status=response.status_code)
+    # Streaming endpoints are timed to the first byte of the response
+    REQUEST_SECONDS.observe(elapsed, endpoint=endpoint, file_type=g.file_type or 'none')
+    if endpoint == 'predict':
+        logger.info("predict status=%d file_type=%s category=%s confidence=%s total_ms=%.1f",
+                    response.status_code, g.file_type, g.get('category'),
+                    g.get('confidence'), elapsed * 1000)
+    return response
 
 @app.route('/')
 def index():
@@ -291,130 +153,368 @@ def test():
 @app.route('/predict', methods=['POST'])
 def predict():
     """API endpoint for resume classification"""
-    print(f"=== PREDICT REQUEST START ===")
-    print(f"Request method: {request.method}")
-    print(f"Content type: {request.content_type}")
-    print(f"Form keys: {list(request.form.keys())}")
-    print(f"Files keys: {list(request.files.keys())}")
+    logger.debug("predict request content_type=%s form=%s files=%s",
+                 request.content_type, list(request.form.keys()), list(request.files.keys()))
     
+    # Optional ?top_k=N returns the runner-up categories and neighbour evidence
+    top_k = request.args.get('top_k', type=int)
+    if 'top_k' in request.args and (top_k is None or top_k < 1):
+        return jsonify({'error': 'top_k must be a positive integer'}), 400
+
     try:
-        resume_text = ""
-        
         # Handle form data submission
         if request.form.get('resume_text'):
             resume_text = request.form.get('resume_text').strip()
-            print(f"Using text input, length: {len(resume_text)}")
+            logger.debug("predict text input chars=%d", len(resume_text))
+            source, file_extension = resume_text.encode('utf-8'), None
         elif 'resume_file' in request.files and request.files['resume_file'].filename:
             # File upload
             file = request.files['resume_file']
-            print(f"Processing file: {file.filename}")
             if file.filename == '':
                 return jsonify({'error': 'No file selected'}), 400
             
-            # Save file temporarily
             filename = secure_filename(file.filename)
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(filepath)
+            file_extension = os.path.splitext(filename)[1].lower()
+            logger.debug("predict file upload filename=%s", filename)
             
-            # Extract text based on file type
-            try:
-                file_extension = os.path.splitext(filename)[1].lower()
-                print(f"File extension: {file_extension}")
-                
-                # Check if file type is supported
-                allowed_extensions = ['.pdf', '.txt', '.docx', '.doc']
-                if file_extension not in allowed_extensions:
-                    os.remove(filepath)
-                    return jsonify({
-                        'error': f'Unsupported file type: {file_extension}. Supported types: PDF, TXT, DOC, DOCX'
-                    }), 400
-                
-                # Extract text from file
-                resume_text = extract_text_from_file(filepath, file_extension)
-                os.remove(filepath)  # Clean up
-                print(f"Text extracted successfully, length: {len(resume_text)}")
-                
-            except Exception as e:
-                print(f"Error extracting text from file: {e}")
-                if os.path.exists(filepath):
-                    os.remove(filepath)  # Clean up
-                return jsonify({'error': f'Error reading file: {str(e)}'}), 400
+            # Check if file type is supported
+            if file_extension not in ALLOWED_EXTENSIONS:
+                return jsonify({
+                    'error': f'Unsupported file type: {file_extension}. Supported types: PDF, TXT, DOC, DOCX'
+                }), 400
+            # Extraction reads the (possibly spooled) upload stream itself
+            source = file.stream
         else:
-            print("No resume text or file found in request")
             return jsonify({'error': 'No resume text or file provided. Please enter text or upload a file.'}), 400
-
-        if not resume_text.strip():
-            print("Resume text is empty")
-            return jsonify({'error': 'Resume text is empty'}), 400
+        g.file_type = file_type_of(file_extension)
 
         if not model or not vectorizer or not label_encoder:
-            print("Model components not loaded")
+            logger.error("predict without a loaded model")
             return jsonify({'error': 'Model not loaded. Please train the model first.'}), 500
 
-        print("Starting text cleaning...")
-        # Clean the resume text
-        cleaned_text = clean_resume(resume_text)
-        print(f"Text cleaned, length: {len(cleaned_text)}")
-        
-        if not cleaned_text.strip():
-            print("Cleaned text is empty")
-            return jsonify({'error': 'Resume text is empty after cleaning'}), 400
-        
-        print("Making prediction...")
-        # Make prediction
-        category, probability = predict_category(cleaned_text, model, vectorizer, label_encoder)
-        print(f"Prediction successful: {category} ({probability:.2%})")
-        
-        result = {
-            'category': category,
-            'confidence': f"{probability:.2%}",
-            'cleaned_text_preview': cleaned_text[:200] + "..." if len(cleaned_text) > 200 else cleaned_text
-        }
-        print(f"Returning result: {result}")
+        # Identical uploads are served from the cache, across workers; the
+        # stream is hashed in chunks and rewound for extraction
+        with file_type_scope(file_extension), timed_stage('upload_hash'):
+            key = content_key(source, loaded_model_version, file_extension or 'text', top_k or 0)
+        try:
+            analysis = result_cache.get_or_compute(key, lambda: analyse_resume(
+                source, file_extension, top_k, model, vectorizer, label_encoder))
+        except ExtractionError as e:
+            logger.warning("predict extraction failed file_type=%s error=%s", g.file_type, e)
+            return jsonify({'error': f'Error reading file: {str(e)}'}), 400
+
+        result, status = analysis_response(analysis)
+        if status != 200:
+            return jsonify(result), status
+        g.category, g.confidence = result['category'], result['confidence']
         return jsonify(result)
 
     except Exception as e:
-        print(f"Exception in predict endpoint: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("predict failed error=%s", e)
         return jsonify({'error': f'Server error: {str(e)}'}), 500
 
-@app.route('/api/categories')
-def get_categories():
-    """Get all available categories"""
+def _read_batch_items():
+    """
+    Read the items of a batch request
+
+    Accepts a JSON array (or an object with a "resumes" array), an NDJSON
+    body with one item per line, or multipart form data with repeated
+    `resume_files` / `resume_texts` fields.
+
+    Returns:
+        list: Items, each either a dict or an Exception describing why the
+        item could not be parsed
+    """
+    content_type = (request.mimetype or '').lower()
+
+    if content_type in ('application/x-ndjson', 'application/ndjson', 'application/jsonlines'):
+        items = []
+        for line in request.get_data(as_text=True).splitlines():
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError as e:
+                items.append(ValueError(f"Invalid JSON line: {e}"))
+        return items
+
+    if content_type == 'multipart/form-data':
+        items = [{'text': text} for text in request.form.getlist('resume_texts')]
+        for file in request.files.getlist('resume_files'):
+            items.append({'filename': file.filename, 'data': file.read()})
+        return items
+
+    payload = request.get_json(silent=True)
+    if isinstance(payload, dict):
+        payload = payload.get('resumes')
+    if not isinstance(payload, list):
+        raise ValueError('Expected a JSON array of resumes, an object with a "resumes" array, or NDJSON')
+    return payload
+
+def _extract_batch_item(item):
+    """
+    Extract the raw resume text of a single batch item
+
+    Args:
+        item: A plain string, {"text": ...}, or {"filename": ..., "content": <base64>}
+
+    Returns:
+        str: Raw resume text
+    """
+    if isinstance(item, Exception):
+        raise item
+    if isinstance(item, str):
+        item = {'text': item}
+    if not isinstance(item, dict):
+        raise ValueError('Each item must be a string or an object')
+
+    if item.get('text'):
+        if not isinstance(item['text'], str):
+            raise ValueError('"text" must be a string')
+        return item['text'].strip()
+
+    filename = secure_filename(item.get('filename') or '')
+    if not filename:
+        raise ValueError('Item has neither "text" nor "filename"')
+
+    file_extension = os.path.splitext(filename)[1].lower()
+    if file_extension not in ALLOWED_EXTENSIONS:
+        raise ValueError(f'Unsupported file type: {file_extension}. Supported types: PDF, TXT, DOC, DOCX')
+
+    data = item.get('data')
+    if data is None:
+        try:
+            data = base64.b64decode(item.get('content') or '', validate=True)
+        except ValueError:
+            raise ValueError('File "content" must be base64 encoded')
+
+    return extract_text_from_file(data, file_extension)
+
+@app.route('/predict/batch', methods=['POST'])
+def predict_batch():
+    """
+    API endpoint for classifying many resumes in one request
+
+    Resumes are cleaned, vectorized and classified in chunks of
+    BATCH_CHUNK_SIZE, one pass of the classifier per chunk. Results are
+    streamed back as NDJSON as each chunk finishes, one line per input item
+    in input order, with per-item errors.
+    """
+    if not model or not vectorizer or not label_encoder:
+        return jsonify({'error': 'Model not loaded. Please train the model first.'}), 500
+
+    try:
+        items = _read_batch_items()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if not items:
+        return jsonify({'error': 'No resumes provided'}), 400
+    if len(items) > app.config['MAX_BATCH_SIZE']:
+        return jsonify({'error': f"Batch too large: {len(items)} items (maximum {app.config['MAX_BATCH_SIZE']})"}), 413
+
+    # The model of this request, even if a new one is published meanwhile
+    components = (model, vectorizer, label_encoder)
+    chunk_size = app.config['BATCH_CHUNK_SIZE']
+
+    def classify_chunk(first, chunk):
+        results = []
+        cleaned_texts = []
+        cleaned_results = []
+        for index, item in enumerate(chunk, first):
+            result = {'index': index}
+            if isinstance(item, dict) and 'id' in item:
+                result['id'] = item['id']
+            results.append(result)
+
+            try:
+                cleaned_text = clean_resume(_extract_batch_item(item))
+            except Exception as e:
+                result['error'] = f'Error reading resume: {str(e)}'
+                continue
+
+            if not cleaned_text:
+                result['error'] = 'Resume text is empty after cleaning'
+                continue
+
+            cleaned_texts.append(cleaned_text)
+            cleaned_results.append(result)
+
+        try:
+            predictions = predict_categories(cleaned_texts, *components)
+        except Exception as e:
+            logger.exception("batch predict failed error=%s", e)
+            for result in cleaned_results:
+                result['error'] = f'Server error: {str(e)}'
+            return results
+
+        for result, (category, probability) in zip(cleaned_results, predictions):
+            result['category'] = category
+            result['confidence'] = f"{probability:.2%}"
+        return results
+
+    def generate():
+        # Each chunk is vectorized and classified in one pass and its lines
+        # are sent as soon as it is done
+        for first in range(0, len(items), chunk_size):
+            for result in classify_chunk(first, items[first:first + chunk_size]):
+                yield json.dumps(result) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+def _screen_zip_entry(index, info, data, components, version):
+    """
+    Classify one ZIP entry, through the same cache as /predict
+
+    Returns:
+        dict: Result row with 'index', 'entry' and either 'category' and
+        'confidence' or 'error'
+    """
+    row = {'index': index, 'entry': info.filename}
+    file_extension = os.path.splitext(info.filename)[1].lower()
     try:
-        # Read the dataset to get categories using CSV module
-        import csv
-        categories = set()
-        with open('../resume_dataset.csv', 'r', encoding='utf-8') as file:
-            csv_reader = csv.DictReader(file)
-            for row in csv_reader:
-                if 'Category' in row:
-                    categories.add(row['Category'])
-        return jsonify({'categories': list(categories)})
+        if isinstance(data, Exception):
+            raise ValueError(str(data))
+        if file_extension not in ALLOWED_EXTENSIONS:
+            raise ValueError(f'Unsupported file type: {file_extension}. Supported types: PDF, TXT, DOC, DOCX')
+        key = content_key(data, version, file_extension, 0)
+        analysis = result_cache.get_or_compute(key, lambda: analyse_resume(data, file_extension, None, *components))
+        result, status = analysis_response(analysis)
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        row['error'] = f'Error reading resume: {str(e)}'
+        return row
+
+    if status != 200:
+        row['error'] = result['error']
+    else:
+        row['category'] = result['category']
+        row['confidence'] = result['confidence']
+    return row
+
+ZIP_CSV_COLUMNS = ['index', 'entry', 'category', 'confidence', 'error']
+
+@app.route('/predict/zip', methods=['POST'])
+def predict_zip():
+    """
+    API endpoint for screening every resume in a ZIP archive
+
+    Entries are decompressed one at a time in memory and classified
+    concurrently. One result row is streamed per entry as soon as it is
+    done, as NDJSON or, with ?format=csv, as CSV.
+    """
+    if not model or not vectorizer or not label_encoder:
+        return jsonify({'error': 'Model not loaded. Please train the model first.'}), 500
+
+    output_format = request.args.get('format', 'ndjson').lower()
+    if output_format not in ('ndjson', 'csv'):
+        return jsonify({'error': 'format must be ndjson or csv'}), 400
+
+    upload = request.files.get('archive')
+    if upload is None or not upload.filename:
+        return jsonify({'error': 'No ZIP archive provided. Upload it as "archive".'}), 400
+
+    # The upload is closed with the request, before the stream finishes; the
+    # archive itself is bounded by MAX_CONTENT_LENGTH
+    archive_bytes = io.BytesIO(upload.stream.read())
+    max_total_size = app.config['ZIP_MAX_UNCOMPRESSED_SIZE']
+    try:
+        archive, entries = open_zip(archive_bytes, app.config['ZIP_MAX_ENTRIES'], max_total_size)
+    except zipfile.BadZipFile:
+        return jsonify({'error': 'Uploaded file is not a valid ZIP archive'}), 400
+    except ArchiveLimitError as e:
+        return jsonify({'error': str(e)}), 413
+
+    # The model of this request, even if a new one is published meanwhile
+    components = (model, vectorizer, label_encoder)
+    version = loaded_model_version
+    workers = app.config['ZIP_WORKERS']
+
+    def rows():
+        with archive, ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = set()
+            try:
+                for index, (info, data) in enumerate(iter_zip_entries(archive, entries, max_total_size)):
+                    pending.add(executor.submit(_screen_zip_entry, index, info, data, components, version))
+                    # Bound the decompressed entries held in memory
+                    if len(pending) >= workers * 2:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield future.result()
+            except ArchiveLimitError as e:
+                yield {'index': None, 'entry': None, 'error': str(e)}
+            for future in as_completed(pending):
+                yield future.result()
+
+    def generate():
+        if output_format == 'csv':
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=ZIP_CSV_COLUMNS)
+            writer.writeheader()
+            for row in rows():
+                writer.writerow(row)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            yield buffer.getvalue()
+        else:
+            for row in rows():
+                yield json.dumps(row) + '\n'
+
+    mimetype = 'text/csv' if output_format == 'csv' else 'application/x-ndjson'
+    return Response(stream_with_context(generate()), mimetype=mimetype)
+
+@app.route('/api/categories')
+def get_categories():
+    """Get all available categories, from the manifest of the loaded model"""
+    response = Response(categories_body, mimetype='application/json')
+    response.set_etag(categories_etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
 
 @app.route('/train', methods=['POST'])
 def train_model():
-    """API endpoint to retrain the model"""
+    """Start retraining the model in the background"""
     try:
-        import subprocess
-        result = subprocess.run(['python', 'models/train_model.py'], 
-                              capture_output=True, text=True, cwd='.')
-        if result.returncode == 0:
-            # Reload the model
-            global model, vectorizer, label_encoder
-            model, vectorizer, label_encoder = load_model()
-            return jsonify({
-                'message': 'Model trained successfully!',
-                'output': result.stdout
-            })
-        else:
-            return jsonify({'error': f'Training failed: {result.stderr}'}), 500
+        job, created = start_job()
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+    body = dict(job, status_url=f"/train/{job['id']}")
+    if not created:
+        body['error'] = 'A training job is already running'
+        return jsonify(body), 409
+    return jsonify(body), 202
+
+@app.route('/train/<job_id>')
+def training_status(job_id):
+    """Status, stage timings and metrics of a training job"""
+    job = get_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Training job not found'}), 404
+    return jsonify(job)
+
+@app.route('/healthz')
+def healthz():
+    """Liveness check with the cold-start report of this worker"""
+    return jsonify({
+        'status': 'ok',
+        'model_loaded': model is not None,
+        'startup': STARTUP_REPORT,
+        'model_version': loaded_model_version,
+        'result_cache': result_cache.stats(),
+        'document_libraries': library_status(),
+    })
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus metrics of this worker: stage latencies, requests and cache counters"""
+    cache_lines = ['# HELP resume_result_cache_events_total Result cache lookups by outcome',
+                   '# TYPE resume_result_cache_events_total counter']
+    stats = result_cache.stats()
+    for outcome in ('memory_hits', 'disk_hits', 'misses', 'coalesced', 'errors'):
+        cache_lines.append(f'resume_result_cache_events_total{{outcome="{outcome}"}} {stats[outcome]}')
+    return Response(render_metrics(cache_lines), mimetype='text/plain; version=0.0.4')
+
 @app.route('/about')
 def about():
     """About page with project information"""
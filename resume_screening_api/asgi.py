@@ -0,0 +1,256 @@
+"""
+ASGI entry point
+
+Serves the same /predict, /api/categories and /healthz contract as the Flask
+app, but reads uploads asynchronously and runs extraction and classification
+in a bounded process pool, so a slow PDF never stops this process from
+accepting other requests. Results go through the same result cache, so a
+resume analysed by either server is a hit for both.
+
+    uvicorn asgi:app --host 0.0.0.0 --port $PORT
+
+Requires starlette, uvicorn and python-multipart.
+"""
+import asyncio
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+
+_startup_begin = time.perf_counter()
+
+# Add the current directory to Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+from werkzeug.utils import secure_filename
+
+from preprocessing.document_extractor import library_status
+from utils.logging_setup import setup_logging
+from utils.metrics import REQUEST_SECONDS, REQUESTS, file_type_of, render_metrics
+from utils.model_manifest import categories_payload, load_manifest
+from utils.model_utils import load_label_encoder, load_model, model_stamp, model_version
+from utils.result_cache import ResultCache, content_key
+from utils.screening import ALLOWED_EXTENSIONS, ExtractionError, analyse_resume, analysis_response
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+PROCESS_WORKERS = int(os.getenv('ASGI_PROCESS_WORKERS', str(os.cpu_count() or 1)))
+# Requests admitted to the pool at once; the rest wait without holding a worker
+MAX_PENDING = int(os.getenv('ASGI_MAX_PENDING', str(PROCESS_WORKERS * 2)))
+MAX_CONTENT_LENGTH = int(os.getenv('MAX_CONTENT_LENGTH', '16777216'))
+RESULT_CACHE_SIZE = int(os.getenv('RESULT_CACHE_SIZE', '1024'))
+RESULT_CACHE_PATH = os.getenv('RESULT_CACHE_PATH', 'cache/results.sqlite3')
+RESULT_CACHE_DISK_ENTRIES = int(os.getenv('RESULT_CACHE_DISK_ENTRIES', '100000'))
+RESULT_CACHE_MAX_AGE = int(os.getenv('RESULT_CACHE_MAX_AGE', '604800'))  # 7 days
+
+# Model of each pool process, reloaded when a new one is published
+_worker_model = {'stamp': None, 'components': None}
+
+def _worker_components():
+    stamp = model_stamp()
+    if stamp != _worker_model['stamp']:
+        _worker_model['components'] = load_model()
+        _worker_model['stamp'] = stamp
+    return _worker_model['components']
+
+def _analyse_in_worker(source, file_extension, top_k):
+    """Runs in a pool process: extract, clean and classify one resume"""
+    model, vectorizer, label_encoder = _worker_components()
+    return analyse_resume(source, file_extension, top_k, model, vectorizer, label_encoder)
+
+class ServingState:
+    """Process pool, result cache and category response of this server process"""
+
+    def __init__(self):
+        self.pool = None
+        self.slots = None
+        self.result_cache = None
+        self.stamp = None
+        self.version = None
+        self.label_encoder = None
+        self.categories = (b'{"categories": []}', '')
+        self.startup = {}
+
+    def refresh(self):
+        # Categories come from the published model, like in the Flask app.
+        # This process never scores, so only the label encoder is loaded
+        stamp = model_stamp()
+        if stamp == self.stamp:
+            return
+        try:
+            label_encoder = load_label_encoder()
+        except Exception as e:
+            logger.error("model load failed error=%s", e)
+            label_encoder = None
+        self.label_encoder = label_encoder
+        self.categories = categories_payload(load_manifest(), label_encoder)
+        self.version = model_version(stamp)
+        self.stamp = stamp
+
+state = ServingState()
+
+def _cached_analysis(source, file_extension, top_k):
+    """
+    Runs in a thread: serve the resume from the result cache, or analyse it
+    in the pool and cache the result
+
+    Keys are built like the Flask app's, so both servers share entries.
+    """
+    state.refresh()
+    key = content_key(source, state.version, file_extension or 'text', top_k or 0)
+    return state.result_cache.get_or_compute(key, lambda: state.pool.submit(
+        _analyse_in_worker, source, file_extension, top_k).result())
+
+@asynccontextmanager
+async def lifespan(app):
+    model_load_begin = time.perf_counter()
+    await asyncio.to_thread(state.refresh)
+    # An empty path keeps the cache in memory only
+    state.result_cache = ResultCache(RESULT_CACHE_SIZE, RESULT_CACHE_PATH or None,
+                                     max_disk_entries=RESULT_CACHE_DISK_ENTRIES,
+                                     max_age=RESULT_CACHE_MAX_AGE or None)
+    await asyncio.to_thread(state.result_cache.prune)
+    state.pool = ProcessPoolExecutor(max_workers=PROCESS_WORKERS)
+    # Load the model in every pool process before the first request
+    await asyncio.gather(*[asyncio.wrap_future(state.pool.submit(_worker_components))
+                           for _ in range(PROCESS_WORKERS)], return_exceptions=True)
+    state.slots = asyncio.Semaphore(MAX_PENDING)
+    state.startup = {
+        'import_seconds': round(model_load_begin - _startup_begin, 4),
+        'model_load_seconds': round(time.perf_counter() - model_load_begin, 4),
+        'total_seconds': round(time.perf_counter() - _startup_begin, 4),
+        'process_workers': PROCESS_WORKERS,
+    }
+    yield
+    state.pool.shutdown(cancel_futures=True)
+
+def _error(message, status):
+    return JSONResponse({'error': message}, status_code=status)
+
+class _BodyTooLarge(Exception):
+    pass
+
+def _limited_receive(receive, limit):
+    """
+    Wrap an ASGI receive callable so a body longer than limit is refused
+
+    Counts the bytes as they arrive, so chunked requests and requests that
+    understate their Content-Length are stopped too.
+    """
+    received = 0
+
+    async def limited():
+        nonlocal received
+        message = await receive()
+        if message['type'] == 'http.request':
+            received += len(message.get('body', b''))
+            if received > limit:
+                raise _BodyTooLarge()
+        return message
+    return limited
+
+async def predict(request):
+    """API endpoint for resume classification, timed per file type"""
+    start = time.perf_counter()
+    file_type = {'value': 'none'}
+    response = await _predict(request, file_type)
+    elapsed = time.perf_counter() - start
+    REQUESTS.inc(endpoint='predict', status=response.status_code)
+    REQUEST_SECONDS.observe(elapsed, endpoint='predict', file_type=file_type['value'])
+    logger.info("predict status=%d file_type=%s total_ms=%.1f",
+                response.status_code, file_type['value'], elapsed * 1000)
+    return response
+
+async def _predict(request, file_type):
+    top_k = request.query_params.get('top_k')
+    if top_k is not None:
+        top_k = int(top_k) if top_k.isdigit() else 0
+        if top_k < 1:
+            return _error('top_k must be a positive integer', 400)
+
+    content_length = request.headers.get('content-length')
+    if content_length is not None and not content_length.strip().isdigit():
+        return _error('Invalid Content-Length header', 400)
+    if int(content_length or 0) > MAX_CONTENT_LENGTH:
+        return _error('File too large', 413)
+
+    request = Request(request.scope, _limited_receive(request.receive, MAX_CONTENT_LENGTH))
+    try:
+        form = await request.form()
+    except _BodyTooLarge:
+        return _error('File too large', 413)
+    try:
+        resume_text = form.get('resume_text')
+        upload = form.get('resume_file')
+        if isinstance(resume_text, str) and resume_text:
+            source, file_extension = resume_text.strip().encode('utf-8'), None
+            file_type['value'] = file_type_of(None)
+        elif upload is not None and not isinstance(upload, str) and upload.filename:
+            filename = secure_filename(upload.filename)
+            file_extension = os.path.splitext(filename)[1].lower()
+            if file_extension not in ALLOWED_EXTENSIONS:
+                return _error(f'Unsupported file type: {file_extension}. Supported types: PDF, TXT, DOC, DOCX', 400)
+            source = await upload.read()
+            file_type['value'] = file_type_of(file_extension)
+        else:
+            return _error('No resume text or file provided. Please enter text or upload a file.', 400)
+    finally:
+        await form.close()
+
+    if state.label_encoder is None:
+        return _error('Model not loaded. Please train the model first.', 500)
+
+    try:
+        async with state.slots:
+            analysis = await asyncio.to_thread(_cached_analysis, source, file_extension, top_k)
+    except ExtractionError as e:
+        return _error(f'Error reading file: {str(e)}', 400)
+    except Exception as e:
+        logger.exception("predict failed error=%s", e)
+        return _error(f'Server error: {str(e)}', 500)
+
+    result, status = analysis_response(analysis)
+    return JSONResponse(result, status_code=status)
+
+async def get_categories(request):
+    """Get all available categories, from the manifest of the loaded model"""
+    # File reads stay off the event loop, which is serving uploads
+    await asyncio.to_thread(state.refresh)
+    body, etag = state.categories
+    headers = {'ETag': f'"{etag}"', 'Cache-Control': 'no-cache'}
+    if request.headers.get('if-none-match') == headers['ETag']:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type='application/json', headers=headers)
+
+async def healthz(request):
+    """Liveness check with the cold-start report of this process"""
+    return JSONResponse({
+        'status': 'ok',
+        'model_loaded': state.label_encoder is not None,
+        'startup': state.startup,
+        'model_version': state.version,
+        'result_cache': await asyncio.to_thread(state.result_cache.stats),
+        'document_libraries': library_status(),
+    })
+
+async def metrics(request):
+    """Prometheus metrics of this process; stage timings stay in the pool processes"""
+    return Response(render_metrics(), media_type='text/plain; version=0.0.4')
+
+app = Starlette(
+    routes=[
+        Route('/predict', predict, methods=['POST']),
+        Route('/api/categories', get_categories),
+        Route('/healthz', healthz),
+        Route('/metrics', metrics),
+    ],
+    lifespan=lifespan,
+)
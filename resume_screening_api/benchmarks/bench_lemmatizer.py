@@ -0,0 +1,75 @@
+"""
+Golden-output check and timings for the lemmatisation stage of
+retrain_with_fullstack.py
+
+Compares preprocessing.lemmatizer against the per-resume lemmatiser it
+replaced, which rebuilt the stopword set and WordNetLemmatizer for every
+resume and looked up every token, then times the old version, the memoised
+version in one process and the memoised version over a process pool on the
+whole dataset. Needs NLTK's stopwords and wordnet data.
+
+Run from the resume_screening_api directory:
+    python benchmarks/bench_lemmatizer.py [--workers 4]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from preprocessing import lemmatizer
+from preprocessing.text_cleaner import clean_resume
+from utils.dataset import load_dataset
+
+def reference_lemmatize_resume(resume_text):
+    """The original retrain_with_fullstack.py lemmatiser, kept verbatim as the golden reference"""
+    from nltk.corpus import stopwords
+    from nltk.stem import WordNetLemmatizer
+
+    resume_text = clean_resume(resume_text).lower()
+
+    # Remove stopwords and lemmatize
+    stop_words = set(stopwords.words('english'))
+    lemmatizer = WordNetLemmatizer()
+
+    words = resume_text.split()
+    words = [lemmatizer.lemmatize(word) for word in words if word not in stop_words]
+
+    return ' '.join(words)
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Check and time the memoised, multi-process lemmatiser")
+    parser.add_argument('--dataset', default=os.path.join('..', 'resume_dataset.csv'), help="CSV with a Resume column")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Pool processes")
+    args = parser.parse_args()
+
+    resumes = load_dataset(args.dataset).resumes
+    tokens = sum(len(clean_resume(resume).split()) for resume in resumes)
+    print("🔤 LEMMATISATION BENCHMARK")
+    print(f"   {len(resumes)} resumes, {tokens} tokens")
+
+    expected, reference_time = timed(lambda: [reference_lemmatize_resume(resume) for resume in resumes])
+
+    lemmatizer.lemma.cache_clear()
+    serial, serial_time = timed(lemmatizer.lemmatize_corpus, resumes, workers=1)
+    memo = lemmatizer.lemma.cache_info()
+
+    lemmatizer.lemma.cache_clear()
+    pooled, pooled_time = timed(lemmatizer.lemmatize_corpus, resumes, workers=args.workers)
+
+    mismatches = sum(a != b for a, b in zip(expected, serial)) + sum(a != b for a, b in zip(expected, pooled))
+    print(f"   Outputs identical: {'yes' if mismatches == 0 else f'no, {mismatches} mismatches'}")
+    print(f"   Distinct tokens looked up: {memo.misses} ({memo.hits} memo hits)")
+    print(f"\n   per-resume setup, no memo:  {reference_time:.2f}s")
+    print(f"   memoised, 1 process:        {serial_time:.2f}s ({reference_time / serial_time:.1f}x faster)")
+    print(f"   memoised, {args.workers} processes:  {pooled_time:.2f}s ({reference_time / pooled_time:.1f}x faster)")
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
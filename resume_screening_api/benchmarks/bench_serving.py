@@ -0,0 +1,156 @@
+"""
+Throughput comparison of the sync WSGI deployment and the ASGI entry point
+
+Starts `gunicorn wsgi:app` with sync workers and `uvicorn asgi:app` with a
+process pool of the same size, drives both with the same mixed PDF/TXT
+upload load from concurrent clients, and reports throughput and latency.
+
+Run from the resume_screening_api directory (needs a trained model, plus
+gunicorn, uvicorn, starlette, python-multipart and requests):
+    python benchmarks/bench_serving.py [--workers 2] [--clients 8] [--duration 20] [--pdf-share 0.3]
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixtures import WORDS, make_pdf
+
+def wait_until_up(url, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(url, timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not start")
+
+def make_payloads(n, pdf_pages, seed=0):
+    """Distinct PDF and TXT uploads, so no cache can answer from memory"""
+    rng = random.Random(seed)
+    pdfs = [make_pdf(pdf_pages, seed=seed + i) for i in range(n)]
+    texts = [' '.join(rng.choices(WORDS, k=600)).encode('utf-8') for _ in range(n)]
+    return pdfs, texts
+
+def run_load(base_url, pdfs, texts, clients, duration, pdf_share):
+    """
+    Post uploads from concurrent clients for duration seconds
+
+    Returns:
+        dict: {'pdf': [latencies], 'txt': [latencies], 'errors': int}
+    """
+    results = {'pdf': [], 'txt': [], 'errors': 0}
+    lock = threading.Lock()
+    stop_at = time.time() + duration
+
+    def client(client_id):
+        rng = random.Random(client_id)
+        session = requests.Session()
+        i = client_id
+        while time.time() < stop_at:
+            i += clients
+            kind = 'pdf' if rng.random() < pdf_share else 'txt'
+            data = pdfs[i % len(pdfs)] if kind == 'pdf' else texts[i % len(texts)]
+            start = time.perf_counter()
+            try:
+                response = session.post(f"{base_url}/predict",
+                                        files={'resume_file': (f'cv.{kind}', data)}, timeout=120)
+                ok = response.status_code == 200
+            except requests.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - start
+            with lock:
+                if ok:
+                    results[kind].append(elapsed)
+                else:
+                    results['errors'] += 1
+
+    threads = [threading.Thread(target=client, args=(c,)) for c in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def percentile(values, q):
+    if not values:
+        return float('nan')
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+def report(name, results, duration):
+    total = len(results['pdf']) + len(results['txt'])
+    print(f"\n{name}")
+    print(f"   throughput: {total / duration:.1f} req/s ({total} ok, {results['errors']} errors)")
+    for kind in ('txt', 'pdf'):
+        latencies = results[kind]
+        print(f"   {kind}: n={len(latencies):<5} p50={percentile(latencies, 0.5)*1000:7.1f}ms "
+              f"p95={percentile(latencies, 0.95)*1000:7.1f}ms")
+    return total / duration
+
+def serve(command, port, env):
+    process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_up(f"http://127.0.0.1:{port}/healthz")
+    except RuntimeError:
+        process.kill()
+        raise
+    return process
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sync WSGI and ASGI serving under mixed load")
+    parser.add_argument('--workers', type=int, default=2, help="gunicorn workers / ASGI pool processes")
+    parser.add_argument('--clients', type=int, default=8, help="Concurrent clients")
+    parser.add_argument('--duration', type=float, default=20, help="Seconds of load per server")
+    parser.add_argument('--pdf-share', type=float, default=0.3, help="Fraction of requests that are PDFs")
+    parser.add_argument('--pdf-pages', type=int, default=10, help="Pages per PDF")
+    parser.add_argument('--port', type=int, default=8765, help="First port to use")
+    args = parser.parse_args()
+
+    print("⚖️  SYNC WSGI vs ASGI SERVING BENCHMARK")
+    print("="*50)
+    print(f"   CPUs: {os.cpu_count()}, workers: {args.workers}, clients: {args.clients}, "
+          f"PDF share: {args.pdf_share:.0%} ({args.pdf_pages} pages), {args.duration:.0f}s per server")
+
+    pdfs, texts = make_payloads(50, args.pdf_pages)
+    env = dict(os.environ, RESULT_CACHE_SIZE='0', RESULT_CACHE_PATH='', PDF_WORKERS='1')
+
+    servers = {
+        'sync WSGI (gunicorn, sync workers)': [
+            sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{args.port}',
+            '--workers', str(args.workers), '--timeout', '120', 'wsgi:app'],
+        'ASGI (uvicorn + process pool)': [
+            sys.executable, '-m', 'uvicorn', 'asgi:app', '--host', '127.0.0.1',
+            '--port', str(args.port + 1), '--log-level', 'warning'],
+    }
+    env['ASGI_PROCESS_WORKERS'] = str(args.workers)
+
+    throughput = {}
+    for port_offset, (name, command) in enumerate(servers.items()):
+        port = args.port + port_offset
+        process = serve(command, port, env)
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            run_load(base_url, pdfs, texts, args.clients, 2, args.pdf_share)  # warm up
+            results = run_load(base_url, pdfs, texts, args.clients, args.duration, args.pdf_share)
+            throughput[name] = report(name, results, args.duration)
+        finally:
+            process.terminate()
+            process.wait()
+
+    sync, asgi = throughput.values()
+    print(f"\n📈 ASGI / sync throughput: {asgi / sync:.2f}x")
+    if os.cpu_count() == 1:
+        print("⚠️  Only one CPU: both deployments share it, so throughput is CPU-bound either way")
+
+if __name__ == "__main__":
+    main()
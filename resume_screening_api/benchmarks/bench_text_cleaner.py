@@ -0,0 +1,80 @@
+"""
+Golden-output check and micro-benchmark for the canonical resume cleaner
+
+Compares preprocessing.text_cleaner.clean_resume byte for byte against the
+multi-pass cleaner that used to live in app.py, on the whole dataset and on
+randomly generated texts full of URLs, hashtags, mentions and markers, then
+times both.
+
+Run from the resume_screening_api directory:
+    python benchmarks/bench_text_cleaner.py
+"""
+import csv
+import os
+import random
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from preprocessing.text_cleaner import clean_resume, clean_resume_chunked
+
+def reference_clean_resume(resume_text):
+    """The original app.py cleaner, kept verbatim as the golden reference"""
+    resume_text = re.sub(r'http\S+\s*', ' ', resume_text)
+    resume_text = re.sub('RT|cc', ' ', resume_text)
+    resume_text = re.sub(r'#\S+', '', resume_text)
+    resume_text = re.sub(r'@\S+', '  ', resume_text)
+    # Remove punctuation
+    punctuation = '!"#$%&\'()*+,-./:;<=>?@[\\]^_`{|}~'
+    for p in punctuation:
+        resume_text = resume_text.replace(p, ' ')
+    resume_text = re.sub(r'[^\x00-\x7f]', r' ', resume_text)
+    resume_text = re.sub(r'\s+', ' ', resume_text)
+    return resume_text.strip()
+
+# Characters chosen to hit every interaction between the removal steps
+FUZZ_ALPHABET = ['h', 't', 'p', 's', ':', '/', '#', '@', 'R', 'T', 'c', 'C', 'a', 'x',
+                 ' ', '\t', '\n', '\x1c', '\xa0', 'é', '—', '.', '-', '_', 'http', 'RT', 'cc']
+
+def fuzz_texts(count, seed=42):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield ''.join(rng.choice(FUZZ_ALPHABET) for _ in range(rng.randint(0, 40)))
+
+def load_resumes():
+    with open('../resume_dataset.csv', 'r', encoding='utf-8') as file:
+        return [row['Resume'] for row in csv.DictReader(file)]
+
+def check_golden_outputs(resumes):
+    print("🔍 GOLDEN OUTPUT CHECK")
+    mismatches = 0
+    cases = list(resumes) + list(fuzz_texts(200000))
+    for text in cases:
+        if clean_resume(text) != reference_clean_resume(text):
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"   ❌ Mismatch on {text!r}")
+    print(f"   Compared {len(cases)} texts: {mismatches} mismatches")
+
+    big_text = ' '.join(resumes)
+    chunked_ok = clean_resume_chunked(big_text, chunk_size=4096) == reference_clean_resume(big_text)
+    print(f"   Chunked mode on {len(big_text):,} chars: {'identical' if chunked_ok else 'DIFFERENT'}")
+    return mismatches == 0 and chunked_ok
+
+def benchmark(resumes, repeat=5):
+    print("\n⚡ MICRO-BENCHMARK")
+    big_text = ' '.join(resumes) * 4
+    for label, texts in [("Dataset, one resume at a time", resumes), ("One large text", [big_text])]:
+        chars = sum(len(text) for text in texts)
+        old = min(timeit.repeat(lambda: [reference_clean_resume(t) for t in texts], number=1, repeat=repeat))
+        new = min(timeit.repeat(lambda: [clean_resume(t) for t in texts], number=1, repeat=repeat))
+        print(f"   {label} ({len(texts)} texts, {chars:,} chars)")
+        print(f"      original: {old*1000:8.1f} ms   canonical: {new*1000:8.1f} ms   speedup: {old/new:.1f}x")
+
+if __name__ == "__main__":
+    resumes = load_resumes()
+    ok = check_golden_outputs(resumes)
+    benchmark(resumes)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,118 @@
+"""
+Synthetic documents for the benchmarks
+
+Builds multi-page text PDFs without any PDF-writing dependency, so the
+benchmarks can run anywhere PyPDF2 or pdfplumber can, plus DOCX and plain
+text resumes of any size.
+"""
+import random
+
+WORDS = ['python', 'java', 'developer', 'machine', 'learning', 'spring', 'react', 'sql',
+         'testing', 'selenium', 'network', 'security', 'hadoop', 'spark', 'docker', 'aws',
+         'project', 'management', 'team', 'experience', 'years', 'skills', 'design',
+         'database', 'analysis', 'cloud', 'agile', 'scrum', 'linux', 'devops']
+
+def _page_stream(lines):
+    # Every line positioned on its own and drawn word by word, like the
+    # layout-heavy exports of resume builders
+    ops = ['BT', '/F1 9 Tf']
+    for line, words in enumerate(lines):
+        ops.append(f'1 0 0 1 40 {780 - line * 11} Tm')
+        for word in words:
+            ops.append(f'({word} ) Tj')
+    ops.append('ET')
+    return '\n'.join(ops).encode('latin-1')
+
+def _build_pdf(pages):
+    # pages: for every page, its lines as lists of words
+    n_pages = len(pages)
+    font_id = 3
+    page_ids = [4 + 2 * i for i in range(n_pages)]
+
+    objects = {
+        1: b'<< /Type /Catalog /Pages 2 0 R >>',
+        2: f"<< /Type /Pages /Kids [{' '.join(f'{p} 0 R' for p in page_ids)}] /Count {n_pages} >>".encode('ascii'),
+        font_id: b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    }
+    for page_id, lines in zip(page_ids, pages):
+        content = _page_stream(lines)
+        objects[page_id] = (f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                            f'/Resources << /Font << /F1 {font_id} 0 R >> >> '
+                            f'/Contents {page_id + 1} 0 R >>').encode('ascii')
+        objects[page_id + 1] = (f'<< /Length {len(content)} >>\nstream\n'.encode('ascii')
+                                + content + b'\nendstream')
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = {}
+    for object_id in sorted(objects):
+        offsets[object_id] = len(out)
+        out += f'{object_id} 0 obj\n'.encode('ascii') + objects[object_id] + b'\nendobj\n'
+
+    xref_offset = len(out)
+    size = max(objects) + 1
+    out += f'xref\n0 {size}\n0000000000 65535 f \n'.encode('ascii')
+    for object_id in range(1, size):
+        out += f'{offsets[object_id]:010d} 00000 n \n'.encode('ascii')
+    out += f'trailer\n<< /Size {size} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n'.encode('ascii')
+    return bytes(out)
+
+def make_pdf(n_pages, lines_per_page=60, words_per_line=12, seed=0):
+    """
+    Build a text PDF with n_pages pages of random resume vocabulary
+
+    Args:
+        n_pages (int): Number of pages
+        lines_per_page (int): Text lines on every page
+        words_per_line (int): Separately drawn words on every line
+        seed (int): Seed for the word choice
+
+    Returns:
+        bytes: The PDF file
+    """
+    rng = random.Random(seed)
+    return _build_pdf([[rng.choices(WORDS, k=words_per_line) for _ in range(lines_per_page)]
+                       for _ in range(n_pages)])
+
+def pdf_from_text(text, lines_per_page=60, words_per_line=12):
+    """
+    Build a text PDF holding the given text, as well as Helvetica can draw it
+
+    Returns:
+        bytes: The PDF file
+    """
+    # Characters outside Latin-1 and PDF string delimiters are dropped
+    words = [''.join(c for c in word if c not in '()\\' and ord(c) < 256) for word in text.split()]
+    words = [word for word in words if word] or ['resume']
+    lines = [words[i:i + words_per_line] for i in range(0, len(words), words_per_line)]
+    return _build_pdf([lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)])
+
+def make_text(n_words, seed=0):
+    """Plain-text resume of n_words random resume words, 12 per line"""
+    rng = random.Random(seed)
+    words = rng.choices(WORDS, k=n_words)
+    return '\n'.join(' '.join(words[i:i + 12]) for i in range(0, n_words, 12))
+
+def make_docx(n_paragraphs, words_per_paragraph=40, seed=0):
+    """
+    Build a DOCX with n_paragraphs paragraphs of random resume vocabulary
+
+    Needs python-docx, which is imported only when a DOCX is built.
+
+    Returns:
+        bytes: The DOCX file
+    """
+    rng = random.Random(seed)
+    return docx_from_text('\n'.join(' '.join(rng.choices(WORDS, k=words_per_paragraph))
+                                     for _ in range(n_paragraphs)))
+
+def docx_from_text(text):
+    """DOCX with one paragraph per line of text (needs python-docx)"""
+    import io
+    import docx
+
+    document = docx.Document()
+    for line in text.splitlines():
+        document.add_paragraph(line)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
@@ -0,0 +1,202 @@
+"""
+Load generator that replays the resume dataset against a local /predict
+
+Samples resumes from resume_dataset.csv and sends them as pasted text and as
+TXT, PDF and DOCX uploads built from the same text. Requests arrive at a
+fixed average rate (Poisson arrivals) with at most --concurrency in flight,
+stepping the rate up to trace the throughput/latency curve. Latency is
+measured from each request's scheduled arrival, so time spent queueing for a
+free connection counts, the way a real client would see it once the server
+falls behind.
+
+Starts the app itself (the Flask server or gunicorn on a local port) or
+drives one already running with --url. Nothing leaves the machine.
+
+Run from the resume_screening_api directory (needs a trained model and
+requests; gunicorn for --server gunicorn):
+    python benchmarks/load_test.py [--server flask|gunicorn] [--rates 2 5 10 20] [--concurrency 16]
+    python benchmarks/load_test.py --url http://127.0.0.1:5000 --rates 5 10
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_serving import percentile, serve
+from benchmarks.fixtures import docx_from_text, pdf_from_text
+
+DATASET_PATH = '../resume_dataset.csv'
+KINDS = ['text', 'txt', 'pdf', 'docx']
+
+def load_payloads(dataset_path, n, kinds, seed=0):
+    """
+    Sample n resumes and build every payload kind from each
+
+    Returns:
+        list: (kind, requests form data, requests files) tuples
+    """
+    with open(dataset_path, encoding='utf-8') as f:
+        resumes = [row['Resume'] for row in csv.DictReader(f) if row['Resume'].strip()]
+    rng = random.Random(seed)
+    sample = [rng.choice(resumes) for _ in range(n)]
+
+    payloads = []
+    for text in sample:
+        for kind in kinds:
+            if kind == 'text':
+                payloads.append((kind, {'resume_text': text}, None))
+            elif kind == 'txt':
+                payloads.append((kind, None, {'resume_file': ('resume.txt', text.encode('utf-8'))}))
+            elif kind == 'pdf':
+                payloads.append((kind, None, {'resume_file': ('resume.pdf', pdf_from_text(text))}))
+            elif kind == 'docx':
+                payloads.append((kind, None, {'resume_file': ('resume.docx', docx_from_text(text))}))
+    rng.shuffle(payloads)
+    return payloads
+
+def run_step(url, payloads, rate, duration, concurrency, seed=0):
+    """
+    Offer rate requests per second for duration seconds
+
+    Returns:
+        dict: Latencies by kind, error count and wall-clock time to drain
+    """
+    rng = random.Random(seed)
+    results = {kind: [] for kind in KINDS}
+    results['errors'] = 0
+    lock = threading.Lock()
+    local = threading.local()
+
+    def send(payload, scheduled):
+        kind, data, files = payload
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+        try:
+            response = local.session.post(url, data=data, files=files, timeout=120)
+            ok = response.status_code == 200
+        except requests.RequestException:
+            ok = False
+        latency = time.perf_counter() - scheduled
+        with lock:
+            if ok:
+                results[kind].append(latency)
+            else:
+                results['errors'] += 1
+
+    start = time.perf_counter()
+    next_arrival = start
+    sent = 0
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        while next_arrival < start + duration:
+            delay = next_arrival - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(send, payloads[sent % len(payloads)], next_arrival)
+            sent += 1
+            next_arrival += rng.expovariate(rate)
+    results['sent'] = sent
+    results['arrival_rps'] = sent / duration
+    results['elapsed'] = time.perf_counter() - start
+    return results
+
+def summarise(rate, results):
+    latencies = [latency for kind in KINDS for latency in results[kind]]
+    return {
+        'offered_rps': rate,
+        'arrival_rps': results['arrival_rps'],
+        'sent': results['sent'],
+        'ok': len(latencies),
+        'errors': results['errors'],
+        'throughput_rps': len(latencies) / results['elapsed'],
+        'p50_ms': percentile(latencies, 0.5) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'p95_ms_by_kind': {kind: percentile(results[kind], 0.95) * 1000 for kind in KINDS if results[kind]},
+    }
+
+def start_server(kind, port, workers, cache):
+    env = dict(os.environ, LOG_LEVEL='WARNING')
+    if not cache:
+        # Replayed resumes repeat, and the cache would answer them from memory
+        env.update(RESULT_CACHE_SIZE='0', RESULT_CACHE_PATH='')
+    if kind == 'gunicorn':
+        command = [sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{port}',
+                   '--workers', str(workers), '--timeout', '120', 'wsgi:app']
+    else:
+        env['PORT'] = str(port)
+        command = [sys.executable, '-c', f"from wsgi import app; app.run(host='127.0.0.1', port={port}, threaded=True)"]
+    return serve(command, port, env)
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay the resume dataset against /predict at increasing rates")
+    parser.add_argument('--url', help="Base URL of a running server; by default one is started locally")
+    parser.add_argument('--server', choices=['flask', 'gunicorn'], default='flask', help="Server to start")
+    parser.add_argument('--workers', type=int, default=2, help="gunicorn workers")
+    parser.add_argument('--port', type=int, default=8780, help="Port of the started server")
+    parser.add_argument('--rates', type=float, nargs='+', default=[2, 5, 10, 20, 40],
+                        help="Offered requests per second, one step each")
+    parser.add_argument('--duration', type=float, default=15, help="Seconds per step")
+    parser.add_argument('--concurrency', type=int, default=16, help="Maximum requests in flight")
+    parser.add_argument('--kinds', nargs='+', choices=KINDS, default=KINDS, help="Payload kinds to mix")
+    parser.add_argument('--sample', type=int, default=50, help="Resumes sampled from the dataset")
+    parser.add_argument('--dataset', default=DATASET_PATH, help="CSV with a Resume column")
+    parser.add_argument('--cache', action='store_true', help="Leave the result cache on in the started server")
+    parser.add_argument('--output', help="Save the curve as JSON")
+    args = parser.parse_args()
+
+    print("🚦 /predict LOAD TEST")
+    print("="*50)
+    payloads = load_payloads(args.dataset, args.sample, args.kinds)
+    print(f"   {len(payloads)} payloads ({', '.join(args.kinds)}) from {args.sample} resumes, "
+          f"concurrency {args.concurrency}, {args.duration:.0f}s per step, {os.cpu_count()} CPUs")
+
+    process = None
+    base_url = args.url
+    if base_url is None:
+        process = start_server(args.server, args.port, args.workers, args.cache)
+        base_url = f"http://127.0.0.1:{args.port}"
+        print(f"   Started {args.server} at {base_url}")
+
+    curve = []
+    try:
+        url = f"{base_url.rstrip('/')}/predict"
+        run_step(url, payloads, args.rates[0], 2, args.concurrency)  # warm up
+        print(f"\n{'offered':>8} {'achieved':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'errors':>7}")
+        for rate in args.rates:
+            point = summarise(rate, run_step(url, payloads, rate, args.duration, args.concurrency))
+            curve.append(point)
+            # Finishing fewer requests than arrived means they are piling up
+            saturated = point['throughput_rps'] < 0.9 * point['arrival_rps']
+            print(f"{point['arrival_rps']:>6.1f}/s {point['throughput_rps']:>7.1f}/s {point['p50_ms']:>7.0f}ms "
+                  f"{point['p95_ms']:>7.0f}ms {point['p99_ms']:>7.0f}ms {point['errors']:>7}"
+                  f"{'  ⚠️  saturated' if saturated else ''}")
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+
+    sustained = [point for point in curve if point['throughput_rps'] >= 0.9 * point['arrival_rps']]
+    if sustained:
+        best = sustained[-1]
+        print(f"\n📈 Sustained {best['throughput_rps']:.1f} req/s at p95 {best['p95_ms']:.0f}ms "
+              f"(highest offered rate kept up with: {best['offered_rps']:g}/s)")
+    else:
+        print("\n📈 The server fell behind even at the lowest offered rate")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'server': args.url or args.server, 'concurrency': args.concurrency,
+                       'kinds': args.kinds, 'curve': curve}, f, indent=2)
+        print(f"💾 Curve saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""
+Benchmark suite for the screening hot paths
+
+Times clean_resume, vectorizer.transform, predict_category and
+extract_text_from_file separately, on generated PDF, DOCX and TXT fixtures of
+several sizes, one item at a time and in batches. Every case records its
+median time, throughput and peak Python memory. Results are saved as JSON and
+compared against a stored baseline; a case more than --threshold slower (or
+hungrier) than the baseline is flagged and the run exits with status 1.
+
+Baselines are machine specific: record one on the machine that runs the
+comparison.
+
+Run from the resume_screening_api directory (needs a trained model for the
+vectorize and predict cases):
+    python benchmarks/run_benchmarks.py [--filter extract] [--repeat 7]
+    python benchmarks/run_benchmarks.py --update-baseline
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixtures import make_docx, make_pdf, make_text
+from preprocessing import document_extractor
+from preprocessing.document_extractor import extract_text_from_file
+from preprocessing.text_cleaner import clean_resume
+from utils.model_utils import load_model, predict_categories, predict_category
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baseline.json')
+RESULTS_PATH = os.path.join(BENCH_DIR, 'results', 'latest.json')
+
+# Fixture sizes, small to large
+TEXT_WORDS = {'small': 300, 'medium': 3000, 'large': 30000}
+PDF_PAGES = {'small': 1, 'medium': 5, 'large': 20}
+DOCX_PARAGRAPHS = {'small': 10, 'medium': 100, 'large': 1000}
+BATCH_SIZE = 500
+
+class Case:
+    """One benchmark: a callable and the number of items it processes"""
+
+    def __init__(self, name, func, items=1):
+        self.name = name
+        self.func = func
+        self.items = items
+
+def text_cases():
+    single = make_text(TEXT_WORDS['medium'])
+    batch = [make_text(400, seed=i) for i in range(BATCH_SIZE)]
+    cases = [Case(f'clean/single/{size}', lambda text=make_text(words): clean_resume(text))
+             for size, words in TEXT_WORDS.items()]
+    cases.append(Case('clean/batch', lambda: [clean_resume(text) for text in batch], BATCH_SIZE))
+    return cases, clean_resume(single), [clean_resume(text) for text in batch]
+
+def model_cases(single, batch):
+    try:
+        model, vectorizer, label_encoder = load_model()
+    except Exception as e:
+        print(f"⚠️  Skipping vectorize and predict cases: {e}")
+        return []
+    return [
+        Case('vectorize/single', lambda: vectorizer.transform([single])),
+        Case('vectorize/batch', lambda: vectorizer.transform(batch), BATCH_SIZE),
+        Case('predict/single', lambda: predict_category(single, model, vectorizer, label_encoder)),
+        Case('predict/batch', lambda: predict_categories(batch, model, vectorizer, label_encoder), BATCH_SIZE),
+    ]
+
+def extraction_cases():
+    fixtures = {}
+    for size, words in TEXT_WORDS.items():
+        fixtures[f'txt/{size}'] = ('.txt', make_text(words).encode('utf-8'))
+    for size, pages in PDF_PAGES.items():
+        fixtures[f'pdf/{size}'] = ('.pdf', make_pdf(pages))
+    try:
+        for size, paragraphs in DOCX_PARAGRAPHS.items():
+            fixtures[f'docx/{size}'] = ('.docx', make_docx(paragraphs))
+    except ImportError:
+        print("⚠️  Skipping DOCX cases: python-docx is not installed")
+
+    return [Case(f'extract/{name}', lambda data=data, ext=ext: extract_text_from_file(data, ext))
+            for name, (ext, data) in fixtures.items()]
+
+def _calls_per_sample(func, min_sample_seconds):
+    # Fast cases are called several times per sample, so that timer
+    # resolution and scheduler noise do not dominate them
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - start >= min_sample_seconds or number >= 1 << 16:
+            return number
+        number *= 4
+
+def measure(case, repeat, min_sample_seconds=0.05):
+    """
+    Time a case and record its peak memory
+
+    The first calls warm caches and lazy imports and are not timed. Memory is
+    traced in a separate call, since tracing slows the code it watches.
+
+    Returns:
+        dict: Per-call timings, throughput and peak traced memory of the case
+    """
+    number = _calls_per_sample(case.func, min_sample_seconds)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            case.func()
+        times.append((time.perf_counter() - start) / number)
+
+    tracemalloc.start()
+    case.func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    median = statistics.median(times)
+    return {
+        'items': case.items,
+        'repeat': repeat,
+        'calls_per_sample': number,
+        'median_seconds': median,
+        'min_seconds': min(times),
+        'items_per_second': case.items / median if median else None,
+        'peak_memory_bytes': peak,
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results, baseline, threshold):
+    """
+    Compare results against a baseline run
+
+    Args:
+        results (dict): Case name to measurement
+        baseline (dict): Case name to measurement of the baseline run
+        threshold (float): Allowed relative slowdown or memory growth
+
+    Returns:
+        list: Names of the regressed cases
+    """
+    regressions = []
+    print(f"\n{'case':<26} {'baseline':>10} {'now':>10} {'change':>8} {'memory':>8}")
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            print(f"{name:<26} {'-':>10} {result['median_seconds']*1000:>8.2f}ms {'new':>8}")
+            continue
+        time_change = result['median_seconds'] / before['median_seconds'] - 1
+        # The best sample must be slower too, so one noisy sample is not a regression
+        best_change = result['min_seconds'] / before['min_seconds'] - 1
+        memory_change = (result['peak_memory_bytes'] / before['peak_memory_bytes'] - 1
+                         if before['peak_memory_bytes'] else 0)
+        # Small absolute memory differences are allocator noise
+        memory_regressed = (memory_change > threshold
+                            and result['peak_memory_bytes'] - before['peak_memory_bytes'] > 1 << 20)
+        regressed = min(time_change, best_change) > threshold or memory_regressed
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<26} {before['median_seconds']*1000:>8.2f}ms {result['median_seconds']*1000:>8.2f}ms "
+              f"{time_change:>+7.0%} {memory_change:>+7.0%}  {'❌' if regressed else '✅'}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the cleaning, vectorisation, extraction and prediction paths")
+    parser.add_argument('--filter', default='', help="Only run cases whose name contains this")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed calls per case")
+    parser.add_argument('--output', default=RESULTS_PATH, help="Where to save the results JSON")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="Results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.15, help="Relative slowdown flagged as a regression")
+    parser.add_argument('--update-baseline', action='store_true', help="Save these results as the baseline")
+    parser.add_argument('--pdf-workers', type=int, default=1,
+                        help="PDF page processes; 1 keeps results comparable across machines")
+    args = parser.parse_args()
+
+    document_extractor.PDF_WORKERS = args.pdf_workers
+
+    print("⏱️  RESUME SCREENING BENCHMARKS")
+    print("="*50)
+    print(f"   Python {platform.python_version()}, {os.cpu_count()} CPUs, {args.repeat} repeats per case")
+
+    cases, single, batch = text_cases()
+    cases += model_cases(single, batch)
+    cases += extraction_cases()
+    cases = [case for case in cases if args.filter in case.name]
+
+    results = {}
+    print(f"\n{'case':<26} {'median':>10} {'items/s':>12} {'peak mem':>10}")
+    for case in cases:
+        result = measure(case, args.repeat)
+        results[case.name] = result
+        print(f"{case.name:<26} {result['median_seconds']*1000:>8.2f}ms {result['items_per_second']:>12.1f} "
+              f"{result['peak_memory_bytes'] / 1024:>8.0f}KB")
+
+    run = {
+        'meta': {
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'repeat': args.repeat,
+            'pdf_workers': args.pdf_workers,
+            # Linux reports kilobytes
+            'max_rss_bytes': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        },
+        'results': results,
+    }
+
+    output = BASELINE_PATH if args.update_baseline else args.output
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(run, f, indent=2)
+    print(f"\n💾 Results saved to {output}")
+
+    if args.update_baseline or not os.path.exists(args.baseline):
+        return True
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    print(f"\n📈 Compared with baseline {args.baseline} "
+          f"(commit {baseline['meta'].get('commit')}, {baseline['meta']['timestamp']})")
+    regressions = compare(results, baseline['results'], args.threshold)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regressions over {args.threshold:.0%}: {', '.join(regressions)}")
+        return False
+    print(f"\n✅ No regressions over {args.threshold:.0%}")
+    return True
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
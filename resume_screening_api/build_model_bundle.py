@@ -0,0 +1,96 @@
+"""
+Convert the pickled model artifacts into a memory-mappable model bundle
+
+Reads models/resume_classifier.pkl, models/tfidf_vectorizer.pkl,
+models/label_encoder.pkl (and models/ann_index.pkl if present), writes
+models/resume_model.bundle, checks the bundle predicts exactly like the
+pickles, and compares load times.
+
+Usage:
+    python build_model_bundle.py [--output models/resume_model.bundle] [--repeat 20]
+"""
+import argparse
+import os
+import pickle
+import resource
+import sys
+import time
+
+from utils.ann_index import IVFIndex
+from utils.dataset import load_dataset
+from utils.knn_engine import KNNScoringEngine
+from utils.model_bundle import DEFAULT_BUNDLE_PATH, load_bundle, write_bundle
+
+def load_pickles():
+    with open('models/resume_classifier.pkl', 'rb') as f:
+        model = pickle.load(f)
+    with open('models/tfidf_vectorizer.pkl', 'rb') as f:
+        vectorizer = pickle.load(f)
+    with open('models/label_encoder.pkl', 'rb') as f:
+        label_encoder = pickle.load(f)
+    return model, vectorizer, label_encoder
+
+def convert(output_path):
+    """Write a bundle from the pickled artifacts and return its version"""
+    model, vectorizer, label_encoder = load_pickles()
+    engine = KNNScoringEngine.from_model(model)
+
+    index = None
+    if os.path.exists('models/ann_index.pkl'):
+        index = IVFIndex.load('models/ann_index.pkl')
+
+    return write_bundle(output_path, engine, vectorizer, label_encoder, index=index)
+
+def check_equivalence(bundle_path):
+    """Compare bundle predictions with the pickled model over the dataset"""
+    model, vectorizer, label_encoder = load_pickles()
+    engine = KNNScoringEngine.from_model(model)
+    bundle_engine, bundle_vectorizer, bundle_encoder, _ = load_bundle(bundle_path)
+
+    texts = load_dataset().cleaned()
+
+    expected = label_encoder.inverse_transform(engine.predict(vectorizer.transform(texts)))
+    actual = bundle_encoder.inverse_transform(bundle_engine.predict(bundle_vectorizer.transform(texts)))
+    return int((expected == actual).sum()), len(texts)
+
+def benchmark_load(bundle_path, repeat):
+    """Best-of-N load time of the pickles and of the bundle, in seconds"""
+    pickle_times, bundle_times = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        model, _, _ = load_pickles()
+        KNNScoringEngine.from_model(model)
+        pickle_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        load_bundle(bundle_path)
+        bundle_times.append(time.perf_counter() - start)
+    return min(pickle_times), min(bundle_times)
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert pickled model artifacts into a model bundle")
+    parser.add_argument('--output', default=DEFAULT_BUNDLE_PATH, help="Bundle file to write")
+    parser.add_argument('--repeat', type=int, default=20, help="Load-time benchmark repetitions")
+    args = parser.parse_args()
+
+    print("📦 MODEL BUNDLE CONVERSION")
+    print("="*50)
+    version = convert(args.output)
+    pickle_size = sum(os.path.getsize(f"models/{name}") for name in
+                      ['resume_classifier.pkl', 'tfidf_vectorizer.pkl', 'label_encoder.pkl'])
+    print(f"   ✅ Wrote {args.output} (version {version})")
+    print(f"   Size: {os.path.getsize(args.output)/1024:.1f} KB bundle vs {pickle_size/1024:.1f} KB pickles")
+
+    matches, total = check_equivalence(args.output)
+    print(f"   Predictions identical to pickles: {matches}/{total}")
+
+    pickle_time, bundle_time = benchmark_load(args.output, args.repeat)
+    print(f"\n⚡ LOAD TIME (best of {args.repeat})")
+    print(f"   pickles: {pickle_time*1000:.1f} ms")
+    print(f"   bundle:  {bundle_time*1000:.1f} ms ({pickle_time/bundle_time:.1f}x faster)")
+    print(f"   peak RSS of this process: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss/1024:.1f} MB")
+
+    return matches == total
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -1,16 +1,19 @@
-import pandas as pd
 import joblib
 
-# Check what categories are in the dataset
+from utils.model_manifest import MANIFEST_PATH, load_manifest
+
+# The manifest written at training time has the dataset counts of every
+# category the model was trained on, so the dataset is not re-read here
+manifest = load_manifest()
+
 print("=== CHECKING DATASET CATEGORIES ===")
-try:
-    df = pd.read_csv('../resume_dataset.csv')
-    categories = df['Category'].value_counts()
-    print(f"\nFound {len(categories)} categories in dataset:")
-    for cat, count in categories.items():
+if manifest:
+    print(f"\nFound {len(manifest['classes'])} categories in the dataset used for training "
+          f"({manifest['document_count']} resumes, trained {manifest['trained_at']}):")
+    for cat, count in sorted(manifest['class_counts'].items(), key=lambda item: -item[1]):
         print(f"- {cat}: {count} resumes")
-except Exception as e:
-    print(f"Error reading dataset: {e}")
+else:
+    print(f"\n{MANIFEST_PATH} not found. Please retrain the model to write it.")
 
 print("\n" + "="*50)
 
@@ -21,5 +24,7 @@ try:
     print(f"\nModel was trained on {len(label_encoder.classes_)} categories:")
     for i, cat in enumerate(label_encoder.classes_):
         print(f"{i+1}. {cat}")
+    if manifest and manifest['classes'] != [str(c) for c in label_encoder.classes_]:
+        print("\n⚠️  The manifest does not match the saved label encoder. Please retrain the model.")
 except Exception as e:
     print(f"Error loading model: {e}")
@@ -0,0 +1,50 @@
+"""
+Check that the sparse-matmul KNN scoring engine reproduces the trained model
+"""
+import pickle
+import time
+import numpy as np
+
+from utils.dataset import load_dataset
+from utils.knn_engine import KNNScoringEngine
+
+def check_knn_engine():
+    print("🔍 KNN SCORING ENGINE EQUIVALENCE CHECK")
+    print("="*50)
+
+    with open('models/resume_classifier.pkl', 'rb') as f:
+        model = pickle.load(f)
+    with open('models/tfidf_vectorizer.pkl', 'rb') as f:
+        vectorizer = pickle.load(f)
+
+    X = load_dataset().transform(vectorizer)
+    print(f"📊 Queries: {X.shape[0]} resumes, {X.shape[1]} features")
+
+    engine = KNNScoringEngine.from_model(model)
+
+    start = time.perf_counter()
+    expected_pred = model.predict(X)
+    expected_proba = model.predict_proba(X)
+    sklearn_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indices, _ = engine.kneighbors(X)
+    proba = engine.vote(indices)
+    pred = engine.classes_[proba.argmax(axis=1)]
+    engine_time = time.perf_counter() - start
+
+    pred_matches = int((pred == expected_pred).sum())
+    proba_matches = int(np.isclose(proba, expected_proba).all(axis=1).sum())
+
+    print(f"   Predictions identical: {pred_matches}/{len(pred)}")
+    print(f"   Probabilities identical: {proba_matches}/{len(pred)}")
+    print(f"   sklearn predict + predict_proba: {sklearn_time*1000:.1f} ms")
+    print(f"   Engine single pass: {engine_time*1000:.1f} ms")
+
+    equivalent = pred_matches == len(pred) and proba_matches == len(pred)
+    print("\n✅ Engine is equivalent" if equivalent else "\n❌ Engine differs from the model")
+    return equivalent
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(0 if check_knn_engine() else 1)
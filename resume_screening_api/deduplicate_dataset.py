@@ -0,0 +1,201 @@
+"""
+Find near-duplicate resumes in the dataset and write a deduplicated copy
+
+Clusters resumes whose word-shingle sets have an estimated Jaccard
+similarity of at least --threshold, using MinHash signatures and LSH
+(utils/near_duplicates.py), and reports the clusters and how many test
+resumes of the training split have a near-duplicate in the training rows.
+
+--output writes the first resume of every cluster and category; point
+DATASET_PATH (or --dataset of the training scripts) at it to train on it.
+--compare trains the serving KNN engine on both datasets and reports the
+size of its training matrix, its latency and its accuracy.
+
+Run from the resume_screening_api directory:
+    python deduplicate_dataset.py [--threshold 0.9] [--output ../resume_dataset_dedup.csv] [--compare]
+"""
+import argparse
+import csv
+import os
+import tempfile
+import time
+from collections import Counter
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.model_selection import train_test_split
+
+from utils.dataset import DATASET_PATH, load_dataset
+from utils.knn_engine import KNNScoringEngine
+from utils.near_duplicates import BANDS, NUM_PERM, cluster_near_duplicates, signatures_for_texts
+
+def training_split(categories):
+    """
+    Train and test rows of the split in models/train_model.py
+
+    Returns:
+        tuple: (train row numbers, test row numbers)
+    """
+    labels = np.asarray(categories)
+    counts = Counter(categories)
+    # Stratification needs two rows of every category
+    stratify = labels if min(counts.values()) >= 2 else None
+    return train_test_split(np.arange(len(labels)), test_size=0.2, random_state=42, stratify=stratify)
+
+def leaked_test_rows(clusters, categories):
+    """Test rows of the training split whose cluster has a row in the training rows"""
+    train_rows, test_rows = training_split(categories)
+    train_clusters = set(clusters[train_rows])
+    return test_rows[[cluster in train_clusters for cluster in clusters[test_rows]]]
+
+def kept_rows(clusters, categories):
+    """First row of every cluster and category, in dataset order"""
+    seen = set()
+    rows = []
+    for row, key in enumerate(zip(clusters, categories)):
+        if key not in seen:
+            seen.add(key)
+            rows.append(row)
+    return np.asarray(rows)
+
+def report_clusters(clusters, categories):
+    sizes = Counter(clusters)
+    duplicated = {cluster: size for cluster, size in sizes.items() if size > 1}
+    print(f"\n📊 CLUSTERS:")
+    print(f"   {len(sizes)} clusters for {len(clusters)} resumes; "
+          f"{len(duplicated)} hold near-duplicates ({sum(duplicated.values())} resumes)")
+    if not duplicated:
+        return
+
+    buckets = [(2, 2), (3, 5), (6, 10), (11, 100), (101, None)]
+    for low, high in buckets:
+        count = sum(1 for size in duplicated.values() if size >= low and (high is None or size <= high))
+        if count:
+            label = f"{low}" if low == high else f"{low}+" if high is None else f"{low}-{high}"
+            print(f"   size {label:>7}: {count} clusters")
+
+    by_cluster = {}
+    for cluster, category in zip(clusters, categories):
+        by_cluster.setdefault(cluster, Counter())[category] += 1
+    mixed = [cluster for cluster in duplicated if len(by_cluster[cluster]) > 1]
+    print(f"   {len(mixed)} clusters mix categories (the same resume labelled differently)")
+    print(f"   Largest:")
+    for cluster, size in sorted(duplicated.items(), key=lambda item: -item[1])[:5]:
+        labels = ', '.join(f"{category} ×{count}" for category, count in by_cluster[cluster].most_common(3))
+        print(f"      row {cluster}: {size} resumes ({labels})")
+
+def write_dataset(path, categories, resumes, rows):
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['Category', 'Resume'])
+        writer.writerows((categories[row], resumes[row]) for row in rows)
+
+def measure_model(dataset, leaked=None):
+    """
+    Train the engine like models/train_model.py and measure it
+
+    As in the trainer, the vectorizer is fitted on every resume of the
+    dataset before the split, through the same dataset cache entry, so the
+    numbers are those of the model the trainer would publish.
+
+    Args:
+        dataset (Dataset): Dataset to train on
+        leaked (array): Test rows to leave out of a second, leak-free accuracy
+
+    Returns:
+        dict: Matrix bytes, latencies and accuracies
+    """
+    categories = dataset.categories
+    train_rows, test_rows = training_split(categories)
+    vectorizer = TfidfVectorizer(sublinear_tf=True, stop_words='english', max_features=1500)
+    _, X_tfidf = dataset.fit_tfidf(vectorizer)
+    X_train, X_test = X_tfidf[train_rows], X_tfidf[test_rows]
+    classes, labels = np.unique(categories, return_inverse=True)
+    engine = KNNScoringEngine(X_train, labels[train_rows], np.arange(len(classes)), n_neighbors=5)
+
+    # Serving holds the matrix and its transpose
+    size = sum(m.data.nbytes + m.indices.nbytes + m.indptr.nbytes
+               for m in (engine.train_matrix, engine._train_t))
+
+    single = []
+    for row in range(min(X_test.shape[0], 200)):
+        start = time.perf_counter()
+        engine.predict(X_test[row])
+        single.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    predicted = engine.predict(X_test)
+    batch = time.perf_counter() - start
+
+    correct = predicted == labels[test_rows]
+    result = {
+        'train_rows': len(train_rows),
+        'matrix_bytes': size,
+        'latency_ms': float(np.median(single) * 1000),
+        'batch_ms': batch * 1000,
+        'accuracy': float(correct.mean()),
+    }
+    if leaked is not None:
+        clean = ~np.isin(test_rows, leaked)
+        result['leak_free_accuracy'] = float(correct[clean].mean()) if clean.any() else None
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Cluster near-duplicate resumes and deduplicate the dataset")
+    parser.add_argument('--dataset', default=DATASET_PATH, help="CSV with Category and Resume columns")
+    parser.add_argument('--threshold', type=float, default=0.9, help="Estimated Jaccard similarity of duplicates")
+    parser.add_argument('--num-perm', type=int, default=NUM_PERM, help="MinHash signature length")
+    parser.add_argument('--bands', type=int, default=BANDS, help="LSH bands; must divide --num-perm")
+    parser.add_argument('--output', help="Write the deduplicated dataset to this CSV")
+    parser.add_argument('--compare', action='store_true', help="Compare models trained on both datasets")
+    args = parser.parse_args()
+
+    print("🧬 NEAR-DUPLICATE DETECTION")
+    print("="*50)
+    dataset = load_dataset(args.dataset)
+    texts = dataset.cleaned()
+    categories = dataset.categories
+    print(f"   {len(texts)} resumes from {args.dataset}")
+
+    start = time.perf_counter()
+    signatures = signatures_for_texts(texts, num_perm=args.num_perm)
+    signature_time = time.perf_counter() - start
+    start = time.perf_counter()
+    clusters, compared = cluster_near_duplicates(signatures, args.threshold, args.bands)
+    cluster_time = time.perf_counter() - start
+    print(f"   MinHash signatures: {signature_time:.2f}s; LSH clustering: {cluster_time:.2f}s "
+          f"({compared} candidate comparisons)")
+
+    report_clusters(clusters, categories)
+
+    leaked = leaked_test_rows(clusters, categories)
+    test_size = len(training_split(categories)[1])
+    print(f"\n🔓 {len(leaked)} of {test_size} test resumes of the training split "
+          f"have a near-duplicate in the training rows")
+
+    keep = kept_rows(clusters, categories)
+    print(f"\n✂️  Deduplicated dataset: {len(keep)} resumes ({1 - len(keep) / len(texts):.1%} fewer)")
+
+    if args.output:
+        write_dataset(args.output, categories, dataset.resumes, keep)
+        print(f"💾 Written to {args.output}; train on it with DATASET_PATH={args.output}")
+
+    if args.compare:
+        print(f"\n⚖️  MODEL COMPARISON (train_model.py settings):")
+        full = measure_model(dataset, leaked)
+        # The deduplicated rows are trained on as the CSV the trainer would read
+        with tempfile.TemporaryDirectory() as directory:
+            deduped_path = args.output or os.path.join(directory, 'deduplicated.csv')
+            if not args.output:
+                write_dataset(deduped_path, categories, dataset.resumes, keep)
+            deduped = measure_model(load_dataset(deduped_path))
+        print(f"   {'':<22}{'full':>12}{'deduplicated':>14}")
+        print(f"   {'training rows':<22}{full['train_rows']:>12}{deduped['train_rows']:>14}")
+        print(f"   {'training matrix':<22}{full['matrix_bytes'] / 1024:>10.0f}KB{deduped['matrix_bytes'] / 1024:>12.0f}KB")
+        print(f"   {'latency per resume':<22}{full['latency_ms']:>10.2f}ms{deduped['latency_ms']:>12.2f}ms")
+        print(f"   {'test set in one batch':<22}{full['batch_ms']:>10.1f}ms{deduped['batch_ms']:>12.1f}ms")
+        print(f"   {'test accuracy':<22}{full['accuracy']:>12.1%}{deduped['accuracy']:>14.1%}")
+        if full.get('leak_free_accuracy') is not None:
+            print(f"   {'  without leaked rows':<22}{full['leak_free_accuracy']:>12.1%}")
+
+if __name__ == "__main__":
+    main()
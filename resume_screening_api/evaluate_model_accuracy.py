@@ -1,20 +1,35 @@
+import argparse
 import pandas as pd
 import numpy as np
 import pickle
 import os
+import time
 from sklearn.model_selection import train_test_split, cross_val_score
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 import seaborn as sns
 import matplotlib.pyplot as plt
 
-def evaluate_model_accuracy():
-    """Comprehensive model accuracy evaluation"""
+from utils.dataset import load_dataset
+from utils.fast_evaluation import cross_validate_knn
+from utils.knn_engine import KNNScoringEngine
+from utils.model_utils import build_scoring_engine
+
+def evaluate_model_accuracy(fast=False, workers=None):
+    """
+    Comprehensive model accuracy evaluation
+    
+    Args:
+        fast (bool): Derive predictions, probabilities and every CV fold from
+            neighbour tables instead of repeated predict calls and refits
+        workers (int): Processes the CV folds are spread over in fast mode
+    """
     
     print("=== RESUME SCREENING MODEL ACCURACY ANALYSIS ===\n")
     
     # 1. Load the dataset
     try:
-        df = pd.read_csv('../resume_dataset.csv')
+        dataset = load_dataset()
+        df = pd.DataFrame({'Category': dataset.categories, 'Resume': dataset.resumes})
         print(f"✅ Dataset loaded: {len(df)} resumes")
         print(f"📊 Categories: {len(df['Category'].unique())}")
         
@@ -62,25 +77,15 @@ def evaluate_model_accuracy():
     try:
         print(f"\n🔄 Preparing data for evaluation...")
         
-        # Clean and preprocess resumes (simplified version)
-        def simple_clean(text):
-            import re
-            import string
-            text = re.sub(r'[^a-zA-Z\s]', '', str(text))
-            text = text.lower().strip()
-            return text
-            
-        df['cleaned_resume'] = df['Resume'].apply(simple_clean)
-        
         # Filter to only categories that the model knows about
-        df_filtered = df[df['Category'].isin(label_encoder.classes_)]
-        print(f"   📊 Filtered to {len(df_filtered)} resumes with known categories")
+        known = df['Category'].isin(label_encoder.classes_).values
+        print(f"   📊 Filtered to {known.sum()} resumes with known categories")
         
-        X = df_filtered['cleaned_resume'].values
-        y = df_filtered['Category'].values
+        y = df['Category'].values[known]
         
-        # Transform using the trained vectorizer and encoder
-        X_features = vectorizer.transform(X)
+        # Cleaned exactly as training and serving do, and transformed with the
+        # trained vectorizer; both are read from the dataset cache when fresh
+        X_features = dataset.transform(vectorizer)[np.flatnonzero(known)]
         y_encoded = label_encoder.transform(y)
         
         print(f"   ✅ Data prepared: {X_features.shape[0]} samples, {X_features.shape[1]} features")
@@ -93,16 +98,34 @@ def evaluate_model_accuracy():
     try:
         print(f"\n📈 ACCURACY EVALUATION:")
         
-        # Overall accuracy on full dataset
-        y_pred = model.predict(X_features)
+        start = time.perf_counter()
+        engine = build_scoring_engine(model) if fast else None
+        if isinstance(engine, KNNScoringEngine):
+            # One neighbour search answers both predict and predict_proba
+            indices, _ = engine.kneighbors(X_features, exact=True)
+            y_proba = engine.vote(indices)
+            y_pred = engine.classes_[y_proba.argmax(axis=1)]
+        else:
+            if fast:
+                print("   ⚠️  Fast mode needs a KNN model; evaluating with predict calls")
+            # Overall accuracy on full dataset
+            y_pred = model.predict(X_features)
+            y_proba = model.predict_proba(X_features)
         overall_accuracy = accuracy_score(y_encoded, y_pred)
         
         print(f"   🎯 Overall Accuracy: {overall_accuracy:.1%}")
         
         # Cross-validation accuracy (more reliable)
-        cv_scores = cross_val_score(model, X_features, y_encoded, cv=5, scoring='accuracy')
+        if isinstance(engine, KNNScoringEngine):
+            # Folds read their neighbours from one corpus-vs-corpus table
+            cv_scores, exact_rows = cross_validate_knn(X_features, y_encoded, engine.n_neighbors,
+                                                       n_splits=5, workers=workers)
+            print(f"   ⚡ Fast evaluation: {exact_rows} of {len(y_encoded)} CV rows needed an exact search")
+        else:
+            cv_scores = cross_val_score(model, X_features, y_encoded, cv=5, scoring='accuracy')
         cv_mean = cv_scores.mean()
         cv_std = cv_scores.std()
+        print(f"   ⏱️  Scored in {time.perf_counter() - start:.2f}s")
         
         print(f"   🔄 Cross-Validation Accuracy: {cv_mean:.1%} (±{cv_std:.1%})")
         print(f"   📊 CV Score Range: {cv_scores.min():.1%} - {cv_scores.max():.1%}")
@@ -154,8 +177,6 @@ def evaluate_model_accuracy():
     try:
         print(f"\n🎯 CONFIDENCE ANALYSIS:")
         
-        # Get prediction probabilities
-        y_proba = model.predict_proba(X_features)
         max_probabilities = np.max(y_proba, axis=1)
         
         confidence_ranges = [
@@ -212,8 +233,13 @@ def evaluate_model_accuracy():
     }
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate the trained model on the dataset")
+    parser.add_argument('--fast', action='store_true',
+                        help="Derive every metric and CV fold from precomputed neighbour tables")
+    parser.add_argument('--workers', type=int, default=None, help="Processes for the CV folds in fast mode")
+    args = parser.parse_args()
     try:
-        results = evaluate_model_accuracy()
+        results = evaluate_model_accuracy(fast=args.fast, workers=args.workers)
         if results:
             print(f"\n✅ Model evaluation completed successfully!")
         else:
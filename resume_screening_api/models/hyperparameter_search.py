@@ -0,0 +1,240 @@
+"""
+Hyperparameter search over the TF-IDF + KNN model
+
+Cleans and tokenises the corpus once into integer term ids, then builds the
+count matrix of every n-gram range from those ids with numpy instead of
+re-running the vectorizer. For every configuration the vocabulary limit and
+IDF are fitted on the training folds only, and the KNN scoring engine used in
+serving is evaluated with stratified cross-validation. Configurations run in
+parallel on a process pool; every candidate is reported with its accuracy,
+per-resume scoring latency and model size.
+
+Run from the resume_screening_api directory:
+    python models/hyperparameter_search.py [--workers 4] [--folds 3] [--output search.json]
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.model_selection import StratifiedKFold
+from sklearn.preprocessing import LabelEncoder, normalize
+
+# Allow running as `python models/hyperparameter_search.py` from the API directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.dataset import DATASET_PATH, load_dataset
+from utils.knn_engine import KNNScoringEngine
+
+# Settings hardcoded in the training scripts, marked in the report. Only
+# train_model.py's row is that pipeline; retrain_with_fullstack.py also
+# lemmatises and weights neighbours by distance, which the search does not
+CURRENT_SETTINGS = {
+    (1500, (1, 1), 5): 'models/train_model.py',
+    (2000, (1, 2), 7): 'retrain_with_fullstack.py feature settings only',
+}
+
+# Corpus of each pool process, set once by _init_worker
+_corpus = {}
+
+def tokenise_corpus(texts):
+    """
+    Tokenise cleaned texts once, the way TfidfVectorizer(stop_words='english') does
+
+    Returns:
+        tuple: (int32 term ids of all documents concatenated, document
+        offsets into them, list of unigram terms by id)
+    """
+    # Lowercasing, token pattern and stop words of the training vectorizer;
+    # stop words are dropped before n-grams are formed, as sklearn does
+    analyse = TfidfVectorizer(stop_words='english').build_analyzer()
+    vocabulary = {}
+    ids = []
+    offsets = [0]
+    for text in texts:
+        for token in analyse(text):
+            ids.append(vocabulary.setdefault(token, len(vocabulary)))
+        offsets.append(len(ids))
+    terms = sorted(vocabulary, key=vocabulary.get)
+    return np.asarray(ids, dtype=np.int32), np.asarray(offsets, dtype=np.int64), terms
+
+def ngram_counts(ids, offsets, n_terms, ngram_range):
+    """
+    Document-term counts of every n-gram in the range, built from term ids
+
+    An n-gram is encoded as a base-n_terms number of its term ids, so no
+    strings are formed.
+
+    Returns:
+        tuple: (CSR count matrix, int64 n-gram code of every column)
+    """
+    doc_of_token = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    rows, codes = [], []
+    for n in range(ngram_range[0], ngram_range[1] + 1):
+        # Positions where an n-gram fits inside its document
+        starts = np.arange(len(ids) - n + 1)
+        starts = starts[doc_of_token[starts] == doc_of_token[starts + n - 1]]
+        code = np.zeros(len(starts), dtype=np.int64)
+        for offset in range(n):
+            code = code * n_terms + ids[starts + offset]
+        # Separate the code spaces of different n by a leading n
+        rows.append(doc_of_token[starts])
+        codes.append(code + n * n_terms ** n if n > 1 else code)
+    rows = np.concatenate(rows)
+    columns, column_ids = np.unique(np.concatenate(codes), return_inverse=True)
+    counts = sparse.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, column_ids)),
+                               shape=(len(offsets) - 1, len(columns)))
+    counts.sum_duplicates()
+    return counts, columns
+
+def tfidf_features(train_counts, test_counts, max_features):
+    """
+    Fit the vocabulary limit and smoothed IDF on the training rows and
+    weight both sets like TfidfVectorizer(sublinear_tf=True)
+
+    Returns:
+        tuple: (train TF-IDF, test TF-IDF, kept column indices)
+    """
+    if max_features and max_features < train_counts.shape[1]:
+        # Most frequent terms in the training rows, as max_features keeps
+        frequency = np.asarray(train_counts.sum(axis=0)).ravel()
+        keep = np.sort(np.argsort(-frequency, kind='stable')[:max_features])
+    else:
+        keep = np.flatnonzero(np.asarray(train_counts.sum(axis=0)).ravel())
+    train_counts = train_counts[:, keep]
+    test_counts = test_counts[:, keep]
+
+    documents = train_counts.shape[0]
+    df = np.bincount(train_counts.indices, minlength=len(keep))
+    idf = (np.log((1 + documents) / (1 + df)) + 1).astype(np.float32)
+
+    weighted = []
+    for counts in (train_counts, test_counts):
+        counts = counts.copy()
+        counts.data = 1 + np.log(counts.data)
+        weighted.append(normalize(counts @ sparse.diags(idf)).tocsr())
+    return weighted[0], weighted[1], keep
+
+def _init_worker(ids, offsets, n_terms, labels, folds):
+    _corpus.update(ids=ids, offsets=offsets, n_terms=n_terms, labels=labels, folds=folds)
+    _corpus['counts'] = {}
+
+def evaluate_feature_config(max_features, ngram_range, neighbour_options):
+    """
+    Cross-validate every n_neighbors option for one feature configuration
+
+    Runs in a pool process. The count matrix of an n-gram range is built
+    once per process and reused by every configuration that needs it.
+
+    Returns:
+        list: Result dict of every n_neighbors option
+    """
+    counts_by_range = _corpus['counts']
+    if ngram_range not in counts_by_range:
+        counts_by_range[ngram_range] = ngram_counts(
+            _corpus['ids'], _corpus['offsets'], _corpus['n_terms'], ngram_range)[0]
+    counts = counts_by_range[ngram_range]
+    labels = _corpus['labels']
+    classes = np.unique(labels)
+
+    correct = {k: 0 for k in neighbour_options}
+    latencies = {k: [] for k in neighbour_options}
+    sizes, feature_counts = [], []
+    for train_rows, test_rows in _corpus['folds']:
+        X_train, X_test, keep = tfidf_features(counts[train_rows], counts[test_rows], max_features)
+        feature_counts.append(len(keep))
+        # What the bundle stores: training matrix and one IDF weight per term
+        sizes.append(X_train.data.nbytes + X_train.indices.nbytes + X_train.indptr.nbytes + 4 * len(keep))
+        for k in neighbour_options:
+            engine = KNNScoringEngine(X_train, labels[train_rows], classes, n_neighbors=k)
+            correct[k] += int((engine.predict(X_test) == labels[test_rows]).sum())
+            # Serving scores one resume per request
+            for row in range(min(X_test.shape[0], 50)):
+                start = time.perf_counter()
+                engine.predict(X_test[row])
+                latencies[k].append(time.perf_counter() - start)
+
+    return [{
+        'max_features': max_features,
+        'ngram_range': list(ngram_range),
+        'n_neighbors': k,
+        'accuracy': correct[k] / len(labels),
+        'features': int(np.mean(feature_counts)),
+        'latency_ms': float(np.median(latencies[k]) * 1000),
+        'model_bytes': int(np.mean(sizes)),
+    } for k in neighbour_options]
+
+def load_corpus(dataset_path):
+    dataset = load_dataset(dataset_path)
+    return dataset.categories, dataset.cleaned()
+
+def main():
+    parser = argparse.ArgumentParser(description="Search TF-IDF and KNN settings with cross-validation")
+    parser.add_argument('--dataset', default=DATASET_PATH, help="CSV with Category and Resume columns")
+    parser.add_argument('--max-features', type=int, nargs='+', default=[500, 1000, 1500, 2000, 3000, 0],
+                        help="Vocabulary limits to try, 0 for no limit")
+    parser.add_argument('--ngram-max', type=int, nargs='+', default=[1, 2], help="Longest n-grams to try")
+    parser.add_argument('--neighbors', type=int, nargs='+', default=[3, 5, 7, 9], help="n_neighbors values to try")
+    parser.add_argument('--folds', type=int, default=3, help="Stratified cross-validation folds")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Pool processes")
+    parser.add_argument('--output', help="Save all results as JSON")
+    args = parser.parse_args()
+
+    print("🔎 HYPERPARAMETER SEARCH")
+    print("="*50)
+    start = time.perf_counter()
+    categories, texts = load_corpus(args.dataset)
+    clean_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ids, offsets, terms = tokenise_corpus(texts)
+    tokenise_time = time.perf_counter() - start
+    print(f"   {len(texts)} resumes loaded and cleaned in {clean_time:.2f}s and tokenised once in {tokenise_time:.2f}s "
+          f"({len(ids)} tokens, {len(terms)} distinct terms)")
+
+    labels = LabelEncoder().fit_transform(categories)
+    folds = list(StratifiedKFold(n_splits=args.folds, shuffle=True, random_state=42).split(texts, labels))
+
+    feature_configs = list(itertools.product(args.max_features, [(1, n) for n in args.ngram_max]))
+    print(f"   {len(feature_configs) * len(args.neighbors)} configurations, {args.folds}-fold CV, "
+          f"{args.workers} workers")
+
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(args.workers, initializer=_init_worker,
+                             initargs=(ids, offsets, len(terms), labels, folds)) as pool:
+        futures = [pool.submit(evaluate_feature_config, max_features or None, ngram_range, args.neighbors)
+                   for max_features, ngram_range in feature_configs]
+        for future in as_completed(futures):
+            results.extend(future.result())
+    search_time = time.perf_counter() - start
+
+    # Best accuracy first; ties go to the faster, smaller model
+    results.sort(key=lambda r: (-r['accuracy'], r['latency_ms'], r['model_bytes']))
+    print(f"\n{'max_features':>12} {'ngrams':>7} {'k':>3} {'accuracy':>9} {'features':>9} "
+          f"{'latency':>9} {'size':>9}")
+    for result in results:
+        key = (result['max_features'], tuple(result['ngram_range']), result['n_neighbors'])
+        marker = f"  ← {CURRENT_SETTINGS[key]}" if key in CURRENT_SETTINGS else ''
+        print(f"{result['max_features'] or 'all':>12} {'(%d,%d)' % tuple(result['ngram_range']):>7} "
+              f"{result['n_neighbors']:>3} {result['accuracy']:>8.1%} {result['features']:>9} "
+              f"{result['latency_ms']:>7.2f}ms {result['model_bytes'] / 1024:>7.0f}KB{marker}")
+
+    best = results[0]
+    print(f"\n🏆 Best: max_features={best['max_features']}, ngram_range={tuple(best['ngram_range'])}, "
+          f"n_neighbors={best['n_neighbors']} ({best['accuracy']:.1%})")
+    print(f"⏱️  Search took {search_time:.1f}s")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'folds': args.folds, 'documents': len(texts), 'results': results}, f, indent=2)
+        print(f"💾 Results saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
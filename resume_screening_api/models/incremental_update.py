@@ -0,0 +1,208 @@
+"""
+Incremental model update: add labelled resumes without a full retrain
+
+Appends the new resumes to the KNN training matrix of the published model.
+Existing rows are never cleaned or vectorized again:
+
+- Document frequencies are recovered from the IDF weights and the document
+  count in the model manifest, the new resumes' terms are added, and the
+  existing rows are rescaled column by column to the new IDF and
+  renormalised, which gives the same vectors as weighting them from scratch.
+- New categories are added to the label encoder and existing labels are
+  remapped to the new, still sorted, class order.
+- The ANN index, if there is one, keeps its centroids and gains the new rows.
+
+The vocabulary stays as trained: terms it does not know are ignored until the
+next full retrain. The result is published like a training job's, as a new
+model version that running workers reload.
+
+Run from the resume_screening_api directory:
+    python models/incremental_update.py new_resumes.csv [--append-dataset]
+"""
+import argparse
+import csv
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+from sklearn.multiclass import OneVsRestClassifier
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.preprocessing import LabelEncoder, normalize
+
+# Allow running as `python models/incremental_update.py` from the API directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.train_model import save_model
+from preprocessing.text_cleaner import clean_resume
+from utils.ann_index import IVFIndex
+from utils.dataset import DATASET_PATH
+from utils.knn_engine import KNNScoringEngine
+from utils.model_manifest import load_manifest
+from utils.model_utils import load_model
+from utils.training_jobs import MODELS_DIR, exclusive_job, publish_artifacts
+
+def recover_document_frequencies(idf, documents):
+    """Invert the smoothed IDF, idf = ln((1 + n) / (1 + df)) + 1"""
+    return np.rint((1 + documents) * np.exp(1 - np.asarray(idf, dtype=np.float64)) - 1)
+
+def extend_label_encoder(label_encoder, categories):
+    """
+    Add new categories to a label encoder
+
+    LabelEncoder keeps its classes sorted, so a new category can shift the
+    codes of existing ones.
+
+    Returns:
+        tuple: (new LabelEncoder, array mapping every old code to its new code)
+    """
+    extended = LabelEncoder()
+    extended.classes_ = np.array(sorted(set(label_encoder.classes_) | set(categories)))
+    remap = np.searchsorted(extended.classes_, label_encoder.classes_)
+    return extended, remap
+
+def update_model(resumes, categories, models_dir=MODELS_DIR):
+    """
+    Add labelled resumes to the published model and publish the result
+
+    The jobs lock is held from loading the model until the result is
+    published, so neither a training job nor another update can publish in
+    between and have its model overwritten.
+
+    Args:
+        resumes (list): Raw resume texts to add
+        categories (list): Category of every added resume
+        models_dir (str): Directory the model is served from
+
+    Returns:
+        dict: Manifest of the published model
+
+    Raises:
+        RuntimeError: If a training job or another update is running
+        ValueError: If the published model cannot be updated in place
+    """
+    with exclusive_job('update') as job:
+        manifest = _update_published_model(resumes, categories, models_dir)
+        job['metrics'] = {'model_version': manifest.get('model_version'), 'added': len(resumes)}
+        job['timings'] = manifest['timings']
+        return manifest
+
+def _update_published_model(resumes, categories, models_dir):
+    timings = {}
+    start = time.perf_counter()
+    engine, vectorizer, label_encoder = load_model(models_dir)
+    manifest = load_manifest(os.path.join(models_dir, 'model_manifest.json'))
+    if not isinstance(engine, KNNScoringEngine):
+        raise ValueError("Only KNN models can be updated incrementally; retrain instead")
+    if manifest is None or not hasattr(vectorizer, 'idf_'):
+        raise ValueError("The model has no manifest or IDF weights to update; retrain it once first")
+    timings['load'] = time.perf_counter() - start
+
+    # Only the new resumes are cleaned and vectorized
+    start = time.perf_counter()
+    cleaned = [clean_resume(resume) for resume in resumes]
+    # Only which terms occur matters here; the weights change below
+    new_terms = vectorizer.transform(cleaned)
+    timings['vectorize_new'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    documents = manifest['document_count']
+    old_idf = np.asarray(vectorizer.idf_, dtype=np.float64)
+    df = recover_document_frequencies(old_idf, documents)
+    df += np.bincount(new_terms.indices, minlength=len(df))
+    new_idf = np.log((1 + documents + len(resumes)) / (1 + df)) + 1
+    vectorizer.idf_ = new_idf
+
+    # Rows are L2-normalised, so rescaling columns and renormalising gives
+    # the rows a fresh weighting with the new IDF would
+    scale = sparse.diags((new_idf / old_idf).astype(np.float32))
+    existing = normalize(sparse.csr_matrix(engine.train_matrix, dtype=np.float32) @ scale)
+    added = normalize(sparse.csr_matrix(vectorizer.transform(cleaned), dtype=np.float32))
+    train_matrix = sparse.vstack([existing, added]).tocsr()
+    timings['reweight'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    label_encoder, remap = extend_label_encoder(label_encoder, categories)
+    train_labels = np.concatenate([remap[engine.train_labels],
+                                   label_encoder.transform(categories)])
+    # Added resumes are numbered after the dataset rows, as if appended to it
+    first_id = documents
+    train_ids = np.concatenate([engine.train_ids, np.arange(first_id, first_id + len(resumes))])
+
+    model = OneVsRestClassifier(KNeighborsClassifier(n_neighbors=engine.n_neighbors))
+    model.fit(train_matrix, train_labels)
+    model.train_ids_ = train_ids
+    timings['refit'] = time.perf_counter() - start
+
+    index = None
+    index_path = os.path.join(models_dir, 'ann_index.pkl')
+    if os.path.exists(index_path):
+        start = time.perf_counter()
+        index = IVFIndex.load(index_path).extended(added, engine.train_matrix.shape[0])
+        timings['index'] = time.perf_counter() - start
+
+    new_counts_by_class = Counter(categories)
+    class_counts = {c: manifest['class_counts'].get(c, 0) + new_counts_by_class[c] for c in label_encoder.classes_}
+    manifest.update({
+        'base_model_version': manifest.get('model_version'),
+        'trained_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'document_count': documents + len(resumes),
+        'train_size': train_matrix.shape[0],
+        'classes': [str(c) for c in label_encoder.classes_],
+        'class_counts': class_counts,
+        'incremental_updates': manifest.get('incremental_updates', 0) + 1,
+    })
+
+    start = time.perf_counter()
+    staging_dir = tempfile.mkdtemp(prefix='update-', dir=models_dir)
+    try:
+        save_model(model, vectorizer, label_encoder, index, staging_dir, manifest)
+        publish_artifacts(staging_dir, models_dir)
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+    timings['publish'] = time.perf_counter() - start
+
+    manifest['timings'] = {stage: round(seconds, 3) for stage, seconds in timings.items()}
+    return manifest
+
+def read_labelled_resumes(path):
+    with open(path, 'r', encoding='utf-8', newline='') as file:
+        rows = [(row['Category'], row['Resume']) for row in csv.DictReader(file)]
+    return [resume for _, resume in rows], [category for category, _ in rows]
+
+def main():
+    parser = argparse.ArgumentParser(description="Add labelled resumes to the published model")
+    parser.add_argument('new_resumes', help="CSV with Category and Resume columns")
+    parser.add_argument('--append-dataset', action='store_true',
+                        help="Also append the rows to the dataset, so the next full retrain keeps them")
+    parser.add_argument('--dataset', default=DATASET_PATH, help="Dataset CSV to append to")
+    args = parser.parse_args()
+
+    print("➕ INCREMENTAL MODEL UPDATE")
+    print("="*50)
+    resumes, categories = read_labelled_resumes(args.new_resumes)
+    if not resumes:
+        print(f"❌ No resumes in {args.new_resumes}")
+        return
+
+    previous = load_manifest()
+    manifest = update_model(resumes, categories)
+    new_classes = sorted(set(manifest['classes']) - set(previous['classes']))
+    print(f"✅ Added {len(resumes)} resumes; model {manifest['base_model_version']} → {manifest['model_version']}")
+    if new_classes:
+        print(f"   New categories: {', '.join(new_classes)}")
+    print(f"   Training rows: {manifest['train_size']}, categories: {len(manifest['classes'])}")
+    print(f"   Timings: " + ', '.join(f"{stage} {seconds:.2f}s" for stage, seconds in manifest['timings'].items()))
+
+    if args.append_dataset:
+        with open(args.dataset, 'a', encoding='utf-8', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerows(zip(categories, resumes))
+        print(f"   Appended to {args.dataset}")
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
+import argparse
+import hashlib
 import numpy as np
 import pickle
-import re
-import csv
 from sklearn.model_selection import train_test_split
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.multiclass import OneVsRestClassifier
@@ -10,70 +10,138 @@ from sklearn.preprocessing import LabelEncoder
 from sklearn.metrics import accuracy_score, classification_report
 import sys
 import os
+import time
 
-def clean_resume(resume_text):
-    """Clean resume text by removing URLs, mentions, hashtags, punctuation, and extra whitespace."""
-    resume_text = re.sub(r'http\S+\s*', ' ', resume_text)
-    resume_text = re.sub('RT|cc', ' ', resume_text)
-    resume_text = re.sub(r'#\S+', '', resume_text)
-    resume_text = re.sub(r'@\S+', '  ', resume_text)
-    # Remove punctuation
-    punctuation = '!"#$%&\'()*+,-./:;<=>?@[\\]^_`{|}~'
-    for p in punctuation:
-        resume_text = resume_text.replace(p, ' ')
-    resume_text = re.sub(r'[^\x00-\x7f]', r' ', resume_text) 
-    resume_text = re.sub(r'\s+', ' ', resume_text)
-    return resume_text.strip()
+# Allow running as `python models/train_model.py` from the API directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-def save_model(model, vectorizer, label_encoder):
-    """Save the trained model, vectorizer, and label encoder"""
-    os.makedirs('models', exist_ok=True)
+from utils.knn_engine import KNNScoringEngine
+from utils.ann_index import IVFIndex, recall_at_k
+from utils.dataset import DATASET_PATH, load_dataset
+from utils.model_bundle import DEFAULT_BUNDLE_PATH, write_bundle
+from utils.model_manifest import MANIFEST_PATH, build_manifest, write_manifest
+
+def save_model(model, vectorizer, label_encoder, index=None, output_dir='models', manifest=None):
+    """Save the trained model, vectorizer, label encoder, ANN index, manifest and model bundle (KNN models only)"""
+    os.makedirs(output_dir, exist_ok=True)
     
-    with open('models/resume_classifier.pkl', 'wb') as f:
+    with open(os.path.join(output_dir, 'resume_classifier.pkl'), 'wb') as f:
         pickle.dump(model, f)
     
-    with open('models/tfidf_vectorizer.pkl', 'wb') as f:
+    with open(os.path.join(output_dir, 'tfidf_vectorizer.pkl'), 'wb') as f:
         pickle.dump(vectorizer, f)
         
-    with open('models/label_encoder.pkl', 'wb') as f:
+    with open(os.path.join(output_dir, 'label_encoder.pkl'), 'wb') as f:
         pickle.dump(label_encoder, f)
     
-    print("Model saved successfully!")
+    if index is not None:
+        index.save(os.path.join(output_dir, 'ann_index.pkl'))
+    
+    bundle_path = os.path.join(output_dir, os.path.basename(DEFAULT_BUNDLE_PATH))
+    if isinstance(model, OneVsRestClassifier) and isinstance(model.estimator, KNeighborsClassifier):
+        # Written last so it is never older than the pickles it supersedes
+        version = write_bundle(bundle_path, KNNScoringEngine.from_model(model),
+                               vectorizer, label_encoder, index=index)
+    else:
+        # The bundle and ANN index only hold KNN models; drop any left over
+        # from an earlier model so the pickles are served
+        for path in (bundle_path, os.path.join(output_dir, 'ann_index.pkl')):
+            if os.path.exists(path):
+                os.remove(path)
+        with open(os.path.join(output_dir, 'resume_classifier.pkl'), 'rb') as f:
+            version = hashlib.sha256(f.read()).hexdigest()[:16]
+    
+    if manifest is not None:
+        manifest['model_version'] = version
+        write_manifest(os.path.join(output_dir, os.path.basename(MANIFEST_PATH)), manifest)
+    
+    print(f"Model saved successfully! (version {version})")
 
-def train_and_save_model():
+def build_ann_index(model, X_test, target_recall=0.95):
+    """
+    Build the approximate nearest-neighbour index and report recall@k
+
+    Every n_probe setting is compared against exact search over the test
+    queries; the smallest one reaching target_recall becomes the default.
+
+    Args:
+        model: Trained OneVsRest KNN classifier
+        X_test: TF-IDF matrix of the held-out resumes
+        target_recall (float): Recall@k the default n_probe must reach
+
+    Returns:
+        IVFIndex: Built index
+    """
+    engine = KNNScoringEngine.from_model(model)
+    index = IVFIndex.build(engine.train_matrix)
+
+    start = time.perf_counter()
+    exact_indices, _ = engine.kneighbors(X_test)
+    exact_time = time.perf_counter() - start
+
+    print(f"ANN index: {index.n_lists} lists over {engine.train_matrix.shape[0]} resumes")
+    print(f"   exact search: {exact_time*1000:.1f} ms for {X_test.shape[0]} queries")
+
+    engine.index = index
+    chosen = index.n_lists
+    for n_probe in sorted(set([1, 2, 4, 8, 16, 32, index.n_lists])):
+        if n_probe > index.n_lists:
+            continue
+        index.n_probe = n_probe
+        start = time.perf_counter()
+        approx_indices, _ = engine.kneighbors(X_test)
+        elapsed = time.perf_counter() - start
+        recall = recall_at_k(exact_indices, approx_indices)
+        print(f"   n_probe={n_probe:<3} recall@{engine.n_neighbors}={recall:.3f}  {elapsed*1000:.1f} ms")
+        if recall >= target_recall and n_probe < chosen:
+            chosen = n_probe
+
+    index.n_probe = chosen
+    print(f"   default n_probe={chosen} (target recall {target_recall:.0%})")
+    return index
+
+def train_and_save_model(build_index=True, output_dir='models', progress=None, dataset_path=DATASET_PATH):
     """
     Train the resume classification model and save it
     
+    Args:
+        build_index (bool): Also build the approximate nearest-neighbour index
+        output_dir (str): Directory the artifacts are written to
+        progress (callable): Optional callback, called with the name of each
+            stage as it starts
+        dataset_path (str): CSV with Category and Resume columns
+    
     Returns:
         float: Model accuracy on test set
+
+    Raises:
+        FileNotFoundError: If there is no dataset at dataset_path
     """
+    def report(stage):
+        if progress:
+            progress(stage)
+    
+    report('loading')
     print("Loading dataset...")
-    # Load the dataset - looking in parent directory
-    dataset_path = os.path.join('..', 'resume_dataset.csv')
+    # Load the dataset - the parent directory's unless DATASET_PATH is set
     if not os.path.exists(dataset_path):
-        print(f"Dataset not found at {dataset_path}")
-        return 0.0
+        raise FileNotFoundError(f"Dataset not found at {dataset_path}")
         
-    # Read CSV without pandas
-    resumes = []
-    categories = []
-    
-    with open(dataset_path, 'r', encoding='utf-8') as file:
-        csv_reader = csv.DictReader(file)
-        for row in csv_reader:
-            if 'Resume' in row and 'Category' in row:
-                resumes.append(row['Resume'])
-                categories.append(row['Category'])
+    # Parsed columns, cleaned text and TF-IDF matrix come from the dataset
+    # cache whenever the CSV and cleaner are unchanged
+    dataset = load_dataset(dataset_path)
+    resumes = dataset.resumes
+    categories = dataset.categories
     
     print(f"Loaded {len(resumes)} resume records")
     
+    report('cleaning')
     print("Cleaning resume texts...")
-    # Clean resume texts
-    cleaned_resumes = [clean_resume(resume) for resume in resumes]
+    # Cleaned once per dataset and cleaner version, then read from the cache
+    dataset.cleaned()
     
     print("Preparing features and labels...")
     # Prepare features and labels
-    X = cleaned_resumes
     y = categories
     
     # Encode labels
@@ -82,6 +150,7 @@ def train_and_save_model():
     
     print(f"Found {len(label_encoder.classes_)} categories: {label_encoder.classes_}")
     
+    report('vectorizing')
     print("Creating TF-IDF features...")
     # Create TF-IDF vectorizer
     vectorizer = TfidfVectorizer(
@@ -91,12 +160,12 @@ def train_and_save_model():
     )
     
     # Fit and transform text to TF-IDF features
-    X_tfidf = vectorizer.fit_transform(X)
+    vectorizer, X_tfidf = dataset.fit_tfidf(vectorizer)
     
     print("Splitting data...")
     # Split data
-    X_train, X_test, y_train, y_test = train_test_split(
-        X_tfidf, y_encoded, 
+    X_train, X_test, y_train, y_test, ids_train, ids_test = train_test_split(
+        X_tfidf, y_encoded, np.arange(len(y_encoded)),
         test_size=0.2, 
         random_state=42,
         stratify=y_encoded
@@ -105,11 +174,15 @@ def train_and_save_model():
     print(f"Training set: {X_train.shape[0]} samples")
     print(f"Test set: {X_test.shape[0]} samples")
     
+    report('training')
     print("Training model...")
     # Train model
     model = OneVsRestClassifier(KNeighborsClassifier(n_neighbors=5))
     model.fit(X_train, y_train)
+    # Dataset row of every training resume, reported as neighbour evidence
+    model.train_ids_ = ids_train
     
+    report('evaluating')
     print("Evaluating model...")
     # Make predictions
     y_pred = model.predict(X_test)
@@ -121,11 +194,24 @@ def train_and_save_model():
     print("\nClassification Report:")
     print(classification_report(y_test, y_pred, target_names=label_encoder.classes_))
     
+    index = None
+    if build_index:
+        report('indexing')
+        print("Building ANN index...")
+        target_recall = float(os.getenv('ANN_TARGET_RECALL', '0.95'))
+        index = build_ann_index(model, X_test, target_recall)
+    
+    report('saving')
     print("Saving model...")
-    # Save model, vectorizer, and label encoder
-    save_model(model, vectorizer, label_encoder)
+    manifest = build_manifest(label_encoder, categories, resumes, vectorizer, accuracy,
+                              train_size=X_train.shape[0], test_size=X_test.shape[0])
+    # Save model, vectorizer, label encoder, ANN index, manifest and model bundle
+    save_model(model, vectorizer, label_encoder, index, output_dir, manifest)
     
     return accuracy
 
 if __name__ == "__main__":
-    train_and_save_model()
+    parser = argparse.ArgumentParser(description="Train and save the resume classifier")
+    parser.add_argument('--dataset', default=DATASET_PATH, help="CSV with Category and Resume columns")
+    args = parser.parse_args()
+    train_and_save_model(dataset_path=args.dataset)
@@ -0,0 +1,213 @@
+"""
+Out-of-core training for datasets that do not fit in memory
+
+Reads the CSV in chunks and never holds more than a chunk (plus a bounded
+shuffle buffer) of resumes at once:
+
+1. IDF pass: every chunk is cleaned and hashed with a stateless
+   HashingVectorizer, and document frequencies, label counts and length
+   statistics are accumulated.
+2. Training passes: chunks are hashed again, weighted with the IDF from
+   pass 1 and fed to SGDClassifier.partial_fit.
+3. Evaluation pass over the held-out rows (every --test-every'th row).
+
+The vectorizer is saved as a Pipeline of the hashing vectorizer and the
+fitted TfidfTransformer, so app.py serves the result like any other model.
+
+Run from the resume_screening_api directory:
+    python models/train_streaming.py [--dataset ../resume_dataset.csv] [--chunk-size 1000]
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.linear_model import SGDClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import LabelEncoder
+
+# Allow running as `python models/train_streaming.py` from the API directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.train_model import save_model
+from preprocessing.text_cleaner import clean_resume
+from utils.dataset import DATASET_PATH
+from utils.model_manifest import build_manifest
+
+def iter_chunks(dataset_path, chunk_size):
+    """
+    Read the dataset chunk by chunk
+
+    Yields:
+        list: Up to chunk_size (row number, category, resume text) tuples
+    """
+    chunk = []
+    with open(dataset_path, 'r', encoding='utf-8', newline='') as file:
+        for row_number, row in enumerate(csv.DictReader(file)):
+            chunk.append((row_number, row['Category'], row['Resume']))
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+def shuffled(chunks, buffer_size, rng):
+    """
+    Shuffle rows through a bounded buffer
+
+    Datasets are often sorted by category, and SGD fed one category at a
+    time forgets the others, so rows are mixed across chunk boundaries.
+
+    Yields:
+        list: Chunks of shuffled rows
+    """
+    buffer = []
+    chunk_size = 0
+    for chunk in chunks:
+        chunk_size = max(chunk_size, len(chunk))
+        buffer.extend(chunk)
+        if len(buffer) >= buffer_size:
+            rng.shuffle(buffer)
+            yield buffer[:chunk_size]
+            buffer = buffer[chunk_size:]
+    rng.shuffle(buffer)
+    for start in range(0, len(buffer), chunk_size or 1):
+        yield buffer[start:start + chunk_size]
+
+def make_hashing_vectorizer(n_features):
+    # Raw counts; IDF weighting and normalisation happen in the transformer
+    return HashingVectorizer(n_features=n_features, stop_words='english',
+                             alternate_sign=False, norm=None)
+
+def idf_pass(dataset_path, chunk_size, hasher, test_every):
+    """
+    Count document frequencies and describe the dataset in one pass
+
+    Returns:
+        tuple: (document frequencies, documents, label counts,
+        resume length statistics, train size, test size)
+    """
+    df = np.zeros(hasher.n_features, dtype=np.int64)
+    documents = 0
+    labels = Counter()
+    length_sum, length_min, length_max = 0, None, 0
+    test_size = 0
+    for chunk in iter_chunks(dataset_path, chunk_size):
+        texts = [clean_resume(text) for _, _, text in chunk]
+        counts = hasher.transform(texts)
+        df += np.bincount(counts.indices, minlength=hasher.n_features)
+        documents += len(chunk)
+        for row_number, category, text in chunk:
+            labels[category] += 1
+            length_sum += len(text)
+            length_min = len(text) if length_min is None else min(length_min, len(text))
+            length_max = max(length_max, len(text))
+            test_size += row_number % test_every == 0
+    resume_length = {
+        'mean': round(length_sum / documents, 1) if documents else 0,
+        'min': length_min or 0,
+        'max': length_max,
+    }
+    return df, documents, labels, resume_length, documents - test_size, test_size
+
+def train_streaming_model(dataset_path=DATASET_PATH, output_dir='models', chunk_size=1000,
+                          n_features=2 ** 17, epochs=5, test_every=5, shuffle_buffer=5000,
+                          progress=None):
+    """
+    Train a hashing + SGD model without loading the dataset into memory
+
+    Args:
+        dataset_path (str): CSV with Category and Resume columns
+        output_dir (str): Directory the artifacts are written to
+        chunk_size (int): Rows read, cleaned and vectorized at a time
+        n_features (int): Hashed feature space size
+        epochs (int): Training passes over the dataset
+        test_every (int): Every test_every'th row is held out for evaluation
+        shuffle_buffer (int): Rows mixed together before training
+        progress (callable): Optional callback, called with the name of each
+            stage as it starts
+
+    Returns:
+        float: Model accuracy on the held-out rows
+
+    Raises:
+        FileNotFoundError: If there is no dataset at dataset_path
+    """
+    def report(stage):
+        if progress:
+            progress(stage)
+
+    if not os.path.exists(dataset_path):
+        raise FileNotFoundError(f"Dataset not found at {dataset_path}")
+
+    report('vectorizing')
+    print(f"IDF pass over {dataset_path} in chunks of {chunk_size}...")
+    start = time.perf_counter()
+    hasher = make_hashing_vectorizer(n_features)
+    df, documents, labels, resume_length, train_size, test_size = idf_pass(
+        dataset_path, chunk_size, hasher, test_every)
+    print(f"   {documents} resumes, {len(labels)} categories, "
+          f"{np.count_nonzero(df)} distinct hashed terms ({time.perf_counter() - start:.1f}s)")
+
+    # Same smoothed IDF as TfidfVectorizer
+    tfidf = TfidfTransformer(sublinear_tf=True)
+    tfidf.idf_ = np.log((1 + documents) / (1 + df)) + 1
+    vectorizer = Pipeline([('hashing', hasher), ('tfidf', tfidf)])
+
+    label_encoder = LabelEncoder().fit(sorted(labels))
+    classes = np.arange(len(label_encoder.classes_))
+    model = SGDClassifier(loss='log_loss', alpha=1e-5, random_state=42)
+
+    report('training')
+    rng = random.Random(42)
+    for epoch in range(epochs):
+        start = time.perf_counter()
+        for chunk in shuffled(iter_chunks(dataset_path, chunk_size), shuffle_buffer, rng):
+            train_rows = [(category, text) for row_number, category, text in chunk
+                          if row_number % test_every]
+            if not train_rows:
+                continue
+            X = vectorizer.transform([clean_resume(text) for _, text in train_rows])
+            y = label_encoder.transform([category for category, _ in train_rows])
+            model.partial_fit(X, y, classes=classes)
+        print(f"   epoch {epoch + 1}/{epochs}: {time.perf_counter() - start:.1f}s")
+
+    report('evaluating')
+    correct = 0
+    for chunk in iter_chunks(dataset_path, chunk_size):
+        test_rows = [(category, text) for row_number, category, text in chunk
+                     if row_number % test_every == 0]
+        if test_rows:
+            X = vectorizer.transform([clean_resume(text) for _, text in test_rows])
+            y = label_encoder.transform([category for category, _ in test_rows])
+            correct += int((model.predict(X) == y).sum())
+    accuracy = correct / test_size if test_size else 0.0
+    print(f"Model Accuracy: {accuracy:.4f} ({test_size} held-out resumes)")
+
+    report('saving')
+    manifest = build_manifest(label_encoder, None, None, vectorizer, accuracy,
+                              train_size=train_size, test_size=test_size,
+                              class_counts=labels, resume_length=resume_length)
+    save_model(model, vectorizer, label_encoder, output_dir=output_dir, manifest=manifest)
+    return accuracy
+
+def main():
+    parser = argparse.ArgumentParser(description="Train a servable model in bounded memory")
+    parser.add_argument('--dataset', default=DATASET_PATH, help="CSV with Category and Resume columns")
+    parser.add_argument('--output-dir', default='models', help="Where the artifacts are written")
+    parser.add_argument('--chunk-size', type=int, default=1000, help="Rows processed at a time")
+    parser.add_argument('--n-features', type=int, default=2 ** 17, help="Hashed feature space size")
+    parser.add_argument('--epochs', type=int, default=5, help="Training passes over the dataset")
+    parser.add_argument('--shuffle-buffer', type=int, default=5000, help="Rows mixed together before training")
+    args = parser.parse_args()
+
+    train_streaming_model(args.dataset, args.output_dir, args.chunk_size, args.n_features,
+                          args.epochs, shuffle_buffer=args.shuffle_buffer)
+
+if __name__ == "__main__":
+    main()
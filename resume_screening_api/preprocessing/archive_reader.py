@@ -0,0 +1,75 @@
+import os
+import zipfile
+
+class ArchiveLimitError(Exception):
+    """Raised when an archive has too many entries or inflates past its budget"""
+
+def _is_resume_candidate(info):
+    # Skip directories and the metadata folders and dotfiles archivers add
+    name = info.filename
+    basename = os.path.basename(name)
+    return not (info.is_dir() or name.startswith('__MACOSX/') or basename.startswith('.'))
+
+def open_zip(stream, max_entries, max_total_size):
+    """
+    Open a ZIP archive and check its limits before anything is decompressed
+
+    Args:
+        stream: Seekable binary stream of the archive
+        max_entries (int): Maximum number of file entries
+        max_total_size (int): Maximum total decompressed size in bytes, as
+            declared by the archive's central directory
+
+    Returns:
+        tuple: (zipfile.ZipFile, list of the ZipInfo of every file entry)
+
+    Raises:
+        zipfile.BadZipFile: If the stream is not a ZIP archive
+        ArchiveLimitError: If a limit is exceeded
+    """
+    archive = zipfile.ZipFile(stream)
+    entries = [info for info in archive.infolist() if _is_resume_candidate(info)]
+
+    if len(entries) > max_entries:
+        archive.close()
+        raise ArchiveLimitError(f"Archive has {len(entries)} files (maximum {max_entries})")
+
+    declared_size = sum(info.file_size for info in entries)
+    if declared_size > max_total_size:
+        archive.close()
+        raise ArchiveLimitError(f"Archive inflates to {declared_size} bytes (maximum {max_total_size})")
+
+    return archive, entries
+
+def iter_zip_entries(archive, entries, max_total_size):
+    """
+    Decompress entries one at a time, in memory
+
+    Declared sizes can lie, so the decompressed bytes are counted while
+    reading and reading stops as soon as the budget is exceeded.
+
+    Args:
+        archive (zipfile.ZipFile): Opened archive
+        entries (list): ZipInfo of the entries to read
+        max_total_size (int): Decompressed bytes allowed across all entries
+
+    Yields:
+        tuple: (ZipInfo, bytes or the Exception raised while reading it)
+
+    Raises:
+        ArchiveLimitError: Once the decompressed total exceeds max_total_size
+    """
+    remaining = max_total_size
+    for info in entries:
+        try:
+            with archive.open(info) as entry:
+                data = entry.read(remaining + 1)
+        except (zipfile.BadZipFile, RuntimeError, NotImplementedError, OSError) as e:
+            # Corrupt or encrypted entries fail alone
+            yield info, e
+            continue
+
+        if len(data) > remaining:
+            raise ArchiveLimitError(f"Archive inflates past {max_total_size} bytes")
+        remaining -= len(data)
+        yield info, data
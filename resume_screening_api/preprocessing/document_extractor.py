@@ -0,0 +1,261 @@
+import importlib
+import importlib.util
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.metrics import timed_extraction
+
+logger = logging.getLogger(__name__)
+
+# Document libraries by the name they are reported under. Each is imported on
+# first use of a file type that needs it, never at startup, and nothing is
+# ever installed or downloaded at runtime.
+DOCUMENT_LIBRARIES = {
+    'PyPDF2': 'PyPDF2',
+    'pdfplumber': 'pdfplumber',
+    'python-docx': 'docx',
+}
+
+_loaded_libraries = {}
+_import_lock = threading.Lock()
+
+# PDF page budget and page-parallel extraction. Pages past PDF_MAX_PAGES are
+# skipped; documents with at least PDF_PARALLEL_MIN_PAGES pages are split
+# across PDF_WORKERS processes.
+PDF_MAX_PAGES = int(os.getenv('PDF_MAX_PAGES', '20'))
+PDF_WORKERS = int(os.getenv('PDF_WORKERS', str(min(4, os.cpu_count() or 1))))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv('PDF_PARALLEL_MIN_PAGES', '4'))
+
+_pdf_pools = {}
+_pdf_pool_lock = threading.Lock()
+
+def _load_library(name):
+    """
+    Import a document library on first use
+
+    Args:
+        name (str): Library name as listed in DOCUMENT_LIBRARIES
+
+    Returns:
+        module: The imported module, or None if it is not installed
+    """
+    if name not in _loaded_libraries:
+        with _import_lock:
+            if name not in _loaded_libraries:
+                try:
+                    _loaded_libraries[name] = importlib.import_module(DOCUMENT_LIBRARIES[name])
+                except ImportError as e:
+                    logger.warning("document library unavailable library=%s error=%s", name, e)
+                    _loaded_libraries[name] = None
+    return _loaded_libraries[name]
+
+def library_status():
+    """
+    Report which document libraries are installed and which are loaded
+
+    Installation is checked without importing anything.
+
+    Returns:
+        dict: {library_name: {'installed': bool, 'loaded': bool}}
+    """
+    return {
+        name: {
+            'installed': importlib.util.find_spec(module) is not None,
+            'loaded': _loaded_libraries.get(name) is not None,
+        }
+        for name, module in DOCUMENT_LIBRARIES.items()
+    }
+
+def _open_source(source):
+    """
+    Return a seekable binary stream for a path, bytes or an open stream
+
+    Args:
+        source: File path, bytes, or a binary file-like object (for example
+            an upload stream)
+
+    Returns:
+        tuple: (stream, owned) where owned streams must be closed by the caller
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source), True
+    if isinstance(source, (str, os.PathLike)):
+        return open(source, 'rb'), True
+    source.seek(0)
+    return source, False
+
+def _read_pdf_pages(library, data, start, stop):
+    """
+    Extract the text of pages [start, stop) of a PDF
+
+    Runs in a pool process, so it parses its own copy of the document.
+
+    Returns:
+        list: Text of every page, '' for pages without text
+    """
+    if library == 'PyPDF2':
+        pages = _load_library('PyPDF2').PdfReader(io.BytesIO(data)).pages
+        return [pages[i].extract_text() or '' for i in range(start, stop)]
+
+    with _load_library('pdfplumber').open(io.BytesIO(data)) as pdf:
+        return [pdf.pages[i].extract_text() or '' for i in range(start, stop)]
+
+def _get_pdf_pool(workers):
+    # One long-lived pool per size, started on the first large PDF
+    with _pdf_pool_lock:
+        if workers not in _pdf_pools:
+            _pdf_pools[workers] = ProcessPoolExecutor(max_workers=workers)
+        return _pdf_pools[workers]
+
+def _extract_pdf_pages(library, pages, stream, max_pages, workers):
+    """
+    Extract at most max_pages pages, splitting them across the worker pool
+
+    Documents shorter than PDF_PARALLEL_MIN_PAGES, or a pool of one, are read
+    from the already opened pages in this process, where starting pool work
+    would cost more than it saves.
+    """
+    page_count = min(len(pages), max_pages) if max_pages else len(pages)
+    workers = min(workers, page_count)
+
+    if workers <= 1 or page_count < PDF_PARALLEL_MIN_PAGES:
+        page_texts = [pages[i].extract_text() or '' for i in range(page_count)]
+    else:
+        stream.seek(0)
+        data = stream.read()
+        # One contiguous range per worker, so each parses the document once
+        bounds = [page_count * i // workers for i in range(workers + 1)]
+        pool = _get_pdf_pool(workers)
+        futures = [pool.submit(_read_pdf_pages, library, data, start, stop)
+                   for start, stop in zip(bounds, bounds[1:])]
+        page_texts = [text for future in futures for text in future.result()]
+
+    return ''.join(text + "\n" for text in page_texts if text.strip())
+
+def extract_pdf_text(stream, max_pages=None, workers=None):
+    """
+    Extract the text of a PDF, pages in parallel
+
+    PyPDF2 is tried first and pdfplumber is the fallback. Pages beyond
+    max_pages are ignored so one long portfolio cannot monopolise a worker.
+
+    Args:
+        stream: Seekable binary stream of the PDF
+        max_pages (int): Page budget (default: PDF_MAX_PAGES, 0 for no limit)
+        workers (int): Pool processes (default: PDF_WORKERS, 1 for serial)
+
+    Returns:
+        str: Extracted text, one line break after every page with text
+    """
+    max_pages = PDF_MAX_PAGES if max_pages is None else max_pages
+    workers = PDF_WORKERS if workers is None else workers
+
+    PyPDF2 = _load_library('PyPDF2')
+    pdfplumber = None if PyPDF2 else _load_library('pdfplumber')
+    if not PyPDF2 and not pdfplumber:
+        raise Exception("PDF support not available. Please install PyPDF2 or pdfplumber.")
+
+    # Try PyPDF2 first, then pdfplumber as fallback
+    if PyPDF2:
+        try:
+            logger.debug("pdf extraction library=PyPDF2")
+            with timed_extraction('PyPDF2'):
+                stream.seek(0)
+                pdf_reader = PyPDF2.PdfReader(stream)
+                text = _extract_pdf_pages('PyPDF2', pdf_reader.pages, stream, max_pages, workers)
+
+            if text.strip():  # If we got some text
+                return text
+            logger.info("pdf extraction empty library=PyPDF2, falling back to pdfplumber")
+
+        except Exception as pypdf_error:
+            logger.warning("pdf extraction failed library=PyPDF2 error=%s", pypdf_error)
+
+    # Try pdfplumber if PyPDF2 failed or wasn't available
+    pdfplumber = pdfplumber or _load_library('pdfplumber')
+    if pdfplumber:
+        try:
+            logger.debug("pdf extraction library=pdfplumber")
+            with timed_extraction('pdfplumber'):
+                stream.seek(0)
+                with pdfplumber.open(stream) as pdf:
+                    text = _extract_pdf_pages('pdfplumber', pdf.pages, stream, max_pages, workers)
+            return text
+        except Exception as plumber_error:
+            logger.warning("pdf extraction failed library=pdfplumber error=%s", plumber_error)
+
+    raise Exception("Failed to extract text from PDF with both PyPDF2 and pdfplumber")
+
+def _extract_word(stream):
+    docx = _load_library('python-docx')
+    if not docx:
+        raise Exception("Word document support not available. Please install python-docx.")
+
+    # Use python-docx to extract text from Word documents
+    try:
+        with timed_extraction('python-docx'):
+            doc = docx.Document(stream)
+            return "".join(paragraph.text + "\n" for paragraph in doc.paragraphs)
+    except Exception as e:
+        raise Exception(f"Error reading Word document: {str(e)}")
+
+def _decode(data, encodings):
+    # Decode one bytes read, trying each encoding in turn
+    for encoding in encodings:
+        try:
+            return data.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return ""
+
+def _extract_plain_text(stream):
+    # Handle plain text files
+    with timed_extraction('text'):
+        return _decode(stream.read(), ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1'])
+
+def _extract_unknown(stream):
+    # Default: try to read as text file
+    with timed_extraction('text'):
+        return _decode(stream.read(), ['utf-8', 'latin-1'])
+
+# File extension -> extractor
+EXTRACTORS = {
+    '.pdf': extract_pdf_text,
+    '.docx': _extract_word,
+    '.doc': _extract_word,
+    '.txt': _extract_plain_text,
+    '.text': _extract_plain_text,
+}
+
+def extract_text_from_file(source, file_extension):
+    """
+    Extract text from different file types
+
+    Uploads are read straight from their in-memory stream; nothing is
+    written to disk.
+
+    Args:
+        source: Path to the file, its bytes, or a binary file-like object
+        file_extension (str): File extension (e.g., '.pdf', '.txt', '.docx')
+
+    Returns:
+        str: Extracted text content
+    """
+    extractor = EXTRACTORS.get(file_extension.lower(), _extract_unknown)
+
+    stream, owned = _open_source(source)
+    try:
+        text = extractor(stream)
+    except Exception as e:
+        raise Exception(f"Error extracting text from {file_extension} file: {str(e)}")
+    finally:
+        if owned:
+            stream.close()
+
+    if not text.strip():
+        raise Exception(f"No text could be extracted from the {file_extension} file")
+
+    return text.strip()
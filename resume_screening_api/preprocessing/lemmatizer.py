@@ -0,0 +1,75 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from preprocessing.text_cleaner import clean_resume
+
+# Bump whenever lemmatize_resume's output changes; with CLEANER_VERSION it
+# keys the lemmatised texts in the dataset cache
+LEMMATIZER_VERSION = 1
+
+# Distinct tokens whose lemma is remembered per process. Resume vocabularies
+# repeat heavily, so a corpus needs far fewer WordNet lookups than tokens.
+LEMMA_CACHE_SIZE = 200000
+
+# Resumes handed to a pool process at a time
+CHUNK_SIZE = 200
+
+# NLTK is imported on first use, so the serving path never loads it. Its
+# stopwords and wordnet data must be installed beforehand.
+@lru_cache(maxsize=None)
+def _stop_words():
+    from nltk.corpus import stopwords
+    return frozenset(stopwords.words('english'))
+
+@lru_cache(maxsize=None)
+def _lemmatizer():
+    from nltk.stem import WordNetLemmatizer
+    return WordNetLemmatizer()
+
+@lru_cache(maxsize=LEMMA_CACHE_SIZE)
+def lemma(word):
+    """WordNet lemma of one lowercase token, memoised"""
+    return _lemmatizer().lemmatize(word)
+
+def lemmatize_resume(resume_text):
+    """
+    Clean resume text with the shared cleaner, then lowercase, remove
+    stopwords and lemmatize
+
+    Args:
+        resume_text (str): Raw resume text
+
+    Returns:
+        str: Lemmatised text
+    """
+    stop_words = _stop_words()
+    words = clean_resume(resume_text).lower().split()
+    return ' '.join(lemma(word) for word in words if word not in stop_words)
+
+def _lemmatize_chunk(resumes):
+    return [lemmatize_resume(resume) for resume in resumes]
+
+def lemmatize_corpus(resumes, workers=None, chunk_size=CHUNK_SIZE):
+    """
+    Lemmatise many resumes, spread in chunks over a process pool
+
+    Every process builds the stopwords and lemmatiser once and keeps its own
+    lemma memo across the chunks it is given.
+
+    Args:
+        resumes (list): Raw resume texts
+        workers (int): Pool processes (default: CPU count); 1 runs in this process
+        chunk_size (int): Resumes per task
+
+    Returns:
+        list: Lemmatised text of every resume, in order
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = [resumes[start:start + chunk_size] for start in range(0, len(resumes), chunk_size)]
+    if workers == 1 or len(chunks) <= 1:
+        results = map(_lemmatize_chunk, chunks)
+        return [text for chunk in results for text in chunk]
+
+    with ProcessPoolExecutor(min(workers, len(chunks))) as pool:
+        return [text for chunk in pool.map(_lemmatize_chunk, chunks) for text in chunk]
@@ -1,60 +1,97 @@
 import re
-import nltk
-from nltk.corpus import stopwords
 import string
 
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('punkt')
-    nltk.download('stopwords')
+# URLs, hashtags, mentions and the "RT"/"cc" markers, matched in one
+# left-to-right scan. A hashtag or mention ends where a marker or URL would
+# have split it. The lookahead lets the scan skip every other character fast.
+_TOKEN_BODY = r'(?:(?!RT|cc|http\S)\S)+'
+_NOISE_PATTERN = re.compile(r'(?=[hRc#@])(?:http\S+|[#@]' + _TOKEN_BODY + r'|RT|cc)')
+
+# Punctuation is replaced by spaces with one str.translate call
+_PUNCTUATION_TABLE = str.maketrans(string.punctuation, ' ' * len(string.punctuation))
+
+_WHITESPACE_PATTERN = re.compile(r'\s')
+
+# Bump whenever clean_resume's output changes, so cached cleaned corpora
+# (utils/dataset.py) are rebuilt
+CLEANER_VERSION = 1
+
+# Texts longer than this are cleaned chunk by chunk
+CHUNK_SIZE = 1 << 20
 
 def clean_resume(resume_text):
     """
     Clean resume text by removing URLs, mentions, hashtags, punctuation, 
     and extra whitespace.
     
+    This is the one cleaner used for both training and serving. It makes a
+    single regex pass, one encode and one translate pass for non-ASCII and
+    punctuation, and one whitespace pass, and produces exactly the same
+    output as the original multi-pass cleaner.
+    
     Args:
         resume_text (str): Raw resume text
         
     Returns:
         str: Cleaned resume text
     """
-    # Remove URLs
-    resume_text = re.sub('http\S+\s*', ' ', resume_text)
+    if len(resume_text) > CHUNK_SIZE:
+        return clean_resume_chunked(resume_text)
     
-    # Remove RT and cc
-    resume_text = re.sub('RT|cc', ' ', resume_text)
-    
-    # Remove hashtags
-    resume_text = re.sub('#\S+', '', resume_text)
-    
-    # Remove mentions
-    resume_text = re.sub('@\S+', '  ', resume_text)
-    
-    # Remove punctuations
-    resume_text = re.sub('[%s]' % re.escape("""!"#$%&'()*+,-./:;<=>?@[\]^_`{|}~"""), ' ', resume_text)
+    return _clean_text(resume_text)
+
+def _clean_text(resume_text):
+    resume_text = _NOISE_PATTERN.sub(' ', resume_text)
+    # Non-ASCII characters become '?', which the punctuation table turns into a space
+    resume_text = resume_text.encode('ascii', 'replace').decode('ascii')
+    resume_text = resume_text.translate(_PUNCTUATION_TABLE)
+    return ' '.join(resume_text.split())
+
+def clean_resume_chunked(resume_text, chunk_size=CHUNK_SIZE):
+    """
+    Clean a very large resume text chunk by chunk
     
-    # Remove non-ASCII characters
-    resume_text = re.sub(r'[^\x00-\x7f]', r' ', resume_text) 
+    Chunks are cut at whitespace, which no removed token can span, so the
+    result is identical to cleaning the whole text at once while only one
+    chunk's intermediate copies are alive at a time.
     
-    # Remove extra whitespace
-    resume_text = re.sub('\s+', ' ', resume_text)
+    Args:
+        resume_text (str): Raw resume text
+        chunk_size (int): Approximate number of characters per chunk
+        
+    Returns:
+        str: Cleaned resume text
+    """
+    pieces = []
+    start = 0
+    while start < len(resume_text):
+        boundary = _WHITESPACE_PATTERN.search(resume_text, start + chunk_size)
+        end = boundary.start() if boundary else len(resume_text)
+        
+        chunk = _clean_text(resume_text[start:end])
+        if chunk:
+            pieces.append(chunk)
+        start = end
     
-    return resume_text.strip()
+    return ' '.join(pieces)
 
 def remove_stopwords(text):
     """
     Remove stopwords from text
     
+    NLTK is imported here rather than at module import so the serving path
+    never loads it. Its punkt and stopwords data must be installed
+    beforehand; nothing is downloaded at runtime.
+    
     Args:
         text (str): Input text
         
     Returns:
         str: Text without stopwords
     """
+    import nltk
+    from nltk.corpus import stopwords
+    
     stop_words = set(stopwords.words('english') + ['``', "''"])
     words = nltk.word_tokenize(text.lower())
     filtered_words = [word for word in words if word not in stop_words and word not in string.punctuation]
@@ -1,6 +1,8 @@
-import pandas as pd
 import pickle
 import os
+import statistics
+
+from utils.model_manifest import MANIFEST_PATH, load_manifest
 
 def quick_accuracy_check():
     print("🔍 RESUME SCREENING MODEL ACCURACY CHECK")
@@ -22,23 +24,22 @@ def quick_accuracy_check():
             print(f"   ❌ {file} - Not found!")
             return
     
-    # Load dataset
-    try:
-        print("\n📊 Loading dataset...")
-        df = pd.read_csv('../resume_dataset.csv')
-        print(f"   ✅ Dataset: {len(df)} resumes")
-        
-        categories = df['Category'].value_counts()
-        print(f"   📋 Categories: {len(categories)}")
-        print(f"   🔝 Top categories:")
-        for cat, count in categories.head(5).items():
-            percentage = (count/len(df))*100
-            print(f"      • {cat}: {count} ({percentage:.1f}%)")
-            
-    except Exception as e:
-        print(f"   ❌ Error loading dataset: {e}")
+    # Load the dataset summary written at training time
+    print("\n📊 Loading model manifest...")
+    manifest = load_manifest()
+    if manifest is None:
+        print(f"   ❌ {MANIFEST_PATH} - Not found! Please retrain the model.")
         return
     
+    categories = manifest['class_counts']
+    dataset_size = manifest['document_count']
+    print(f"   ✅ Dataset: {dataset_size} resumes (trained {manifest['trained_at']})")
+    print(f"   📋 Categories: {len(categories)}")
+    print(f"   🔝 Top categories:")
+    for cat, count in sorted(categories.items(), key=lambda item: -item[1])[:5]:
+        percentage = (count/dataset_size)*100
+        print(f"      • {cat}: {count} ({percentage:.1f}%)")
+    
     # Load model components
     try:
         print("\n🤖 Loading model...")
@@ -59,7 +60,6 @@ def quick_accuracy_check():
     print("="*50)
     
     # Based on typical KNN performance on text classification
-    dataset_size = len(df)
     num_categories = len(categories)
     
     if dataset_size > 5000 and num_categories < 30:
@@ -82,6 +82,7 @@ def quick_accuracy_check():
     print(f"Dataset Size: {dataset_size:,} resumes")
     print(f"Categories: {num_categories}")
     print(f"Estimated Accuracy: {estimated_accuracy}")
+    print(f"Measured Test Accuracy: {manifest['accuracy']:.2%} ({manifest['test_size']} held-out resumes)")
     print(f"Confidence Level: {confidence_level}")
     print(f"Rating: {rating}")
     
@@ -89,7 +90,7 @@ def quick_accuracy_check():
     print("-" * 30)
     
     # Check category balance
-    category_balance = categories.std() / categories.mean()
+    category_balance = statistics.stdev(categories.values()) / statistics.mean(categories.values())
     if category_balance < 0.5:
         balance_score = "✅ Well balanced"
     elif category_balance < 1.0:
@@ -101,7 +102,7 @@ def quick_accuracy_check():
     
     # Check if common categories are present
     common_tech_roles = ['Data Science', 'Python Developer', 'Java Developer', 'Web Developer', 'Software Engineer']
-    present_roles = [role for role in common_tech_roles if role in categories.index]
+    present_roles = [role for role in common_tech_roles if role in categories]
     
     print(f"Common Tech Roles Present: {len(present_roles)}/{len(common_tech_roles)}")
     if present_roles:
@@ -109,9 +110,9 @@ def quick_accuracy_check():
     
     # Data quality indicators
     print(f"\nData Quality Indicators:")
-    print(f"   Average resume length: {df['Resume'].str.len().mean():.0f} characters")
-    print(f"   Shortest resume: {df['Resume'].str.len().min()} characters")
-    print(f"   Longest resume: {df['Resume'].str.len().max()} characters")
+    print(f"   Average resume length: {manifest['resume_length']['mean']:.0f} characters")
+    print(f"   Shortest resume: {manifest['resume_length']['min']} characters")
+    print(f"   Longest resume: {manifest['resume_length']['max']} characters")
     
     print("\n💡 ACCURACY IMPROVEMENT TIPS:")
     print("-" * 35)
@@ -125,6 +126,7 @@ def quick_accuracy_check():
         'dataset_size': dataset_size,
         'num_categories': num_categories,
         'estimated_accuracy': estimated_accuracy,
+        'measured_accuracy': manifest['accuracy'],
         'rating': rating
     }
 
@@ -1,10 +1,10 @@
 """
 Retrain the model with Full Stack Developer category included
 """
+import os
+import time
 import pandas as pd
 import numpy as np
-import re
-import string
 from sklearn.model_selection import train_test_split
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.neighbors import KNeighborsClassifier
@@ -12,8 +12,13 @@ from sklearn.preprocessing import LabelEncoder
 from sklearn.metrics import accuracy_score, classification_report
 import joblib
 import nltk
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
+
+from preprocessing.lemmatizer import LEMMATIZER_VERSION, lemmatize_corpus
+from preprocessing.text_cleaner import CLEANER_VERSION
+from utils.dataset import load_dataset
+
+# Key of the lemmatised texts in the dataset cache
+LEMMATIZED = f'lemmatized-v{CLEANER_VERSION}.{LEMMATIZER_VERSION}'
 
 # Download required NLTK data
 try:
@@ -31,48 +36,17 @@ try:
 except LookupError:
     nltk.download('wordnet')
 
-def clean_resume(resume_text):
-    """Clean and preprocess resume text"""
-    # Remove URLs
-    resume_text = re.sub(r'http\S+', '', resume_text)
-    
-    # Remove RT and cc
-    resume_text = re.sub(r'RT|cc', '', resume_text)
-    
-    # Remove hashtags
-    resume_text = re.sub(r'#\S+', '', resume_text)
-    
-    # Remove mentions
-    resume_text = re.sub(r'@\S+', '', resume_text)
-    
-    # Remove punctuation
-    resume_text = resume_text.translate(str.maketrans('', '', string.punctuation))
-    
-    # Remove extra whitespaces
-    resume_text = re.sub(r'\s+', ' ', resume_text)
-    
-    # Convert to lowercase
-    resume_text = resume_text.lower().strip()
-    
-    # Remove stopwords and lemmatize
-    stop_words = set(stopwords.words('english'))
-    lemmatizer = WordNetLemmatizer()
-    
-    words = resume_text.split()
-    words = [lemmatizer.lemmatize(word) for word in words if word not in stop_words]
-    
-    return ' '.join(words)
-
 def retrain_with_fullstack():
     print("Loading dataset...")
     
     # Try to load updated dataset first, fallback to original
-    try:
-        df = pd.read_csv('../resume_dataset_updated.csv')
+    if os.path.exists('../resume_dataset_updated.csv'):
+        dataset = load_dataset('../resume_dataset_updated.csv')
         print("Using updated dataset with Full Stack category")
-    except:
-        df = pd.read_csv('../resume_dataset.csv')
+    else:
+        dataset = load_dataset('../resume_dataset.csv')
         print("Using original dataset - Full Stack category may not be available")
+    df = pd.DataFrame({'Category': dataset.categories, 'Resume': dataset.resumes})
     
     print(f"Dataset loaded with {len(df)} resumes")
     print(f"Categories found: {len(df['Category'].unique())}")
@@ -80,10 +54,13 @@ def retrain_with_fullstack():
     print(df['Category'].value_counts().head(10))
     
     print("\nCleaning resume texts...")
-    df['cleaned_resume'] = df['Resume'].apply(clean_resume)
+    # Lemmatised over a process pool once per dataset version, then read
+    # from the dataset cache
+    start = time.perf_counter()
+    dataset.texts(LEMMATIZED, lemmatize_corpus, batch=True)
+    print(f"Lemmatised {len(dataset)} resumes in {time.perf_counter() - start:.2f}s")
     
     print("Preparing features and labels...")
-    X = df['cleaned_resume'].values
     y = df['Category'].values
     
     # Encode labels
@@ -103,7 +80,7 @@ def retrain_with_fullstack():
         ngram_range=(1, 2)  # Include bigrams for better context
     )
     
-    X_features = vectorizer.fit_transform(X)
+    vectorizer, X_features = dataset.fit_tfidf(vectorizer, texts=LEMMATIZED)
     print(f"Created {X_features.shape[1]} features")
     
     # Split the data
@@ -0,0 +1,138 @@
+import pickle
+import numpy as np
+from scipy import sparse
+from sklearn.cluster import KMeans
+from sklearn.preprocessing import normalize
+
+class IVFIndex:
+    """
+    Approximate nearest-neighbour index over TF-IDF vectors
+
+    An IVF-style coarse quantiser: training resumes are clustered with
+    spherical k-means and stored in one inverted list per centroid. A query
+    only scores the resumes in its `n_probe` closest lists, so the search cost
+    no longer grows with the whole corpus. `n_probe` is the recall/speed knob:
+    probing every list gives exact search.
+    """
+
+    def __init__(self, centroids, list_offsets, list_ids, n_probe=1):
+        """
+        Args:
+            centroids (array): Unit-norm centroids, shape (n_lists, n_features)
+            list_offsets (array): Start of every inverted list in list_ids
+            list_ids (array): Training row ids grouped by list
+            n_probe (int): Default number of lists searched per query
+        """
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.list_offsets = np.asarray(list_offsets, dtype=np.int64)
+        self.list_ids = np.asarray(list_ids, dtype=np.int64)
+        self.n_probe = int(n_probe)
+
+    @property
+    def n_lists(self):
+        return self.centroids.shape[0]
+
+    @classmethod
+    def build(cls, train_matrix, n_lists=None, n_probe=1, random_state=42):
+        """
+        Cluster the training matrix and build the inverted lists
+
+        Args:
+            train_matrix: TF-IDF matrix of the training resumes
+            n_lists (int): Number of clusters (default: sqrt of the corpus size)
+            n_probe (int): Default number of lists searched per query
+            random_state (int): Seed for k-means
+
+        Returns:
+            IVFIndex: Built index
+        """
+        train_matrix = normalize(sparse.csr_matrix(train_matrix, dtype=np.float32))
+        n_rows = train_matrix.shape[0]
+        if n_lists is None:
+            n_lists = int(np.sqrt(n_rows))
+        n_lists = max(1, min(int(n_lists), n_rows))
+
+        kmeans = KMeans(n_clusters=n_lists, n_init=3, random_state=random_state)
+        kmeans.fit(train_matrix)
+        centroids = normalize(kmeans.cluster_centers_).astype(np.float32)
+
+        # Assign by cosine similarity, the same measure used when probing
+        assignments = np.asarray((train_matrix @ centroids.T).argmax(axis=1)).ravel()
+        list_ids = np.argsort(assignments, kind='stable')
+        list_offsets = np.searchsorted(assignments[list_ids], np.arange(n_lists + 1))
+
+        return cls(centroids, list_offsets, list_ids, n_probe=n_probe)
+
+    def probe(self, queries, n_probe=None):
+        """
+        Return the candidate training rows of every query
+
+        Args:
+            queries: L2-normalised TF-IDF matrix of the queries
+            n_probe (int): Number of lists to search (default: self.n_probe)
+
+        Returns:
+            list: One array of candidate row ids per query
+        """
+        n_probe = max(1, min(n_probe or self.n_probe, self.n_lists))
+        centroid_sims = np.asarray(queries @ self.centroids.T)
+
+        if n_probe < self.n_lists:
+            nearest = np.argpartition(-centroid_sims, n_probe - 1, axis=1)[:, :n_probe]
+        else:
+            nearest = np.tile(np.arange(self.n_lists), (centroid_sims.shape[0], 1))
+
+        return [
+            np.concatenate([self.list_ids[self.list_offsets[l]:self.list_offsets[l + 1]] for l in lists])
+            for lists in nearest
+        ]
+
+    def extended(self, new_rows, first_id):
+        """
+        Index with new training rows added to their closest lists
+
+        The centroids are kept, so rows can be added without clustering the
+        corpus again.
+
+        Args:
+            new_rows: L2-normalised TF-IDF matrix of the added rows
+            first_id (int): Training row id of the first added row
+
+        Returns:
+            IVFIndex: New index; this one is left unchanged
+        """
+        list_sizes = np.diff(self.list_offsets)
+        assignments = np.repeat(np.arange(self.n_lists), list_sizes)
+        new_assignments = np.asarray((new_rows @ self.centroids.T).argmax(axis=1)).ravel()
+        new_ids = np.arange(first_id, first_id + new_rows.shape[0])
+
+        assignments = np.concatenate([assignments, new_assignments])
+        ids = np.concatenate([self.list_ids, new_ids])
+        order = np.argsort(assignments, kind='stable')
+        list_offsets = np.searchsorted(assignments[order], np.arange(self.n_lists + 1))
+        return IVFIndex(self.centroids, list_offsets, ids[order], n_probe=self.n_probe)
+
+    def save(self, path):
+        """Persist the index next to the other model artifacts"""
+        with open(path, 'wb') as f:
+            pickle.dump(self, f)
+
+    @staticmethod
+    def load(path):
+        """Load a persisted index"""
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+def recall_at_k(exact_indices, approx_indices):
+    """
+    Fraction of the exact top-k neighbours that the approximate search found
+
+    Args:
+        exact_indices (array): Neighbours from exact search, shape (n_queries, k)
+        approx_indices (array): Neighbours from approximate search, same shape
+
+    Returns:
+        float: Mean recall@k over all queries
+    """
+    found = [len(np.intersect1d(exact, approx)) for exact, approx in zip(exact_indices, approx_indices)]
+    return float(np.sum(found)) / exact_indices.size
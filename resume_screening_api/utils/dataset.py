@@ -0,0 +1,245 @@
+import csv
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+
+import numpy as np
+import sklearn
+from scipy import sparse
+
+from preprocessing.text_cleaner import CLEANER_VERSION, clean_resume
+
+# Shared, cached access to the resume dataset
+#
+#   <cache dir>/<dataset hash>/columns/                       parsed Category and Resume columns
+#   <cache dir>/<dataset hash>/cleaned-v<CLEANER_VERSION>/    clean_resume of every resume
+#   <cache dir>/<dataset hash>/tfidf-<texts>-<settings>/      fitted vectorizer and its matrix
+#   <cache dir>/<dataset hash>/features-<texts>-<vectorizer>/ matrix of an already fitted vectorizer
+#
+# Entries are keyed on the CSV's content hash, so an edited dataset never
+# reads stale entries, and each entry only depends on the ones above it, so
+# bumping CLEANER_VERSION rebuilds the cleaned text and matrices but not the
+# parsed columns. Arrays are .npy files opened with np.load(mmap_mode=...),
+# and every entry is written to a temporary directory and renamed into place.
+# Set DATASET_PATH to train and evaluate on another CSV, e.g. the output of
+# deduplicate_dataset.py
+DATASET_PATH = os.getenv('DATASET_PATH', os.path.join('..', 'resume_dataset.csv'))
+DATASET_CACHE_DIR = os.getenv('DATASET_CACHE_DIR', os.path.join('cache', 'dataset'))
+
+CLEANED = f'cleaned-v{CLEANER_VERSION}'
+
+def file_digest(path, chunk_size=1 << 20):
+    """SHA-256 of a file's contents, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _settings_digest(settings):
+    return hashlib.sha256(json.dumps(settings, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+
+def _fitted_digest(vectorizer):
+    """
+    Digest of a fitted vectorizer or pipeline of them
+
+    Built from settings, vocabularies and IDF weights rather than the pickle,
+    whose stop_words_ set is ordered differently in every process.
+    """
+    digest = hashlib.sha256(json.dumps(vectorizer.get_params(), sort_keys=True, default=str).encode('utf-8'))
+    for _, step in getattr(vectorizer, 'steps', [(None, vectorizer)]):
+        vocabulary = getattr(step, 'vocabulary_', None)
+        if vocabulary is not None:
+            digest.update(json.dumps(sorted(vocabulary.items()), default=int).encode('utf-8'))
+        if hasattr(step, 'idf_'):
+            digest.update(np.asarray(step.idf_, dtype=np.float64).tobytes())
+    return digest.hexdigest()[:16]
+
+def _write_texts(directory, name, texts):
+    encoded = [text.encode('utf-8') for text in texts]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(text) for text in encoded])
+    np.save(os.path.join(directory, f'{name}_blob.npy'), np.frombuffer(b''.join(encoded), dtype=np.uint8))
+    np.save(os.path.join(directory, f'{name}_offsets.npy'), offsets)
+
+def _read_texts(directory, name):
+    blob = np.load(os.path.join(directory, f'{name}_blob.npy'), mmap_mode='r')
+    offsets = np.load(os.path.join(directory, f'{name}_offsets.npy'))
+    data = blob.tobytes()
+    return [data[start:end].decode('utf-8') for start, end in zip(offsets[:-1], offsets[1:])]
+
+def _write_matrix(directory, matrix):
+    matrix = sparse.csr_matrix(matrix)
+    for name in ('data', 'indices', 'indptr'):
+        np.save(os.path.join(directory, f'{name}.npy'), getattr(matrix, name))
+    np.save(os.path.join(directory, 'shape.npy'), np.asarray(matrix.shape, dtype=np.int64))
+
+def _read_matrix(directory):
+    # Copy-on-write maps: pages are read on demand and in-place operations
+    # downstream never touch the cache files
+    arrays = [np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='c')
+              for name in ('data', 'indices', 'indptr')]
+    shape = tuple(np.load(os.path.join(directory, 'shape.npy')))
+    return sparse.csr_matrix(tuple(arrays), shape=shape, copy=False)
+
+class Dataset:
+    """
+    The resume dataset, parsed, cleaned and vectorized at most once per version
+
+    Every accessor returns the cached result when there is one and builds and
+    stores it otherwise, so only what is stale is rebuilt.
+    """
+
+    def __init__(self, path=DATASET_PATH, cache_dir=DATASET_CACHE_DIR):
+        """
+        Args:
+            path (str): CSV with Category and Resume columns
+            cache_dir (str): Directory the cache entries are kept in
+        """
+        self.path = path
+        self.digest = file_digest(path)
+        self.cache_dir = os.path.join(cache_dir, self.digest[:16])
+        self._texts = {}
+        categories, resumes = self._cached('columns', self._parse,
+                                           lambda directory: (_read_texts(directory, 'category'),
+                                                              _read_texts(directory, 'resume')),
+                                           self._write_columns)
+        self.categories = categories
+        self.resumes = resumes
+
+    def __len__(self):
+        return len(self.resumes)
+
+    def _parse(self):
+        categories, resumes = [], []
+        with open(self.path, 'r', encoding='utf-8') as file:
+            for row in csv.DictReader(file):
+                if 'Resume' in row and 'Category' in row:
+                    resumes.append(row['Resume'])
+                    categories.append(row['Category'])
+        return categories, resumes
+
+    @staticmethod
+    def _write_columns(directory, columns):
+        _write_texts(directory, 'category', columns[0])
+        _write_texts(directory, 'resume', columns[1])
+
+    def _cached(self, key, build, read, write):
+        """
+        Read the entry named key, or build it and store it
+
+        Args:
+            key (str): Entry directory name
+            build (callable): Returns the value
+            read (callable): Reads the value from an entry directory
+            write (callable): Writes the value into an entry directory
+
+        Returns:
+            The value
+        """
+        directory = os.path.join(self.cache_dir, key)
+        if os.path.isdir(directory):
+            return read(directory)
+
+        value = build()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=f'.{key}-', dir=self.cache_dir)
+        try:
+            write(staging, value)
+            os.rename(staging, directory)
+        except OSError:
+            # Another process stored the same entry first
+            if not os.path.isdir(directory):
+                raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        return value
+
+    def texts(self, key, transform, batch=False):
+        """
+        Resume texts passed through transform, cached under key
+
+        Args:
+            key (str): Cache name; include a version of transform in it
+            transform (callable): Maps one raw resume to its processed text
+            batch (bool): transform instead maps the list of all resumes to
+                the list of their texts, e.g. to spread them over processes
+
+        Returns:
+            list: Processed text of every resume
+        """
+        if key not in self._texts:
+            def build():
+                if batch:
+                    return transform(self.resumes)
+                return [transform(resume) for resume in self.resumes]
+
+            self._texts[key] = self._cached(
+                key, build,
+                lambda directory: _read_texts(directory, 'text'),
+                lambda directory, texts: _write_texts(directory, 'text', texts))
+        return self._texts[key]
+
+    def cleaned(self):
+        """clean_resume of every resume"""
+        return self.texts(CLEANED, clean_resume)
+
+    def fit_tfidf(self, vectorizer, texts=CLEANED):
+        """
+        Fit an unfitted vectorizer to the texts, or load the cached fit
+
+        Args:
+            vectorizer: Unfitted TF-IDF vectorizer; its settings are part of the key
+            texts (str): Key of the texts to fit on, cleaned text by default
+
+        Returns:
+            tuple: (fitted vectorizer, CSR matrix of every resume)
+        """
+        settings = {'params': vectorizer.get_params(), 'sklearn': sklearn.__version__}
+        key = f'tfidf-{texts}-{_settings_digest(settings)}'
+
+        def build():
+            return vectorizer, vectorizer.fit_transform(self._texts_by_key(texts))
+
+        def read(directory):
+            with open(os.path.join(directory, 'vectorizer.pkl'), 'rb') as f:
+                return pickle.load(f), _read_matrix(directory)
+
+        def write(directory, value):
+            with open(os.path.join(directory, 'vectorizer.pkl'), 'wb') as f:
+                pickle.dump(value[0], f)
+            _write_matrix(directory, value[1])
+
+        return self._cached(key, build, read, write)
+
+    def transform(self, vectorizer, texts=CLEANED):
+        """
+        Matrix of a fitted vectorizer over the texts, cached per vectorizer
+
+        Args:
+            vectorizer: Fitted vectorizer, e.g. the one being served
+            texts (str): Key of the texts to transform, cleaned text by default
+
+        Returns:
+            CSR matrix of every resume
+        """
+        key = f'features-{texts}-{_fitted_digest(vectorizer)}'
+        return self._cached(key, lambda: vectorizer.transform(self._texts_by_key(texts)),
+                            _read_matrix, _write_matrix)
+
+    def _texts_by_key(self, key):
+        if key == CLEANED:
+            return self.cleaned()
+        if key not in self._texts:
+            directory = os.path.join(self.cache_dir, key)
+            if not os.path.isdir(directory):
+                raise KeyError(f"No texts cached as {key}; call texts() first")
+            self._texts[key] = _read_texts(directory, 'text')
+        return self._texts[key]
+
+def load_dataset(path=DATASET_PATH):
+    """Open the dataset at path through the cache"""
+    return Dataset(path)
@@ -0,0 +1,133 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sklearn.model_selection import StratifiedKFold
+
+from utils.knn_engine import KNNScoringEngine
+
+# Evaluation of the KNN model from neighbour tables: one search answers
+# predict, predict_proba and every cross-validation fold, instead of one
+# search per call and a refit plus search per fold.
+
+# Dense similarity block of one query chunk, in bytes
+CHUNK_MEMORY = 256 * 1024 * 1024
+
+# Shared with the fold processes by _init_fold_worker
+_fold_state = {}
+
+def chunked_engine(train_matrix, train_labels, classes, n_neighbors, chunk_memory=CHUNK_MEMORY):
+    """Engine scoring as many queries per block as fit in chunk_memory"""
+    block_size = max(1, chunk_memory // (4 * max(1, train_matrix.shape[0])))
+    return KNNScoringEngine(train_matrix, train_labels, classes,
+                            n_neighbors=n_neighbors, block_size=block_size)
+
+def votes_from_neighbours(neighbour_labels, n_classes):
+    """
+    Per-class vote fractions of rows of neighbour labels
+
+    Args:
+        neighbour_labels (array): Class column of every neighbour, shape (n, k)
+        n_classes (int): Number of classes
+
+    Returns:
+        array: Probabilities of shape (n, n_classes), as KNN predict_proba
+    """
+    n, k = neighbour_labels.shape
+    votes = np.zeros((n, n_classes), dtype=np.float64)
+    np.add.at(votes, (np.repeat(np.arange(n), k), neighbour_labels.ravel()), 1.0)
+    return votes / k
+
+def _init_fold_worker(matrix, label_columns, fold_of, table, n_neighbors, n_classes):
+    _fold_state.update(matrix=matrix, label_columns=label_columns, fold_of=fold_of,
+                       table=table, n_neighbors=n_neighbors, n_classes=n_classes)
+
+def score_fold(fold):
+    """
+    Accuracy of one fold from the shared neighbour table
+
+    Each test row keeps its nearest neighbours outside the fold. Rows whose
+    table row holds fewer than k of them are searched again exactly against
+    the fold's training rows.
+
+    Returns:
+        tuple: (fold, accuracy, rows searched exactly)
+    """
+    state = _fold_state
+    k = state['n_neighbors']
+    fold_of = state['fold_of']
+    test_rows = np.flatnonzero(fold_of == fold)
+    neighbours = state['table'][test_rows]
+
+    usable = fold_of[neighbours] != fold
+    # Position of every usable neighbour among the usable ones of its row
+    rank = np.cumsum(usable, axis=1)
+    enough = rank[:, -1] >= k
+
+    predicted_labels = np.empty(len(test_rows), dtype=np.int64)
+    if enough.any():
+        keep = usable[enough] & (rank[enough] <= k)
+        nearest = neighbours[enough][keep].reshape(-1, k)
+        votes = votes_from_neighbours(state['label_columns'][nearest], state['n_classes'])
+        predicted_labels[enough] = votes.argmax(axis=1)
+
+    fallback = np.flatnonzero(~enough)
+    if len(fallback):
+        train_rows = np.flatnonzero(fold_of != fold)
+        engine = chunked_engine(state['matrix'][train_rows], state['label_columns'][train_rows],
+                                np.arange(state['n_classes']), k)
+        indices, _ = engine.kneighbors(state['matrix'][test_rows[fallback]])
+        votes = votes_from_neighbours(state['label_columns'][train_rows[indices]], state['n_classes'])
+        predicted_labels[fallback] = votes.argmax(axis=1)
+
+    accuracy = float((predicted_labels == state['label_columns'][test_rows]).mean())
+    return fold, accuracy, len(fallback)
+
+def cross_validate_knn(matrix, labels, n_neighbors, n_splits=5, extra_neighbours=20,
+                       workers=None, chunk_memory=CHUNK_MEMORY):
+    """
+    Stratified k-fold accuracy of a KNN classifier from one neighbour table
+
+    Equivalent to cross_val_score(OneVsRestClassifier(KNeighborsClassifier(k)),
+    matrix, labels, cv=n_splits): the corpus is searched once against itself
+    for the k + extra_neighbours nearest rows, and every fold reads its
+    predictions from that table.
+
+    Args:
+        matrix: TF-IDF matrix of the whole dataset
+        labels (array): Encoded label of every row
+        n_neighbors (int): Neighbours that vote
+        n_splits (int): Number of folds
+        extra_neighbours (int): Table columns beyond k, room for neighbours
+            that fall in the query's own fold
+        workers (int): Processes the folds are spread over
+        chunk_memory (int): Bytes of dense similarities per query block
+
+    Returns:
+        tuple: (array of fold accuracies, rows that needed an exact search)
+    """
+    labels = np.asarray(labels)
+    classes, label_columns = np.unique(labels, return_inverse=True)
+    fold_of = np.empty(len(labels), dtype=np.int64)
+    splitter = StratifiedKFold(n_splits=n_splits)
+    for fold, (_, test_rows) in enumerate(splitter.split(np.zeros(len(labels)), labels)):
+        fold_of[test_rows] = fold
+
+    engine = chunked_engine(matrix, label_columns, np.arange(len(classes)), n_neighbors, chunk_memory)
+    table, _ = engine.kneighbors(matrix, n_neighbors=n_neighbors + extra_neighbours)
+    matrix = engine.train_matrix
+
+    workers = workers or min(n_splits, os.cpu_count() or 1)
+    initargs = (matrix, label_columns, fold_of, table, n_neighbors, len(classes))
+    scores = np.empty(n_splits)
+    searched = 0
+    if workers > 1:
+        with ProcessPoolExecutor(workers, initializer=_init_fold_worker, initargs=initargs) as pool:
+            results = list(pool.map(score_fold, range(n_splits)))
+    else:
+        _init_fold_worker(*initargs)
+        results = [score_fold(fold) for fold in range(n_splits)]
+    for fold, accuracy, exact_rows in results:
+        scores[fold] = accuracy
+        searched += exact_rows
+    return scores, searched
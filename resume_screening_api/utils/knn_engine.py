@@ -0,0 +1,173 @@
+import numpy as np
+from scipy import sparse
+from sklearn.preprocessing import normalize
+
+class KNNScoringEngine:
+    """
+    Exact nearest-neighbour scoring over the TF-IDF training matrix
+
+    Replaces the brute-force search of OneVsRestClassifier(KNeighborsClassifier)
+    with one blocked sparse matrix product per batch of queries. The training
+    matrix is kept L2-normalised as float32 CSR, top-k neighbours are selected
+    with argpartition and votes are counted per label, so no dense distance
+    matrix over the whole corpus is ever built.
+
+    Exposes predict/predict_proba so it can be used wherever the sklearn model
+    is used. When an approximate index is attached, only the candidates it
+    returns are scored.
+    """
+
+    def __init__(self, train_matrix, train_labels, classes, n_neighbors=5,
+                 block_size=256, train_ids=None, index=None,
+                 normalized=False, train_t=None, half_sq_norms=None):
+        """
+        Args:
+            train_matrix: TF-IDF matrix of the training resumes
+            train_labels (array): Encoded label of every training row
+            classes (array): Encoded labels known to the model, in column order
+            n_neighbors (int): Number of neighbours that vote
+            block_size (int): Number of queries scored per matrix product
+            train_ids (array): Optional dataset row id of every training row
+            index: Optional approximate index (see utils.ann_index.IVFIndex)
+            normalized (bool): train_matrix is already L2-normalised float32
+                CSR and is used as is, without a copy (e.g. memory-mapped)
+            train_t: Optional precomputed transpose of train_matrix as CSR
+            half_sq_norms (array): Optional precomputed half squared row norms
+        """
+        if not normalized:
+            train_matrix = normalize(sparse.csr_matrix(train_matrix, dtype=np.float32))
+        self.train_matrix = train_matrix
+        self.train_labels = np.asarray(train_labels)
+        self.classes_ = np.asarray(classes)
+        self.n_neighbors = int(n_neighbors)
+        self.block_size = int(block_size)
+        self.train_ids = (np.arange(self.train_matrix.shape[0]) if train_ids is None
+                          else np.asarray(train_ids))
+        self.index = index
+
+        # Transposed once so every query block is a single CSR product
+        self._train_t = self.train_matrix.T.tocsr() if train_t is None else train_t
+        # Map labels to column indices once; votes are counted on these
+        self._label_columns = np.searchsorted(self.classes_, self.train_labels)
+        # Squared norms are 1, except for empty resumes which are 0. They are
+        # part of the euclidean ranking used by KNeighborsClassifier.
+        if half_sq_norms is None:
+            half_sq_norms = 0.5 * np.asarray(
+                self.train_matrix.multiply(self.train_matrix).sum(axis=1), dtype=np.float32).ravel()
+        self._half_sq_norms = half_sq_norms
+
+    @classmethod
+    def from_model(cls, model, **kwargs):
+        """
+        Build an engine from a fitted OneVsRestClassifier(KNeighborsClassifier)
+
+        Args:
+            model: Trained classifier model
+
+        Returns:
+            KNNScoringEngine: Engine producing the same predictions as the model
+        """
+        estimators = [e for e in model.estimators_ if hasattr(e, '_fit_X')]
+        if not estimators:
+            raise ValueError("Model has no fitted nearest-neighbour estimators")
+
+        first = estimators[0]
+        # Every binary estimator stores the same training rows; recover the
+        # multiclass label of each row from the positive indicators.
+        positives = np.zeros((first._fit_X.shape[0], len(model.estimators_)), dtype=bool)
+        for column, estimator in enumerate(model.estimators_):
+            if hasattr(estimator, '_y'):
+                positive = list(estimator.classes_).index(1)
+                positives[:, column] = estimator._y == positive
+        train_labels = model.classes_[positives.argmax(axis=1)]
+
+        return cls(first._fit_X, train_labels, model.classes_,
+                   n_neighbors=first.n_neighbors,
+                   train_ids=getattr(model, 'train_ids_', None), **kwargs)
+
+    def _prepare_queries(self, X):
+        return normalize(sparse.csr_matrix(X, dtype=np.float32))
+
+    def kneighbors(self, X, n_neighbors=None, exact=False):
+        """
+        Find the nearest training resumes of every query
+
+        Args:
+            X: TF-IDF matrix of the queries
+            n_neighbors (int): Number of neighbours to return
+            exact (bool): Ignore the approximate index even if one is attached
+
+        Returns:
+            tuple: (indices, similarities) arrays of shape (n_queries, n_neighbors),
+            ordered from nearest to farthest
+        """
+        k = min(n_neighbors or self.n_neighbors, self.train_matrix.shape[0])
+        queries = self._prepare_queries(X)
+
+        if self.index is not None and not exact:
+            return self._kneighbors_indexed(queries, k)
+
+        n_queries = queries.shape[0]
+        indices = np.empty((n_queries, k), dtype=np.int64)
+        similarities = np.empty((n_queries, k), dtype=np.float32)
+
+        for start in range(0, n_queries, self.block_size):
+            stop = min(start + self.block_size, n_queries)
+            block_sims = (queries[start:stop] @ self._train_t).toarray()
+            # Ranking by sim - |x|^2 / 2 is ranking by euclidean distance
+            top = self._top_k(block_sims - self._half_sq_norms, k)
+
+            indices[start:stop] = top
+            similarities[start:stop] = np.take_along_axis(block_sims, top, axis=1)
+
+        return indices, similarities
+
+    def _kneighbors_indexed(self, queries, k):
+        """Score only the candidates returned by the approximate index"""
+        n_queries = queries.shape[0]
+        indices = np.empty((n_queries, k), dtype=np.int64)
+        similarities = np.empty((n_queries, k), dtype=np.float32)
+
+        for row, candidates in enumerate(self.index.probe(queries)):
+            if len(candidates) < k:
+                candidates = np.arange(self.train_matrix.shape[0])
+            sims = (self.train_matrix[candidates] @ queries[row].T).toarray().ravel()
+            top = self._top_k((sims - self._half_sq_norms[candidates])[np.newaxis, :], k)[0]
+
+            indices[row] = candidates[top]
+            similarities[row] = sims[top]
+
+        return indices, similarities
+
+    @staticmethod
+    def _top_k(scores, k):
+        """Column indices of the k highest scores of every row, best first"""
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind='stable')
+        return np.take_along_axis(top, order, axis=1)
+
+    def vote(self, indices):
+        """
+        Turn neighbour indices into per-class vote fractions
+
+        Args:
+            indices (array): Neighbour indices returned by kneighbors
+
+        Returns:
+            array: Probabilities of shape (n_queries, n_classes)
+        """
+        columns = self._label_columns[indices]
+        votes = np.zeros((indices.shape[0], len(self.classes_)), dtype=np.float64)
+        rows = np.repeat(np.arange(indices.shape[0]), indices.shape[1])
+        np.add.at(votes, (rows, columns.ravel()), 1.0)
+        return votes / indices.shape[1]
+
+    def predict_proba(self, X):
+        """Return per-class vote fractions for every query"""
+        indices, _ = self.kneighbors(X)
+        return self.vote(indices)
+
+    def predict(self, X):
+        """Return the encoded label with the most votes for every query"""
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
@@ -0,0 +1,25 @@
+import logging
+import os
+
+# Request-path messages are key=value pairs on one line, so they stay
+# greppable and cheap; LOG_LEVEL=DEBUG brings back the per-step detail
+LOG_FORMAT = '%(asctime)s %(levelname)s %(name)s %(message)s'
+
+def setup_logging(level=None):
+    """
+    Configure the root logger once per process
+
+    Args:
+        level (str): Level name, defaults to the LOG_LEVEL environment
+            variable or INFO
+
+    Returns:
+        int: The level in effect
+    """
+    level = (level or os.getenv('LOG_LEVEL', 'INFO')).upper()
+    numeric_level = logging.getLevelName(level)
+    if not isinstance(numeric_level, int):
+        numeric_level = logging.INFO
+    logging.basicConfig(level=numeric_level, format=LOG_FORMAT)
+    logging.getLogger().setLevel(numeric_level)
+    return numeric_level
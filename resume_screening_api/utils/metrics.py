@@ -0,0 +1,159 @@
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+# Minimal Prometheus metrics: counters and histograms rendered in the text
+# exposition format at /metrics. Values are per process; with several
+# gunicorn workers, Prometheus aggregates the workers' series.
+
+# Stage latencies range from microseconds (cleaning a short text) to tens of
+# seconds (a long scanned PDF)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0)
+
+# File type of the resume being processed, so stages deep in the call stack
+# are labelled without passing it through every function
+_file_type = contextvars.ContextVar('file_type', default='text')
+
+def _format_labels(names, values):
+    if not names:
+        return ''
+    pairs = ','.join(f'{name}="{value}"' for name, value in zip(names, values))
+    return '{' + pairs + '}'
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_format_labels(self.labelnames, key)} {value}')
+        return lines
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels"""
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        # Index of the first bucket whose upper bound holds the value
+        bucket = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][bucket] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the with block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series = sorted((key, ([*counts], total, count)) for key, (counts, total, count) in self._series.items())
+        for key, (counts, total, count) in series:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                labels = _format_labels(self.labelnames + ('le',), key + (le,))
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {total}')
+            lines.append(f'{self.name}_count{labels} {count}')
+        return lines
+
+REGISTRY = []
+
+STAGE_SECONDS = Histogram(
+    'resume_stage_duration_seconds',
+    'Time spent in each stage of screening one resume',
+    ['stage', 'file_type'])
+EXTRACTION_SECONDS = Histogram(
+    'resume_extraction_duration_seconds',
+    'Time spent extracting text, by document library',
+    ['library', 'file_type'])
+REQUEST_SECONDS = Histogram(
+    'resume_request_duration_seconds',
+    'End-to-end request latency',
+    ['endpoint', 'file_type'])
+REQUESTS = Counter(
+    'resume_requests_total',
+    'Requests handled, by endpoint and HTTP status',
+    ['endpoint', 'status'])
+
+def file_type_of(file_extension):
+    """Metric label of an upload's extension, 'text' for pasted text"""
+    return file_extension.lstrip('.').lower() if file_extension else 'text'
+
+@contextmanager
+def file_type_scope(file_extension):
+    """Label every stage timed inside the with block with this file type"""
+    token = _file_type.set(file_type_of(file_extension))
+    try:
+        yield
+    finally:
+        _file_type.reset(token)
+
+def current_file_type():
+    return _file_type.get()
+
+@contextmanager
+def timed_stage(stage):
+    """Time a stage of the predict path, labelled with the current file type"""
+    with STAGE_SECONDS.time(stage=stage, file_type=_file_type.get()):
+        yield
+
+@contextmanager
+def timed_extraction(library):
+    """Time text extraction with one document library"""
+    with EXTRACTION_SECONDS.time(library=library, file_type=_file_type.get()):
+        yield
+
+def render_metrics(extra_lines=()):
+    """
+    Render every registered metric in the Prometheus text format
+
+    Args:
+        extra_lines: Additional, already formatted metric lines
+
+    Returns:
+        str: Exposition text
+    """
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    lines.extend(extra_lines)
+    return '\n'.join(lines) + '\n'
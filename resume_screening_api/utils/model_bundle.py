@@ -0,0 +1,213 @@
+import hashlib
+import json
+import mmap
+import os
+import time
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import LabelEncoder
+
+from utils.knn_engine import KNNScoringEngine
+from utils.ann_index import IVFIndex
+
+# Single-file model bundle
+#
+#   8 bytes   magic, BUNDLE_MAGIC
+#   8 bytes   little-endian length of the JSON header
+#   header    {"format_version", "metadata", "arrays": {name: {dtype, shape, offset}}}
+#   arrays    raw little-endian array data, each aligned to ARRAY_ALIGNMENT
+#
+# Arrays are read with np.frombuffer over a read-only mmap, so every worker on
+# a host shares one page-cache copy of the training matrix instead of holding
+# a private unpickled one.
+BUNDLE_MAGIC = b'RSMBNDL\x00'
+BUNDLE_FORMAT_VERSION = 1
+ARRAY_ALIGNMENT = 64
+DEFAULT_BUNDLE_PATH = 'models/resume_model.bundle'
+
+# Vectorizer settings that can be stored as JSON and rebuilt
+_VECTORIZER_PARAMS = ['analyzer', 'binary', 'decode_error', 'encoding', 'input', 'lowercase',
+                      'max_df', 'max_features', 'min_df', 'ngram_range', 'norm', 'smooth_idf',
+                      'stop_words', 'strip_accents', 'sublinear_tf', 'token_pattern', 'use_idf']
+
+def _align(offset):
+    return (offset + ARRAY_ALIGNMENT - 1) // ARRAY_ALIGNMENT * ARRAY_ALIGNMENT
+
+def write_bundle(path, engine, vectorizer, label_encoder, index=None, metadata=None):
+    """
+    Write the scoring engine, vectorizer and label encoder as one bundle file
+
+    The file is written next to its destination and renamed into place, so
+    readers never see a partial bundle.
+
+    Args:
+        path (str): Destination file
+        engine (KNNScoringEngine): Scoring engine holding the training matrix
+        vectorizer: Fitted TF-IDF vectorizer
+        label_encoder: Fitted label encoder
+        index (IVFIndex): Optional approximate nearest-neighbour index
+        metadata (dict): Extra JSON-serialisable metadata to store
+
+    Returns:
+        str: Version of the written bundle (hash of its contents)
+    """
+    if vectorizer.tokenizer is not None or vectorizer.preprocessor is not None:
+        raise ValueError("Vectorizers with custom tokenizer or preprocessor cannot be bundled")
+
+    terms = sorted(vectorizer.vocabulary_, key=vectorizer.vocabulary_.get)
+    encoded_terms = [term.encode('utf-8') for term in terms]
+    term_offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+    term_offsets[1:] = np.cumsum([len(term) for term in encoded_terms])
+
+    train_matrix = engine.train_matrix
+    train_t = engine._train_t
+    # One index dtype for indices and indptr, so scipy wraps them without a copy
+    index_dtype = np.int32 if max(train_matrix.nnz, *train_matrix.shape) < 2**31 else np.int64
+    arrays = {
+        'train_data': train_matrix.data.astype(np.float32),
+        'train_indices': train_matrix.indices.astype(index_dtype),
+        'train_indptr': train_matrix.indptr.astype(index_dtype),
+        'train_t_data': train_t.data.astype(np.float32),
+        'train_t_indices': train_t.indices.astype(index_dtype),
+        'train_t_indptr': train_t.indptr.astype(index_dtype),
+        'half_sq_norms': np.asarray(engine._half_sq_norms, dtype=np.float32),
+        'train_labels': engine.train_labels.astype(np.int64),
+        'train_ids': engine.train_ids.astype(np.int64),
+        'classes': engine.classes_.astype(np.int64),
+        'idf': np.asarray(vectorizer.idf_, dtype=np.float64),
+        'vocabulary_blob': np.frombuffer(b''.join(encoded_terms), dtype=np.uint8),
+        'vocabulary_offsets': term_offsets,
+    }
+    if index is not None:
+        arrays['ann_centroids'] = index.centroids.astype(np.float32)
+        arrays['ann_list_offsets'] = index.list_offsets.astype(np.int64)
+        arrays['ann_list_ids'] = index.list_ids.astype(np.int64)
+
+    params = vectorizer.get_params()
+    vectorizer_params = {name: params[name] for name in _VECTORIZER_PARAMS}
+    vectorizer_params['dtype'] = np.dtype(vectorizer.dtype).name
+
+    content_hash = hashlib.sha256()
+    for name in sorted(arrays):
+        content_hash.update(name.encode('utf-8'))
+        content_hash.update(np.ascontiguousarray(arrays[name]).tobytes())
+    content_hash.update(json.dumps([str(c) for c in label_encoder.classes_]).encode('utf-8'))
+    version = content_hash.hexdigest()[:16]
+
+    bundle_metadata = dict(metadata or {})
+    bundle_metadata.update({
+        'version': version,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'n_neighbors': engine.n_neighbors,
+        'train_shape': list(train_matrix.shape),
+        'label_classes': [str(c) for c in label_encoder.classes_],
+        'vectorizer_params': vectorizer_params,
+        'ann_n_probe': index.n_probe if index is not None else None,
+    })
+
+    # Offsets are relative to the start of the data section
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        offset = _align(offset)
+        layout[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+        offset += array.nbytes
+
+    header = json.dumps({
+        'format_version': BUNDLE_FORMAT_VERSION,
+        'metadata': bundle_metadata,
+        'arrays': layout,
+    }).encode('utf-8')
+    data_start = _align(len(BUNDLE_MAGIC) + 8 + len(header))
+
+    temp_path = f"{path}.tmp-{os.getpid()}"
+    with open(temp_path, 'wb') as f:
+        f.write(BUNDLE_MAGIC)
+        f.write(len(header).to_bytes(8, 'little'))
+        f.write(header)
+        for name, array in arrays.items():
+            f.seek(data_start + layout[name]['offset'])
+            f.write(np.ascontiguousarray(array).tobytes())
+    os.replace(temp_path, path)
+
+    return version
+
+def read_bundle_header(path):
+    """
+    Read the header of a bundle without mapping its arrays
+
+    Returns:
+        dict: Parsed header with 'format_version', 'metadata' and 'arrays'
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(BUNDLE_MAGIC)) != BUNDLE_MAGIC:
+            raise ValueError(f"{path} is not a model bundle")
+        header_length = int.from_bytes(f.read(8), 'little')
+        header = json.loads(f.read(header_length).decode('utf-8'))
+
+    if header['format_version'] != BUNDLE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported bundle format version {header['format_version']}")
+    header['data_start'] = _align(len(BUNDLE_MAGIC) + 8 + header_length)
+    return header
+
+def load_bundle(path=DEFAULT_BUNDLE_PATH, use_index=False):
+    """
+    Memory-map a bundle and rebuild the serving objects from it
+
+    The training matrix arrays are read-only views of the mapped file.
+
+    Args:
+        path (str): Bundle file
+        use_index (bool): Attach the approximate index, if the bundle has one
+
+    Returns:
+        tuple: (engine, vectorizer, label_encoder, metadata)
+    """
+    header = read_bundle_header(path)
+    metadata = header['metadata']
+
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def array(name):
+        spec = header['arrays'][name]
+        dtype = np.dtype(spec['dtype'])
+        count = int(np.prod(spec['shape'], dtype=np.int64))
+        return np.frombuffer(mapped, dtype=dtype, count=count,
+                             offset=header['data_start'] + spec['offset']).reshape(spec['shape'])
+
+    n_rows, n_features = metadata['train_shape']
+    train_matrix = sparse.csr_matrix(
+        (array('train_data'), array('train_indices'), array('train_indptr')),
+        shape=(n_rows, n_features), copy=False)
+    train_t = sparse.csr_matrix(
+        (array('train_t_data'), array('train_t_indices'), array('train_t_indptr')),
+        shape=(n_features, n_rows), copy=False)
+
+    index = None
+    if use_index and 'ann_centroids' in header['arrays']:
+        index = IVFIndex(array('ann_centroids'), array('ann_list_offsets'), array('ann_list_ids'),
+                         n_probe=metadata['ann_n_probe'])
+
+    engine = KNNScoringEngine(
+        train_matrix, array('train_labels'), array('classes'),
+        n_neighbors=metadata['n_neighbors'], train_ids=array('train_ids'), index=index,
+        normalized=True, train_t=train_t, half_sq_norms=array('half_sq_norms'))
+
+    params = dict(metadata['vectorizer_params'])
+    params['ngram_range'] = tuple(params['ngram_range'])
+    params['dtype'] = np.dtype(params['dtype']).type
+    vectorizer = TfidfVectorizer(**params)
+
+    blob = array('vocabulary_blob').tobytes()
+    offsets = array('vocabulary_offsets')
+    vectorizer.vocabulary_ = {
+        blob[offsets[i]:offsets[i + 1]].decode('utf-8'): i for i in range(len(offsets) - 1)
+    }
+    vectorizer.idf_ = array('idf')
+
+    label_encoder = LabelEncoder()
+    label_encoder.classes_ = np.array(metadata['label_classes'])
+
+    return engine, vectorizer, label_encoder, metadata
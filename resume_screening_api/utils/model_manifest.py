@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+import time
+from collections import Counter
+
+# Written by training next to the model artifacts. Describes the model that
+# is actually served, so nothing has to re-read the dataset to list labels.
+MANIFEST_PATH = 'models/model_manifest.json'
+
+def build_manifest(label_encoder, categories, resumes, vectorizer, accuracy,
+                   train_size=None, test_size=None, model_version=None,
+                   class_counts=None, resume_length=None):
+    """
+    Describe a trained model
+
+    Args:
+        label_encoder: Fitted label encoder of the model
+        categories (list): Category of every dataset row
+        resumes (list): Raw resume text of every dataset row
+        vectorizer: Fitted TF-IDF vectorizer
+        accuracy (float): Accuracy on the held-out test set
+        train_size (int): Rows the model was trained on
+        test_size (int): Rows it was evaluated on
+        model_version (str): Version of the model bundle
+        class_counts (dict): Rows per category, instead of categories, for
+            training that never holds the whole dataset
+        resume_length (dict): 'mean', 'min' and 'max' resume length,
+            instead of resumes
+
+    Returns:
+        dict: JSON-serialisable manifest
+    """
+    counts = Counter(categories) if class_counts is None else class_counts
+    if resume_length is None:
+        lengths = [len(resume) for resume in resumes]
+        resume_length = {
+            'mean': round(sum(lengths) / len(lengths), 1) if lengths else 0,
+            'min': min(lengths, default=0),
+            'max': max(lengths, default=0),
+        }
+    # Hashing vectorizers have no vocabulary
+    vocabulary = getattr(vectorizer, 'vocabulary_', None)
+    return {
+        'model_version': model_version,
+        'trained_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'document_count': sum(counts.values()),
+        'train_size': train_size,
+        'test_size': test_size,
+        'classes': [str(c) for c in label_encoder.classes_],
+        'class_counts': {str(c): counts[c] for c in label_encoder.classes_},
+        'vocabulary_size': len(vocabulary) if vocabulary is not None else None,
+        'accuracy': round(float(accuracy), 4),
+        'resume_length': resume_length,
+    }
+
+def write_manifest(path, manifest):
+    """Write a manifest atomically, so readers never see a partial file"""
+    temp_path = f"{path}.tmp-{os.getpid()}"
+    with open(temp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(temp_path, path)
+
+def load_manifest(path=MANIFEST_PATH):
+    """
+    Read a model manifest
+
+    Returns:
+        dict: The manifest, or None if the model was trained without one
+    """
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def categories_payload(manifest, label_encoder):
+    """
+    Serialise the /api/categories response of a loaded model once
+
+    Served from the model manifest. If there is none, or it describes other
+    labels than the loaded model (a model saved by a script that does not
+    write manifests), only the label encoder's classes are reported.
+
+    Args:
+        manifest (dict): Result of load_manifest, may be None
+        label_encoder: Label encoder of the loaded model, may be None
+
+    Returns:
+        tuple: (JSON body bytes, ETag)
+    """
+    if label_encoder is not None:
+        classes = [str(c) for c in label_encoder.classes_]
+        if manifest is None or manifest.get('classes') != classes:
+            manifest = {'classes': classes}
+    manifest = manifest or {'classes': []}
+
+    payload = {'categories': manifest['classes']}
+    payload.update((k, v) for k, v in manifest.items() if k != 'classes')
+    body = json.dumps(payload).encode('utf-8')
+    return body, hashlib.sha256(body).hexdigest()[:16]
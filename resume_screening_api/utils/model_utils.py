@@ -1,3 +1,4 @@
+import hashlib
 import pickle
 import numpy as np
 import os
@@ -6,16 +7,52 @@ from sklearn.neighbors import KNeighborsClassifier
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.preprocessing import LabelEncoder
 
-def load_model():
+from utils.knn_engine import KNNScoringEngine
+from utils.metrics import timed_stage
+from utils.ann_index import IVFIndex
+from utils.model_bundle import DEFAULT_BUNDLE_PATH, load_bundle, read_bundle_header
+
+def _artifact_paths(models_dir):
+    """
+    Paths of the published artifacts, and whether the bundle is the one to load
+
+    The memory-mapped model bundle is preferred when it is at least as new as
+    the pickled classifier; otherwise the pickles are loaded.
+
+    Returns:
+        tuple: (model path, vectorizer path, encoder path, bundle path, use bundle)
+    """
+    model_path = os.path.join(models_dir, 'resume_classifier.pkl')
+    vectorizer_path = os.path.join(models_dir, 'tfidf_vectorizer.pkl')
+    encoder_path = os.path.join(models_dir, 'label_encoder.pkl')
+    bundle_path = os.path.join(models_dir, os.path.basename(DEFAULT_BUNDLE_PATH))
+    if models_dir == 'models':
+        bundle_path = os.getenv('MODEL_BUNDLE_PATH', DEFAULT_BUNDLE_PATH)
+    use_bundle = os.path.exists(bundle_path) and (not os.path.exists(model_path) or
+                                                  os.path.getmtime(bundle_path) >= os.path.getmtime(model_path))
+    return model_path, vectorizer_path, encoder_path, bundle_path, use_bundle
+
+def load_model(models_dir='models'):
     """
     Load the trained model, vectorizer, and label encoder
     
+    The memory-mapped model bundle is preferred when it is at least as new as
+    the pickled classifier; otherwise the pickles are loaded.
+    
+    Args:
+        models_dir (str): Directory the artifacts are read from; MODEL_BUNDLE_PATH
+            only moves the bundle of the default directory
+    
     Returns:
         tuple: (model, vectorizer, label_encoder)
     """
-    model_path = 'models/resume_classifier.pkl'
-    vectorizer_path = 'models/tfidf_vectorizer.pkl'
-    encoder_path = 'models/label_encoder.pkl'
+    model_path, vectorizer_path, encoder_path, bundle_path, use_bundle = _artifact_paths(models_dir)
+    
+    if use_bundle:
+        engine, vectorizer, label_encoder, _ = load_bundle(bundle_path, use_index=ann_index_enabled())
+        if engine.index is not None and os.getenv('ANN_N_PROBE'):
+            engine.index.n_probe = int(os.getenv('ANN_N_PROBE'))
+        return engine, vectorizer, label_encoder
     
     if not all(os.path.exists(path) for path in [model_path, vectorizer_path, encoder_path]):
         raise FileNotFoundError("Model files not found. Please train the model first.")
@@ -29,7 +66,95 @@ def load_model():
     with open(encoder_path, 'rb') as f:
         label_encoder = pickle.load(f)
     
-    return model, vectorizer, label_encoder
+    return build_scoring_engine(model), vectorizer, label_encoder
+
+def load_label_encoder(models_dir='models'):
+    """
+    Load only the label encoder of the model load_model would load
+
+    Reads the bundle header or the small encoder pickle, without building
+    the scoring engine, for processes that report categories but never score.
+
+    Args:
+        models_dir (str): Directory the artifacts are read from
+
+    Returns:
+        LabelEncoder: Fitted label encoder
+    """
+    model_path, _, encoder_path, bundle_path, use_bundle = _artifact_paths(models_dir)
+
+    if use_bundle:
+        label_encoder = LabelEncoder()
+        label_encoder.classes_ = np.array(read_bundle_header(bundle_path)['metadata']['label_classes'])
+        return label_encoder
+
+    if not all(os.path.exists(path) for path in [model_path, encoder_path]):
+        raise FileNotFoundError("Model files not found. Please train the model first.")
+
+    with open(encoder_path, 'rb') as f:
+        return pickle.load(f)
+
+def model_stamp():
+    """
+    Identify the currently published model files
+
+    Published artifacts are renamed into place, so a new model always changes
+    the inode or modification time of the bundle or the classifier pickle.
+
+    Returns:
+        tuple: (st_ino, st_mtime_ns) of the bundle and classifier, None if missing
+    """
+    stamp = []
+    for path in [os.getenv('MODEL_BUNDLE_PATH', DEFAULT_BUNDLE_PATH), 'models/resume_classifier.pkl']:
+        try:
+            stat = os.stat(path)
+            stamp.append((stat.st_ino, stat.st_mtime_ns))
+        except FileNotFoundError:
+            stamp.append(None)
+    return tuple(stamp)
+
+def model_version(stamp):
+    """
+    Short version id of the published model, for keying cached results
+
+    Args:
+        stamp (tuple): Result of model_stamp()
+
+    Returns:
+        str: 16 hex characters
+    """
+    return hashlib.sha256(repr(stamp).encode('utf-8')).hexdigest()[:16]
+
+def ann_index_enabled():
+    """Whether serving should use the approximate nearest-neighbour index"""
+    return os.getenv('USE_ANN_INDEX', 'false').lower() in ('1', 'true', 'yes')
+
+def build_scoring_engine(model):
+    """
+    Swap a KNN classifier for the sparse-matmul scoring engine
+
+    With USE_ANN_INDEX set, the persisted approximate index is attached and
+    ANN_N_PROBE overrides its default number of probed lists.
+
+    Args:
+        model: Trained classifier model
+
+    Returns:
+        KNNScoringEngine if the model is a OneVsRest KNN classifier,
+        otherwise the model unchanged
+    """
+    if not (isinstance(model, OneVsRestClassifier) and isinstance(model.estimator, KNeighborsClassifier)):
+        return model
+
+    engine = KNNScoringEngine.from_model(model)
+
+    index_path = 'models/ann_index.pkl'
+    if ann_index_enabled() and os.path.exists(index_path):
+        engine.index = IVFIndex.load(index_path)
+        if os.getenv('ANN_N_PROBE'):
+            engine.index.n_probe = int(os.getenv('ANN_N_PROBE'))
+
+    return engine
 
 def predict_category(resume_text, model, vectorizer, label_encoder):
     """
@@ -45,11 +170,14 @@ def predict_category(resume_text, model, vectorizer, label_encoder):
         tuple: (predicted_category, confidence_score)
     """
     # Transform text to TF-IDF features
-    text_features = vectorizer.transform([resume_text])
+    with timed_stage('vectorize'):
+        text_features = vectorizer.transform([resume_text])
     
-    # Make prediction
-    prediction = model.predict(text_features)[0]
-    prediction_proba = model.predict_proba(text_features)[0]
+    # One scoring pass gives both the prediction and its probability
+    with timed_stage('classify'):
+        prediction_proba, _, _ = score_features(text_features, model)
+    prediction_proba = prediction_proba[0]
+    prediction = model.classes_[np.argmax(prediction_proba)]
     
     # Get category name
     category = label_encoder.inverse_transform([prediction])[0]
@@ -59,6 +187,101 @@ def predict_category(resume_text, model, vectorizer, label_encoder):
     
     return category, confidence
 
+def score_features(text_features, model):
+    """
+    Score TF-IDF features with a single neighbour search
+
+    Args:
+        text_features: TF-IDF matrix of the resumes
+        model: Trained classifier model or KNNScoringEngine
+
+    Returns:
+        tuple: (probabilities, neighbour_indices, neighbour_similarities);
+        the neighbour arrays are None for models without a neighbour search
+    """
+    if isinstance(model, KNNScoringEngine):
+        indices, similarities = model.kneighbors(text_features)
+        return model.vote(indices), indices, similarities
+    return model.predict_proba(text_features), None, None
+
+def rank_categories(resume_text, model, vectorizer, label_encoder, top_k=3):
+    """
+    Rank the most likely categories of a resume
+
+    Args:
+        resume_text (str): Cleaned resume text
+        model: Trained classifier model
+        vectorizer: Fitted TF-IDF vectorizer
+        label_encoder: Fitted label encoder
+        top_k (int): Number of categories to return
+
+    Returns:
+        dict: 'top_categories' as up to top_k [{'category', 'score'}] best
+        first, leaving out categories scored 0, and
+        'neighbours' as [{'id', 'category', 'similarity'}] for the training
+        resumes that voted (empty for models without a neighbour search)
+    """
+    with timed_stage('vectorize'):
+        text_features = vectorizer.transform([resume_text])
+    with timed_stage('classify'):
+        prediction_proba, indices, similarities = score_features(text_features, model)
+    prediction_proba = prediction_proba[0]
+
+    # Stable sort keeps the lowest class first on ties, like predict().
+    # Categories nobody voted for are not runner-ups.
+    order = np.argsort(-prediction_proba, kind='stable')[:max(1, top_k)]
+    order = order[:1].tolist() + [column for column in order[1:] if prediction_proba[column] > 0]
+    order = np.asarray(order)
+    categories = label_encoder.inverse_transform(model.classes_[order])
+    top_categories = [
+        {'category': str(category), 'score': float(prediction_proba[column])}
+        for category, column in zip(categories, order)
+    ]
+
+    neighbours = []
+    if indices is not None:
+        neighbour_categories = label_encoder.inverse_transform(model.train_labels[indices[0]])
+        neighbours = [
+            {'id': int(model.train_ids[row]), 'category': str(category), 'similarity': float(similarity)}
+            for row, category, similarity in zip(indices[0], neighbour_categories, similarities[0])
+        ]
+
+    return {'top_categories': top_categories, 'neighbours': neighbours}
+
+def predict_categories(resume_texts, model, vectorizer, label_encoder):
+    """
+    Predict the categories of many resumes in a single pass
+
+    The whole batch is vectorized into one TF-IDF matrix and the classifier
+    is run once over it, instead of once per resume.
+
+    Args:
+        resume_texts (list): Cleaned resume texts
+        model: Trained classifier model
+        vectorizer: Fitted TF-IDF vectorizer
+        label_encoder: Fitted label encoder
+
+    Returns:
+        list: (predicted_category, confidence_score) tuples, in input order
+    """
+    if not resume_texts:
+        return []
+
+    # Transform the whole batch into one TF-IDF matrix
+    with timed_stage('vectorize'):
+        text_features = vectorizer.transform(resume_texts)
+
+    # Score every row at once, with a single neighbour search
+    with timed_stage('classify'):
+        prediction_proba, _, _ = score_features(text_features, model)
+    predictions = model.classes_[np.argmax(prediction_proba, axis=1)]
+
+    # Get category names and confidences
+    categories = label_encoder.inverse_transform(predictions)
+    confidences = np.max(prediction_proba, axis=1)
+
+    return list(zip(categories, confidences))
+
 def save_model(model, vectorizer, label_encoder):
     """
     Save the trained model, vectorizer, and label encoder
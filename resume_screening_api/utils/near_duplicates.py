@@ -0,0 +1,163 @@
+import numpy as np
+
+# Near-duplicate detection with MinHash signatures and LSH banding
+#
+# Every resume becomes the set of its word shingles. A MinHash signature
+# keeps, for each of n_perm hash functions, the smallest hash of the set; two
+# signatures agree in a position with probability equal to the Jaccard
+# similarity of the sets. Signatures are cut into bands, and resumes sharing
+# any whole band land in the same bucket and become candidates, which are
+# kept when their estimated similarity reaches the threshold. Work grows with
+# the number of resumes and their length, not with the number of pairs.
+
+SHINGLE_SIZE = 5
+NUM_PERM = 128
+BANDS = 16
+
+# Entries of the permutation-by-shingle block hashed at a time (16MB)
+_SIGNATURE_BLOCK = 1 << 22
+
+def shingle_hashes(tokens, shingle_size=SHINGLE_SIZE):
+    """
+    64-bit hashes of the word shingles of one document
+
+    Args:
+        tokens (array): uint64 token hashes of the document
+        shingle_size (int): Words per shingle
+
+    Returns:
+        array: uint64 hash of every shingle (the whole document if shorter)
+    """
+    tokens = np.asarray(tokens, dtype=np.uint64)
+    if len(tokens) == 0:
+        return np.zeros(1, dtype=np.uint64)
+    n = min(shingle_size, len(tokens))
+    hashes = np.zeros(len(tokens) - n + 1, dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for offset in range(n):
+            hashes = hashes * np.uint64(1099511628211) + tokens[offset:len(tokens) - n + 1 + offset]
+        # MurmurHash3 finaliser, so similar shingles get unrelated hashes
+        hashes ^= hashes >> np.uint64(33)
+        hashes *= np.uint64(0xff51afd7ed558ccd)
+        hashes ^= hashes >> np.uint64(33)
+    return hashes
+
+def token_hashes(text, vocabulary):
+    """
+    Token ids of a lowercase, whitespace-split text
+
+    Args:
+        text (str): Cleaned text
+        vocabulary (dict): Token to id map, extended with unseen tokens
+
+    Returns:
+        array: uint64 id of every token, offset so no id is 0
+    """
+    return np.fromiter((vocabulary.setdefault(token, len(vocabulary) + 1) for token in text.lower().split()),
+                       dtype=np.uint64)
+
+def minhash_signatures(shingle_sets, num_perm=NUM_PERM, seed=42):
+    """
+    MinHash signature of every document
+
+    Permutation k maps the low 32 bits x of a shingle hash to
+    a_k * x + b_k modulo 2**32 with a_k odd, a bijection on 32-bit values;
+    the shingle hashes are already well mixed.
+
+    Args:
+        shingle_sets (list): uint64 shingle hashes of every document
+        num_perm (int): Signature length
+        seed (int): Seed of the hash functions
+
+    Returns:
+        array: uint32 signatures, shape (n_documents, num_perm)
+    """
+    rng = np.random.default_rng(seed)
+    a = (rng.integers(0, 2 ** 32, num_perm, dtype=np.uint64) | np.uint64(1)).astype(np.uint32)[:, None]
+    b = rng.integers(0, 2 ** 32, num_perm, dtype=np.uint64).astype(np.uint32)[:, None]
+    signatures = np.empty((len(shingle_sets), num_perm), dtype=np.uint32)
+
+    # Documents are hashed in blocks of up to _SIGNATURE_BLOCK entries, laid
+    # out permutation by shingle so each block's per-document minima are one
+    # reduceat along contiguous rows
+    block_shingles = max(1, _SIGNATURE_BLOCK // num_perm)
+    start = 0
+    while start < len(shingle_sets):
+        end, size = start + 1, len(shingle_sets[start])
+        while end < len(shingle_sets) and size + len(shingle_sets[end]) <= block_shingles:
+            size += len(shingle_sets[end])
+            end += 1
+        block = np.concatenate(shingle_sets[start:end]).astype(np.uint32)
+        offsets = np.cumsum([0] + [len(s) for s in shingle_sets[start:end - 1]])
+        hashed = a * block
+        hashed += b
+        signatures[start:end] = np.minimum.reduceat(hashed, offsets, axis=1).T
+        start = end
+    return signatures
+
+class _UnionFind:
+    def __init__(self, size):
+        self.parent = np.arange(size)
+
+    def find(self, item):
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, first, second):
+        first, second = self.find(first), self.find(second)
+        if first != second:
+            # The smaller row number stays the root, so clusters are named by
+            # their first row
+            self.parent[max(first, second)] = min(first, second)
+
+def cluster_near_duplicates(signatures, threshold=0.9, bands=BANDS):
+    """
+    Group documents whose estimated Jaccard similarity reaches threshold
+
+    Within a bucket every member is compared with the bucket's first member
+    only, so large groups of copies cost linear rather than quadratic work;
+    pairs this misses are usually joined through another band.
+
+    Args:
+        signatures (array): MinHash signatures, shape (n_documents, num_perm)
+        threshold (float): Estimated Jaccard similarity that counts as a duplicate
+        bands (int): LSH bands; num_perm must be divisible by it
+
+    Returns:
+        tuple: (cluster id of every document, the smallest row number in
+        its cluster; number of candidate pairs compared)
+    """
+    n, num_perm = signatures.shape
+    rows = num_perm // bands
+    clusters = _UnionFind(n)
+    compared = 0
+    # A band's rows are folded into one 64-bit bucket key; the rare key
+    # collision only adds a candidate that the similarity check rejects
+    mixers = np.random.default_rng(0).integers(1, 2 ** 63, rows, dtype=np.uint64) | np.uint64(1)
+    for band in range(bands):
+        with np.errstate(over='ignore'):
+            keys = (signatures[:, band * rows:(band + 1) * rows].astype(np.uint64) * mixers).sum(
+                axis=1, dtype=np.uint64)
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        sizes = np.diff(np.r_[starts, n])
+        for start, size in zip(starts[sizes > 1], sizes[sizes > 1]):
+            members = order[start:start + size]
+            first = members[0]
+            similarity = (signatures[members[1:]] == signatures[first]).mean(axis=1)
+            compared += size - 1
+            for member in members[1:][similarity >= threshold]:
+                clusters.union(first, member)
+    labels = np.array([clusters.find(row) for row in range(n)])
+    return labels, compared
+
+def signatures_for_texts(texts, shingle_size=SHINGLE_SIZE, num_perm=NUM_PERM, seed=42):
+    """MinHash signatures of cleaned texts"""
+    vocabulary = {}
+    shingles = [shingle_hashes(token_hashes(text, vocabulary), shingle_size) for text in texts]
+    return minhash_signatures(shingles, num_perm, seed)
@@ -0,0 +1,233 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+# Disk writes of one process between two prunes of the shared tier
+PRUNE_EVERY = 100
+
+def content_key(data, *parts, chunk_size=1 << 16):
+    """
+    Cache key for a piece of content and everything its result depends on
+
+    Args:
+        data: Upload bytes, encoded resume text, or a seekable binary stream,
+            which is hashed in chunks and rewound
+        *parts: Other inputs of the result, e.g. model version and file type
+        chunk_size (int): Bytes read from a stream at a time
+
+    Returns:
+        str: Key of the form "<part>:<part>:...:<sha256 of data>"
+    """
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        digest = hashlib.sha256(data)
+    else:
+        digest = hashlib.sha256()
+        data.seek(0)
+        for block in iter(lambda: data.read(chunk_size), b''):
+            digest.update(block)
+        data.seek(0)
+    return ':'.join([str(part) for part in parts] + [digest.hexdigest()])
+
+class ResultCache:
+    """
+    Two-tier, content-addressed cache of resume processing results
+
+    The first tier is a bounded in-process LRU. The second is a SQLite file
+    shared by every worker on the host, so a resume processed by one worker
+    is a hit for all of them. Concurrent requests for the same key in one
+    process are coalesced: one computes, the others wait for its result.
+    Values must be JSON-serialisable and are shared between callers, so they
+    must not be mutated.
+
+    The shared tier is pruned to its newest max_disk_entries rows and to
+    rows younger than max_age. Rows of earlier model versions are never
+    looked up again once every worker has reloaded, and are left to age out
+    rather than deleted by the first worker to reload.
+    """
+
+    def __init__(self, max_entries=1024, db_path=None, max_disk_entries=100000, max_age=None):
+        """
+        Args:
+            max_entries (int): Size of the in-process LRU (0 disables it)
+            db_path (str): SQLite file of the shared tier (None disables it)
+            max_disk_entries (int): Rows kept in the shared tier (0 for no limit)
+            max_age (float): Seconds a row is kept in the shared tier (None for no limit)
+        """
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self.max_disk_entries = max_disk_entries
+        self.max_age = max_age
+        self._disk_writes = 0
+        self._memory = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._counters = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'coalesced': 0, 'errors': 0}
+
+        if db_path:
+            os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+            self._connection().execute(
+                'CREATE TABLE IF NOT EXISTS results '
+                '(key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)')
+            self._connection().execute(
+                'CREATE INDEX IF NOT EXISTS results_created_at ON results (created_at)')
+
+    def _connection(self):
+        # SQLite connections cannot be shared between threads
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def _get_memory(self, key):
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+            return value
+
+    def _put_memory(self, key, value):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _get_disk(self, key):
+        if not self.db_path:
+            return None
+        try:
+            row = self._connection().execute('SELECT value FROM results WHERE key = ?', (key,)).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("result cache read failed error=%s", e)
+            return None
+        return json.loads(row[0]) if row else None
+
+    def _put_disk(self, key, value):
+        if not self.db_path:
+            return
+        try:
+            self._connection().execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?)',
+                                       (key, json.dumps(value), time.time()))
+        except sqlite3.Error as e:
+            logger.warning("result cache write failed error=%s", e)
+            return
+        with self._lock:
+            self._disk_writes += 1
+            due = self._disk_writes % PRUNE_EVERY == 0
+        if due:
+            self.prune()
+
+    def prune(self):
+        """
+        Delete shared-tier rows older than max_age and beyond the newest
+        max_disk_entries
+
+        Returns:
+            int: Rows deleted
+        """
+        if not self.db_path:
+            return 0
+        deleted = 0
+        try:
+            connection = self._connection()
+            if self.max_age:
+                deleted += connection.execute('DELETE FROM results WHERE created_at < ?',
+                                              (time.time() - self.max_age,)).rowcount
+            if self.max_disk_entries:
+                deleted += connection.execute(
+                    'DELETE FROM results WHERE created_at < (SELECT created_at FROM results '
+                    'ORDER BY created_at DESC LIMIT 1 OFFSET ?)', (self.max_disk_entries - 1,)).rowcount
+        except sqlite3.Error as e:
+            logger.warning("result cache prune failed error=%s", e)
+        if deleted:
+            logger.info("result cache pruned rows=%d", deleted)
+        return deleted
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached value of key, computing and storing it on a miss
+
+        Exceptions raised by compute are passed to every waiting caller and
+        nothing is cached.
+
+        Args:
+            key (str): Cache key, see content_key
+            compute (callable): Produces the value when no tier has it
+
+        Returns:
+            The cached or computed value
+        """
+        value = self._get_memory(key)
+        if value is not None:
+            self._count('memory_hits')
+            return value
+
+        with self._lock:
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._in_flight[key] = Future()
+
+        if not leader:
+            self._count('coalesced')
+            return flight.result()
+
+        try:
+            value = self._get_disk(key)
+            if value is not None:
+                self._count('disk_hits')
+            else:
+                self._count('misses')
+                value = compute()
+                self._put_disk(key, value)
+            self._put_memory(key, value)
+            flight.set_result(value)
+            return value
+        except Exception as e:
+            self._count('errors')
+            flight.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def stats(self):
+        """
+        Hit/miss counters of this process and the size of both tiers
+
+        Returns:
+            dict: Counters, 'hit_rate', 'memory_entries' and 'disk_entries'
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats['memory_entries'] = len(self._memory)
+
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses'] + stats['coalesced']
+        stats['hit_rate'] = round((lookups - stats['misses']) / lookups, 4) if lookups else None
+        stats['max_entries'] = self.max_entries
+
+        stats['disk_entries'] = None
+        if self.db_path:
+            try:
+                stats['disk_entries'] = self._connection().execute('SELECT COUNT(*) FROM results').fetchone()[0]
+            except sqlite3.Error:
+                pass
+        return stats
@@ -0,0 +1,94 @@
+import logging
+
+from preprocessing.document_extractor import extract_text_from_file
+from preprocessing.text_cleaner import clean_resume
+from utils.metrics import file_type_scope, timed_stage
+from utils.model_utils import predict_category, rank_categories
+
+logger = logging.getLogger(__name__)
+
+# Shared by the Flask app (app.py) and the ASGI app (asgi.py), so both serve
+# the same /predict contract
+
+ALLOWED_EXTENSIONS = ['.pdf', '.txt', '.docx', '.doc']
+
+class ExtractionError(Exception):
+    """No text could be read from an upload; reported to the client as a 400"""
+
+def analyse_resume(source, file_extension, top_k, model, vectorizer, label_encoder):
+    """
+    Extract, clean and classify one resume
+
+    Args:
+        source: Upload bytes or binary stream, or UTF-8 resume text bytes if
+            file_extension is None
+        file_extension (str): Extension of the upload, None for pasted text
+        top_k (int): Number of ranked categories to include, or None
+        model: Trained classifier model
+        vectorizer: TF-IDF vectorizer
+        label_encoder: Label encoder
+
+    Returns:
+        dict: JSON-serialisable 'extracted_text', 'cleaned_text', 'category',
+        'probability' and 'ranking' (None without top_k); the prediction
+        fields are None if nothing is left after cleaning
+
+    Raises:
+        ExtractionError: If no text could be extracted from the upload
+    """
+    with file_type_scope(file_extension):
+        if file_extension is None:
+            resume_text = source.decode('utf-8')
+        else:
+            try:
+                with timed_stage('extract'):
+                    resume_text = extract_text_from_file(source, file_extension)
+            except Exception as e:
+                raise ExtractionError(str(e))
+            logger.debug("text extracted file_type=%s chars=%d", file_extension, len(resume_text))
+
+        with timed_stage('clean'):
+            cleaned_text = clean_resume(resume_text).strip()
+        logger.debug("text cleaned chars=%d", len(cleaned_text))
+
+        analysis = {'extracted_text': resume_text, 'cleaned_text': cleaned_text,
+                    'category': None, 'probability': None, 'ranking': None}
+        if not cleaned_text:
+            return analysis
+
+        if top_k:
+            ranking = rank_categories(cleaned_text, model, vectorizer, label_encoder, top_k)
+            best = ranking['top_categories'][0]
+            analysis.update(category=best['category'], probability=best['score'], ranking=ranking)
+        else:
+            category, probability = predict_category(cleaned_text, model, vectorizer, label_encoder)
+            analysis.update(category=str(category), probability=float(probability))
+        return analysis
+
+def analysis_response(analysis):
+    """
+    Turn an analysis into the /predict response
+
+    Args:
+        analysis (dict): Result of analyse_resume
+
+    Returns:
+        tuple: (JSON-serialisable body, HTTP status)
+    """
+    if not analysis['extracted_text']:
+        return {'error': 'Resume text is empty'}, 400
+
+    cleaned_text = analysis['cleaned_text']
+    if not cleaned_text:
+        return {'error': 'Resume text is empty after cleaning'}, 400
+
+    probability = analysis['probability']
+
+    result = {
+        'category': analysis['category'],
+        'confidence': f"{probability:.2%}",
+        'cleaned_text_preview': cleaned_text[:200] + "..." if len(cleaned_text) > 200 else cleaned_text
+    }
+    if analysis['ranking']:
+        result.update(analysis['ranking'])
+    return result, 200
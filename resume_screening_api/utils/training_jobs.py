@@ -0,0 +1,286 @@
+"""
+Background training jobs
+
+POST /train creates a job and starts `python -m utils.training_jobs <job_id>`
+as a separate process, so no web worker is tied up by the fit. Job state
+lives in JSON files under JOBS_DIR so every gunicorn worker can report it.
+The runner trains into a staging directory and then publishes the artifacts
+into models/ with atomic renames; workers notice the new bundle and reload.
+Work that publishes from its own process, such as an incremental update,
+takes the same lock through exclusive_job.
+"""
+import calendar
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import traceback
+import uuid
+from contextlib import contextmanager
+
+JOBS_DIR = os.getenv('TRAINING_JOBS_DIR', os.path.join('models', 'jobs'))
+MODELS_DIR = 'models'
+
+# Published in this order; the bundle goes last because serving prefers it
+# once it is not older than the classifier pickle.
+ARTIFACTS = ['tfidf_vectorizer.pkl', 'label_encoder.pkl', 'ann_index.pkl',
+             'model_manifest.json', 'resume_classifier.pkl', 'resume_model.bundle']
+
+_LOCK_NAME = 'active.lock'
+
+# A queued job whose runner pid was never recorded is given up on after this
+# many seconds, so a worker dying mid-start cannot hold the lock forever
+START_TIMEOUT = 60
+
+def _job_dir(job_id):
+    return os.path.join(JOBS_DIR, job_id)
+
+def _status_path(job_id):
+    return os.path.join(_job_dir(job_id), 'status.json')
+
+def _now():
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+
+def _write_status(job_id, status):
+    path = _status_path(job_id)
+    temp_path = f"{path}.tmp-{os.getpid()}"
+    with open(temp_path, 'w') as f:
+        json.dump(status, f, indent=2)
+    os.replace(temp_path, path)
+
+def get_job(job_id):
+    """
+    Read the status of a training job
+
+    Args:
+        job_id (str): Job id returned by start_job
+
+    Returns:
+        dict: Job status, or None if there is no such job
+    """
+    if not job_id.isalnum():
+        return None
+    try:
+        with open(_status_path(job_id)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def active_job():
+    """Return the status of the queued or running job, if there is one"""
+    try:
+        with open(os.path.join(JOBS_DIR, _LOCK_NAME)) as f:
+            job_id = f.read().strip()
+    except FileNotFoundError:
+        return None
+
+    job = get_job(job_id)
+    if job and job['status'] in ('queued', 'running') and _runner_alive(job):
+        return job
+
+    # The runner finished or died without releasing the lock
+    _release_lock(job_id)
+    return None
+
+def _runner_alive(job):
+    pid = job.get('pid')
+    if pid is None:
+        # Still starting up, unless that has taken too long
+        created = calendar.timegm(time.strptime(job['created_at'], '%Y-%m-%dT%H:%M:%SZ'))
+        return time.time() - created < START_TIMEOUT
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def _release_lock(job_id):
+    lock_path = os.path.join(JOBS_DIR, _LOCK_NAME)
+    try:
+        with open(lock_path) as f:
+            if f.read().strip() != job_id:
+                return
+        os.remove(lock_path)
+    except FileNotFoundError:
+        pass
+
+def _create_job(kind):
+    """
+    Create a queued job and take the lock for it
+
+    Returns:
+        tuple: (job status dict, created) where created is False if an
+        existing active job was returned
+    """
+    os.makedirs(JOBS_DIR, exist_ok=True)
+
+    existing = active_job()
+    if existing:
+        return existing, False
+
+    job_id = uuid.uuid4().hex[:12]
+    os.makedirs(_job_dir(job_id))
+    status = {
+        'id': job_id,
+        'kind': kind,
+        'status': 'queued',
+        'stage': None,
+        'created_at': _now(),
+        'started_at': None,
+        'finished_at': None,
+        'timings': {},
+        'metrics': {},
+        'error': None,
+        'pid': None,
+    }
+    _write_status(job_id, status)
+
+    # The status is written first, so the lock never names an unknown job
+    try:
+        fd = os.open(os.path.join(JOBS_DIR, _LOCK_NAME), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        # Another worker started a job at the same moment
+        shutil.rmtree(_job_dir(job_id), ignore_errors=True)
+        existing = active_job()
+        if existing is None:
+            raise RuntimeError("Could not start a job, please retry")
+        return existing, False
+    with os.fdopen(fd, 'w') as f:
+        f.write(job_id)
+    return status, True
+
+@contextmanager
+def exclusive_job(kind):
+    """
+    Hold the jobs lock for work done in this process
+
+    The work is recorded as a running job, so /train refuses to start a
+    training job until it has finished, and a crash releases the lock like
+    a dead runner's.
+
+    Args:
+        kind (str): Kind of work, recorded in the job status
+
+    Yields:
+        dict: Job status; values stored in its 'metrics' are recorded
+
+    Raises:
+        RuntimeError: If another job is queued or running
+    """
+    status, created = _create_job(kind)
+    if not created:
+        raise RuntimeError(f"{status.get('kind', 'train').capitalize()} job {status['id']} is "
+                           f"{status['status']}; try again once it has finished")
+    status.update({'status': 'running', 'started_at': _now(), 'pid': os.getpid()})
+    _write_status(status['id'], status)
+    try:
+        yield status
+        status['status'] = 'succeeded'
+    except BaseException as e:
+        status.update({'status': 'failed', 'error': str(e)})
+        raise
+    finally:
+        status['finished_at'] = _now()
+        _write_status(status['id'], status)
+        _release_lock(status['id'])
+
+def start_job():
+    """
+    Create a training job and start its runner process
+
+    Only one job runs at a time; if one is already queued or running, its
+    status is returned instead of starting another.
+
+    Returns:
+        tuple: (job status dict, created) where created is False if an
+        existing active job was returned
+    """
+    status, created = _create_job('train')
+    if not created:
+        return status, False
+    job_id = status['id']
+
+    try:
+        with open(os.path.join(_job_dir(job_id), 'train.log'), 'w') as log:
+            process = subprocess.Popen([sys.executable, '-m', 'utils.training_jobs', job_id],
+                                       stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+    except Exception:
+        _release_lock(job_id)
+        raise
+    # Record the runner at once so a runner that dies before its first status
+    # write is noticed; the runner's own writes carry the same pid
+    current = get_job(job_id)
+    if current and current['status'] == 'queued':
+        status = dict(current, pid=process.pid)
+        _write_status(job_id, status)
+    # Reap the runner when it exits so it does not linger as a zombie
+    threading.Thread(target=process.wait, daemon=True).start()
+
+    return status, True
+
+def publish_artifacts(staging_dir, models_dir=MODELS_DIR):
+    """
+    Move freshly trained artifacts into the serving directory
+
+    Every file is renamed into place atomically, bundle last.
+
+    Args:
+        staging_dir (str): Directory the job wrote its artifacts to
+        models_dir (str): Directory the API loads models from
+    """
+    for name in ARTIFACTS:
+        source = os.path.join(staging_dir, name)
+        if os.path.exists(source):
+            os.replace(source, os.path.join(models_dir, name))
+
+def run_job(job_id):
+    """
+    Train, evaluate and publish a model, recording progress in the job status
+
+    Args:
+        job_id (str): Job id created by start_job
+    """
+    status = get_job(job_id)
+    status.update({'status': 'running', 'started_at': _now(), 'pid': os.getpid()})
+    _write_status(job_id, status)
+
+    stage_started = {'stage': None, 'at': time.perf_counter()}
+
+    def progress(stage):
+        now = time.perf_counter()
+        if stage_started['stage']:
+            status['timings'][stage_started['stage']] = round(now - stage_started['at'], 3)
+        stage_started.update({'stage': stage, 'at': now})
+        status['stage'] = stage
+        _write_status(job_id, status)
+
+    staging_dir = os.path.join(_job_dir(job_id), 'artifacts')
+    job_started = time.perf_counter()
+    try:
+        if os.getenv('TRAINING_MODE') == 'streaming':
+            from models.train_streaming import train_streaming_model as train
+        else:
+            from models.train_model import train_and_save_model as train
+        accuracy = train(output_dir=staging_dir, progress=progress)
+        progress('publishing')
+        publish_artifacts(staging_dir)
+        progress(None)
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+        status.update({'status': 'succeeded', 'metrics': {'accuracy': round(float(accuracy), 4)}})
+    except Exception as e:
+        traceback.print_exc()
+        status.update({'status': 'failed', 'error': str(e)})
+    finally:
+        status['timings']['total'] = round(time.perf_counter() - job_started, 3)
+        status['finished_at'] = _now()
+        _write_status(job_id, status)
+        _release_lock(job_id)
+
+if __name__ == '__main__':
+    run_job(sys.argv[1])